@@ -3,16 +3,20 @@ from dotenv import load_dotenv
 load_dotenv(override=True)  # Load environment variables from .env file, overriding system defaults if conflict
 
 import os
-from flask import Flask, request, render_template, redirect, url_for, flash, jsonify, session, send_from_directory, send_file
+import threading
+import time
+from flask import Flask, request, render_template, redirect, url_for, flash, jsonify, session, send_from_directory, send_file, g
 from datetime import datetime
 from utils.resume_parser import extract_text_from_file
 from utils.ner_extractor import extract_skills_and_summary
 from utils.ollama_summarizer import summarizer
 from utils.recommender import analyze_skill_gap, recommend_internships_from_profile, find_best_role
-from utils.salary_predictor import predict_salary, ensure_trained_model
+from utils.salary_predictor import predict_salary
 from utils.scraper import ddg_search_internships
 from utils.course_recommender import create_learning_path, get_enhanced_course_recommendations
-from utils.database import db
+from utils.database import db, decode_page_cursor
+from utils.credentials import CredentialServiceBusy
+from utils import metrics, prefork, services
 from utils.xai_explainer import (
     get_salary_explainer, get_recommendation_explainer, get_skill_gap_explainer
 )
@@ -35,6 +39,8 @@ def format_salary_lpa(rupees):
     return f"{lakhs:.1f}"
 
 UPLOAD_FOLDER = "uploads"
+# Candidates per page in the HR candidate browser
+CANDIDATES_PAGE_SIZE = int(os.getenv('CANDIDATES_PAGE_SIZE', 25))
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs("models", exist_ok=True)
 
@@ -42,6 +48,9 @@ app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'replace-with-secure-key-in-production')
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 
+# Per-route and per-stage latency histograms, served at /metrics
+metrics.init_app(app)
+
 # Register template filter for LPA formatting
 @app.template_filter('lpa')
 def lpa_filter(rupees):
@@ -71,8 +80,22 @@ def format_date_filter(value, format='%Y-%m-%d'):
             return value.split(' ')[0] if ' ' in value else value
     return value.strftime(format)
 
-# Ensure salary model exists / train lightweight sample
-ensure_trained_model()
+# Services and models are built on first use (utils/services.py). Once the
+# database is up, periodically purge expired login sessions.
+services.on_create("db", lambda manager: manager.start_session_sweeper())
+
+# Opt in to building everything at boot, off the request path. A pre-fork
+# master (gunicorn.conf.py) loads models itself and must not start threads.
+if os.getenv("WARMUP_ON_START", "0").lower() in ("1", "true", "yes") and not prefork.in_master():
+    threading.Thread(target=services.warmup, name="warmup", daemon=True).start()
+
+@app.cli.command("warmup")
+def warmup_command():
+    """Build every service and load every model now, reporting the time each takes."""
+    started = time.perf_counter()
+    for name, seconds in services.warmup().items():
+        print(f"[OK] {name}: {seconds:.2f}s")
+    print(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
 
 def login_required(f):
     """Decorator to require login for protected routes"""
@@ -86,10 +109,10 @@ def login_required(f):
     return decorated_function
 
 def get_current_user():
-    """Get current user from session"""
-    if 'user_id' in session:
-        return db.get_user_by_session(session.get('session_token'))
-    return None
+    """Get current user from session (looked up once per request)"""
+    if 'current_user' not in g:
+        g.current_user = db.get_user_by_session(session.get('session_token')) if 'user_id' in session else None
+    return g.current_user
 
 def hr_required(f):
     """Decorator to require HR role for protected routes"""
@@ -125,7 +148,11 @@ def login():
         flash("Please fill in all fields")
         return redirect(url_for('login'))
     
-    user = db.authenticate_user(username, password)
+    try:
+        user = db.authenticate_user(username, password)
+    except CredentialServiceBusy:
+        flash("The server is busy, please try logging in again in a moment")
+        return redirect(url_for('login'))
     if user:
         session_token = db.create_session(user['id'])
         if session_token:
@@ -163,7 +190,11 @@ def register():
     if user_role not in ['student', 'hr']:
         user_role = 'student'
     
-    success = db.create_user(username, email, password, full_name=None, user_role=user_role)
+    try:
+        success = db.create_user(username, email, password, full_name=None, user_role=user_role)
+    except CredentialServiceBusy:
+        flash("The server is busy, please try again in a moment")
+        return redirect(url_for('register'))
     if success:
         flash("Account created successfully! Please login.")
         return redirect(url_for('login'))
@@ -173,6 +204,8 @@ def register():
 
 @app.route("/logout")
 def logout():
+    db.delete_session(session.get('session_token'))
+    g.pop('current_user', None)
     session.clear()
     flash("Logged out successfully")
     return redirect(url_for('index'))
@@ -786,8 +819,7 @@ def hr_dashboard():
     user = get_current_user()
     
     # Get all candidates count
-    all_candidates = db.get_all_candidates(limit=1000)
-    total_candidates = len(all_candidates)
+    total_candidates = db.count_candidates()
     
     # Get recent candidates for preview
     recent_candidates = db.get_all_candidates(limit=10)
@@ -867,19 +899,29 @@ def hr_candidates():
     degree = request.args.get("degree", "").strip()
     stream = request.args.get("stream", "").strip()
     
-    # Search candidates
-    if any([skills, location, degree, stream]):
-        candidates = db.search_candidates(
-            skills=skills if skills else None,
-            location=location if location else None,
-            degree=degree if degree else None,
-            stream=stream if stream else None,
-            limit=100
-        )
-    else:
-        candidates = db.get_all_candidates(limit=100)
+    # Keyset page cursor from the "Next page" link
+    after = request.args.get("after") or None
+    if after:
+        try:
+            decode_page_cursor(after)
+        except ValueError:
+            after = None
+    
+    # Search candidates (location is not stored on profiles, so it doesn't filter)
+    filters = dict(skills=skills or None, degree=degree or None, stream=stream or None)
+    candidates, next_cursor = db.get_candidates_page(page_size=CANDIDATES_PAGE_SIZE, after=after, **filters)
+    total_candidates = db.count_candidates(**filters)
+    next_page_url = None
+    if next_cursor:
+        next_page_url = url_for('hr_candidates', skills=skills, location=location, degree=degree,
+                                stream=stream, after=next_cursor)
+    first_page_url = None
+    if after:
+        first_page_url = url_for('hr_candidates', skills=skills, location=location, degree=degree, stream=stream)
     
     return render_template("hr/candidates.html", user=user, candidates=candidates,
+                         total_candidates=total_candidates,
+                         next_page_url=next_page_url, first_page_url=first_page_url,
                          search_skills=skills, search_location=location, 
                          search_degree=degree, search_stream=stream)
 
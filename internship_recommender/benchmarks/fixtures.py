@@ -0,0 +1,29 @@
+"""
+Synthetic, seeded fixtures for the benchmark suite.
+Candidates look like rows from DatabaseManager.get_all_candidates; both they
+and the job postings come from utils.synthetic_data, so benchmarks and load
+tests run against the same distributions.
+"""
+from typing import Dict, List
+
+from utils.synthetic_data import generate_candidates, generate_job_postings
+
+
+def make_candidates(n: int, seed: int = 0) -> List[Dict]:
+    return [dict(c, resume_path=None) for c in generate_candidates(n, seed=seed, prefix="candidate")]
+
+
+def make_job_postings(n: int, seed: int = 0) -> List[Dict]:
+    return list(generate_job_postings(n, hr_user_ids=[1], seed=seed))
+
+
+def make_resume_text(candidate: Dict) -> str:
+    skills = candidate["skills"]
+    return (
+        f"{candidate['full_name']}\n{candidate['email']}\n\n"
+        f"PROFILE SUMMARY\nMotivated {candidate['degree']} student in {candidate['stream']} "
+        f"looking for a {candidate['target_role']} internship. Comfortable with {skills}.\n\n"
+        f"EDUCATION\n{candidate['degree']} ({candidate['stream']}), year {candidate['study_year']}\n\n"
+        f"SKILLS\n{skills}\n\n"
+        f"PROJECTS\nBuilt a {candidate['target_role'].lower()} portfolio project using {skills.split(', ')[0]}.\n"
+    )
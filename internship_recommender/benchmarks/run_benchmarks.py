@@ -0,0 +1,371 @@
+"""
+Benchmarks for the candidate matching, skill extraction, ATS, recommendation,
+salary and candidate-search hot paths, run on seeded synthetic fixtures.
+
+Scaled benchmarks run at 100 (small), 10k (medium) and 100k (large)
+candidates; the others time a fixed sample of calls. Results are written as
+JSON and compared with a stored baseline; the run exits with status 1 when
+a benchmark is slower than its baseline by more than the tolerance.
+Timings are machine-specific, so no baseline ships with the repo: record one
+with --save-baseline on the machine that runs the check. Without a baseline
+the run stops with status 2 unless --no-compare is given.
+
+Usage: python benchmarks/run_benchmarks.py [--scale small medium] [--only match search]
+                                           [--output results.json] [--baseline PATH]
+                                           [--save-baseline | --no-compare] [--tolerance 0.25]
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = BENCH_DIR.parent
+
+# Add the project directory to the path
+sys.path.insert(0, str(PROJECT_DIR))
+
+# Self-contained run: a throwaway SQLite database and no background work
+WORK_DIR = Path(tempfile.mkdtemp(prefix="benchmarks-"))
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = str(WORK_DIR / "benchmark.db")
+os.environ["DB_WRITE_BEHIND"] = "0"
+os.environ["SESSION_SWEEP_INTERVAL"] = "0"
+os.environ["SALARY_BACKGROUND_TRAINING"] = "0"
+# sklearn warns on every unnamed-feature predict; it would drown the report
+warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
+
+from fixtures import make_candidates, make_job_postings, make_resume_text
+
+SCALES = {"small": 100, "medium": 10_000, "large": 100_000}
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+SEED = 42
+
+# name -> (setup function, scaled)
+BENCHMARKS = {}
+
+
+def benchmark(name, scaled=False):
+    """
+    Register a benchmark. ``setup(n)`` prepares fixtures and returns
+    ``(run, ops)``: a callable doing the timed work and the number of
+    operations one call performs. ``n`` is the scale for scaled benchmarks.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, scaled)
+        return setup
+    return register
+
+
+_candidates = {}
+
+
+def candidates(n):
+    # The generator is seeded, so smaller scales are prefixes of larger ones
+    if n not in _candidates:
+        _candidates[n] = make_candidates(n, seed=SEED)
+    return _candidates[n]
+
+
+def jobs(n=20):
+    return make_job_postings(n, seed=SEED)
+
+
+def _skills(candidate):
+    return [s.strip() for s in candidate["skills"].split(",") if s.strip()]
+
+
+@benchmark("calculate_match_score")
+def bench_calculate_match_score(n=None):
+    from utils.candidate_matcher import calculate_match_score
+    rng = random.Random(SEED)
+    pairs = [(c, rng.choice(jobs())) for c in candidates(500)]
+
+    def run():
+        for candidate, job in pairs:
+            calculate_match_score(_skills(candidate), _skills({"skills": job["required_skills"]}),
+                                  job["title"], candidate)
+    return run, len(pairs)
+
+
+@benchmark("match_candidates_to_job", scaled=True)
+def bench_match_candidates_to_job(n):
+    from utils.candidate_matcher import match_candidates_to_job
+    pool = candidates(n)
+    job = jobs()[0]
+    return (lambda: match_candidates_to_job(pool, job)), n
+
+
+@benchmark("simple_skill_extract")
+def bench_simple_skill_extract(n=None):
+    from utils.ner_extractor import simple_skill_extract
+    resumes = [make_resume_text(c) for c in candidates(200)]
+
+    def run():
+        for text in resumes:
+            simple_skill_extract(text)
+    return run, len(resumes)
+
+
+@benchmark("extract_skills_and_summary")
+def bench_extract_skills_and_summary(n=None):
+    from utils.ner_extractor import extract_skills_and_summary
+    from utils.ollama_summarizer import summarizer
+    # Time the local extraction and fallback summary, not an Ollama round trip
+    summarizer.is_available = lambda: False
+    resumes = [make_resume_text(c) for c in candidates(200)]
+
+    def run():
+        for text in resumes:
+            extract_skills_and_summary(text)
+    return run, len(resumes)
+
+
+@benchmark("ats_analyze_resume_vs_jd")
+def bench_ats_analyze(n=None):
+    from utils.explainable_ats_engine import ats_engine
+    rng = random.Random(SEED)
+    pairs = [(c, rng.choice(jobs())) for c in candidates(100)]
+
+    def run():
+        for candidate, job in pairs:
+            ats_engine.analyze_resume_vs_jd(
+                resume_skills=_skills(candidate),
+                job_required_skills=_skills({"skills": job["required_skills"]}),
+                resume_education=candidate["degree"],
+                resume_text=make_resume_text(candidate),
+                job_description=job["description"],
+            )
+    return run, len(pairs)
+
+
+@benchmark("recommend_internships_from_profile")
+def bench_recommend_internships(n=None):
+    from utils.recommender import recommend_internships_from_profile
+    queries = [(_skills(c), c["target_role"], random.Random(c["id"]).choice(["Bangalore", "Chennai", "Remote", ""]))
+               for c in candidates(200)]
+
+    def run():
+        for skills, role, location in queries:
+            recommend_internships_from_profile(skills, role, location, top_k=5)
+    return run, len(queries)
+
+
+@benchmark("rank_missing_skills")
+def bench_rank_missing_skills(n=None):
+    from utils.skill_graph import rank_missing_skills
+    rng = random.Random(SEED)
+    pool = candidates(1000)
+    calls = [(_skills(c), _skills(rng.choice(pool))) for c in pool]
+
+    def run():
+        for have, missing in calls:
+            rank_missing_skills(have, missing)
+    return run, len(calls)
+
+
+@benchmark("predict_salary")
+def bench_predict_salary(n=None):
+    from utils import salary_predictor as sp
+    # A baseline model in the scratch directory, so the served model is untouched
+    sp.MODEL_PATH = WORK_DIR / "models" / "salary_model.pkl"
+    sp.ARTIFACT_DIR = WORK_DIR / "models" / "salary"
+    sp.MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    sp.save_model_artifact(sp.train_salary_model(sp._fallback_training_frame(), baseline=True))
+    calls = [(_skills(c), c["target_role"], c["study_year"] % 3) for c in candidates(2000)]
+
+    def run():
+        for skills, role, experience in calls:
+            sp.predict_salary(skills, role, experience)
+    return run, len(calls)
+
+
+_loaded_rows = 0
+
+
+def _load_candidates(db, n):
+    """Grow the scratch database to ``n`` candidates."""
+    global _loaded_rows
+    from utils.synthetic_data import bulk_load_users
+    if n <= _loaded_rows:
+        return
+    bulk_load_users(db, candidates(n)[_loaded_rows:n])
+    db.connection.execute("ANALYZE")
+    _loaded_rows = n
+
+
+@benchmark("search_candidates", scaled=True)
+def bench_search_candidates(n):
+    from utils.database import db
+    _load_candidates(db, n)
+    searches = [
+        {"skills": job["required_skills"].split(", ")[0] + ", " + job["required_skills"].split(", ")[-1]}
+        for job in jobs()
+    ] + [{"degree": "B.Tech"}, {"stream": "Computer Science"}, {}]
+
+    def run():
+        for filters in searches:
+            db.search_candidates(limit=50, **filters)
+    return run, len(searches)
+
+
+def time_run(run, ops, repeat, max_time):
+    """Run once to warm up, then up to ``repeat`` timed runs within ``max_time`` seconds."""
+    run()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat:
+        t0 = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - t0)
+        if time.perf_counter() - started > max_time:
+            break
+    median = statistics.median(timings)
+    return {
+        "ops": ops,
+        "runs": len(timings),
+        "median_s": median,
+        "min_s": min(timings),
+        "per_op_us": median / ops * 1e6,
+        "best_per_op_us": min(timings) / ops * 1e6,
+        "ops_per_s": ops / median if median else None,
+    }
+
+
+def result_key(result):
+    return f"{result['name']}@{result['scale']}" if result["scale"] else result["name"]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Annotate results with their baseline ratio; returns the keys that regressed.
+    Compares the fastest run, which is far less noisy than the median.
+    """
+    previous = {result_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = previous.get(result_key(result))
+        if base is None or "best_per_op_us" not in result or "best_per_op_us" not in base:
+            result["status"] = "new" if "best_per_op_us" in result else result.get("status", "skipped")
+            continue
+        ratio = result["best_per_op_us"] / base["best_per_op_us"] if base["best_per_op_us"] else 1.0
+        result["baseline_best_per_op_us"] = base["best_per_op_us"]
+        result["ratio"] = ratio
+        if ratio > 1 + tolerance:
+            result["status"] = "regressed"
+            regressions.append(result_key(result))
+        elif ratio < 1 - tolerance:
+            result["status"] = "faster"
+        else:
+            result["status"] = "ok"
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_table(results):
+    print(f"\n{'benchmark':40} {'scale':>8} {'median/op':>14} {'best/op':>14} {'baseline':>14} {'ratio':>7}  status")
+    for r in results:
+        per_op = f"{r['per_op_us']:.1f} us" if "per_op_us" in r else "-"
+        best = f"{r['best_per_op_us']:.1f} us" if "best_per_op_us" in r else "-"
+        base = f"{r['baseline_best_per_op_us']:.1f} us" if "baseline_best_per_op_us" in r else "-"
+        ratio = f"{r['ratio']:.2f}" if "ratio" in r else "-"
+        print(f"{r['name']:40} {r['scale'] or '-':>8} {per_op:>14} {best:>14} {base:>14} {ratio:>7}  {r.get('status', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks")
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=["small", "medium"],
+                        help="Candidate pool sizes for scaled benchmarks")
+    parser.add_argument("--only", nargs="+", default=[], help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--max-time", type=float, default=10.0, help="Seconds of timed runs per benchmark")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--no-compare", action="store_true", help="Only measure; skip the baseline check")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    compare_baseline = not (args.save_baseline or args.no_compare)
+    if compare_baseline and not baseline_path.exists():
+        # Fail before spending minutes on runs that can't be checked
+        print(f"[ERROR] No baseline at {baseline_path}; the regression check can't run.\n"
+              f"        Record one with --save-baseline, or pass --no-compare to only measure.")
+        sys.exit(2)
+
+    selected = {name: spec for name, spec in BENCHMARKS.items()
+                if not args.only or any(part in name for part in args.only)}
+    scales = sorted(args.scale, key=SCALES.get)
+
+    results = []
+    for name, (setup, scaled) in selected.items():
+        for scale in (scales if scaled else [None]):
+            label = f"{name} [{scale}]" if scale else name
+            print(f"Running {label}...", flush=True)
+            result = {"name": name, "scale": scale, "n": SCALES[scale] if scale else None}
+            try:
+                run, ops = setup(SCALES[scale] if scale else None)
+                result.update(time_run(run, ops, args.repeat, args.max_time))
+            except Exception as e:
+                print(f"  skipped: {e}")
+                result.update(status="skipped", error=str(e))
+            results.append(result)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scales": {scale: SCALES[scale] for scale in scales},
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if compare_baseline:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["meta"]["baseline"] = str(baseline_path)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} benchmark(s) slower than baseline by more than "
+              f"{args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@
 Quick script to check Ollama status and available models
 Run this to diagnose chatbot connection issues
 """
+import os
 import requests
 import json
 
 def check_ollama():
-    base_url = "http://localhost:11434"
+    base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
     
     print("=" * 60)
     print("Ollama Status Check")
@@ -16,7 +17,7 @@ def check_ollama():
     try:
         response = requests.get(f"{base_url}/api/tags", timeout=5)
         if response.status_code == 200:
-            print("[OK] Ollama server is running on localhost:11434")
+            print(f"[OK] Ollama server is running on {base_url}")
             print()
             
             # Get available models
@@ -0,0 +1,54 @@
+"""
+Gunicorn settings. Run from this directory: gunicorn app:app
+
+By default the app is preloaded in the master, which loads the read-only
+models and indexes (spaCy, embedding models, salary model, internship index)
+once before forking; workers share them copy-on-write and only open their
+own DB connections and pools (utils/prefork.py). Set PREFORK_LOAD=0 to have
+each worker import and load everything itself.
+
+Latency histograms are recorded per worker; they are shared through
+METRICS_DIR (a fresh directory per server run unless set), so a /metrics
+scrape answered by any worker reports the totals of all of them.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the project directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import prefork
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 4))
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+preload_app = prefork.PREFORK_ENABLED
+
+# Set before the app (and utils.metrics) is imported, here or in the workers
+_own_metrics_dir = "METRICS_DIR" not in os.environ
+if _own_metrics_dir:
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="internship-metrics-")
+
+if preload_app:
+    # Before the app is imported, so loading doesn't leave freed holes in shared pages
+    prefork.begin()
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before any worker is forked
+    if preload_app:
+        for name, seconds in prefork.preload().items():
+            server.log.info("Pre-fork load %s: %.2fs", name, seconds)
+
+
+def post_fork(server, worker):
+    if preload_app:
+        prefork.after_fork()
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
@@ -0,0 +1,35 @@
+"""
+Stream one or more internship feeds (CSV or JSONL) into the indexed catalog store.
+The running app picks up the refreshed catalog on its next request.
+
+Usage: python ingest_internships.py data/internships.csv feeds/naukri.jsonl
+"""
+import argparse
+import os
+import sys
+
+# Add the project directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.internship_store import InternshipStore, STORE_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest internship feeds into the catalog store")
+    parser.add_argument("sources", nargs="+", help="CSV or JSONL files to ingest")
+    parser.add_argument("--store", default=str(STORE_PATH), help="Path of the SQLite catalog store")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows read per chunk")
+    args = parser.parse_args()
+
+    store = InternshipStore(args.store)
+    print("=" * 50)
+    print(f"Ingesting into {store.path}")
+    print("=" * 50)
+    for source in args.sources:
+        stats = store.ingest(source, chunk_size=args.chunk_size)
+        print(f"[OK] {source}: read {stats['read']} rows, wrote {stats['written']} postings")
+    print(f"\nCatalog now holds {store.count()} postings (version {store.version()})")
+
+
+if __name__ == "__main__":
+    main()
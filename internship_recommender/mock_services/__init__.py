@@ -0,0 +1,5 @@
+"""
+Local stand-ins for the external services the app depends on (Ollama,
+Gemini, internship search), plus a load-test driver, so end-to-end
+throughput can be measured offline.
+"""
@@ -0,0 +1,115 @@
+"""
+Fake Gemini backend. install_fake_gemini() swaps the model behind the global
+gemini_service for one that answers from canned responses after a
+configurable delay, so Gemini routes can run without an API key, the SDK or
+network access.
+"""
+import json
+import random
+import time
+from types import SimpleNamespace
+
+PARSED_RESUME = {
+    "personal_info": {
+        "name": "Test Candidate",
+        "email": "candidate@example.com",
+        "linkedin": "Not Found",
+        "github": "Not Found",
+        "phone": None,
+        "summary": "Computer science student focused on backend development and data analysis.",
+    },
+    "education": [{"degree": "B.Tech", "institution": "Example Institute of Technology", "year": "2026", "score": "8.4"}],
+    "skills": {
+        "technical": ["Python", "SQL", "Flask", "Machine Learning", "Git"],
+        "soft": ["Communication", "Teamwork"],
+        "tools": ["Docker", "Linux"],
+    },
+    "experience": [{
+        "role": "Software Engineering Intern",
+        "company": "Example Labs",
+        "duration": "May 2025 - Jul 2025",
+        "description": ["Built REST APIs in Flask", "Cut report generation time by 40%"],
+    }],
+    "projects": [{
+        "title": "Internship Recommender",
+        "technologies": "Python, Flask, scikit-learn",
+        "description": ["Recommends internships from resume skills"],
+    }],
+    "certifications": ["Python for Data Science - Example Academy"],
+    "achievements": ["Finalist, college hackathon"],
+    "professional_info": {"sector": "Technology", "experience_years": "0"},
+    "suggestions": {
+        "linkedin_maintenance": ["Add a headline with your target role", "Pin your best project"],
+        "github_project_ideas": [{"title": "Job board scraper", "description": "Aggregate postings",
+                                  "tech_stack": ["Python", "BeautifulSoup"]}],
+    },
+}
+
+DESIGN_FEEDBACK = {
+    "design_score": 7,
+    "critique": ["Use consistent date formats", "Group skills by category", "Quantify project outcomes"],
+    "recommended_template": "Modern Minimalist",
+    "template_reason": "Keeps a technical resume scannable.",
+}
+
+INSIGHT_TEXT = ("You bring a solid mix of Python and data skills, which is what lifts your estimate. "
+                "Adding one deployed project with cloud experience is the quickest way to reach the next band.")
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """Stands in for genai.GenerativeModel; picks a reply from the prompt's shape."""
+
+    def __init__(self, model_name="fake-gemini", latency=0.0, jitter=0.0):
+        self.model_name = model_name
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+
+    def generate_content(self, contents):
+        self.calls += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        parts = contents if isinstance(contents, (list, tuple)) else [contents]
+        prompt = " ".join(p for p in parts if isinstance(p, str))
+        return FakeResponse(self._reply(prompt))
+
+    def _reply(self, prompt):
+        if '"personal_info"' in prompt:
+            return json.dumps(PARSED_RESUME)
+        if '"min_salary"' in prompt:
+            low = 300000 + 50000 * (len(prompt) % 8)
+            return json.dumps({"min_salary": low, "max_salary": low * 2,
+                               "explanation": "Estimated from the listed skills and role demand."})
+        if '"design_score"' in prompt:
+            return json.dumps(DESIGN_FEEDBACK)
+        if "Rewrite the following" in prompt:
+            original = prompt.split("Original Content:", 1)[-1].split("CRITICAL:", 1)[0].strip()
+            return original or "Delivered measurable results using Python and SQL."
+        return INSIGHT_TEXT
+
+
+def _fake_upload_file(path, mime_type=None):
+    return SimpleNamespace(name=f"files/{abs(hash(path)) % 10 ** 8}", uri=path, mime_type=mime_type)
+
+
+def install_fake_gemini(service=None, latency=0.0, jitter=0.0):
+    """Point ``service`` (the global gemini_service by default) at a FakeGenerativeModel."""
+    from utils import gemini_service as module
+
+    service = service or module.gemini_service
+    model = FakeGenerativeModel(latency=latency, jitter=jitter)
+    service.api_key = service.api_key or "fake-key"
+    service.model = model
+    # parse_resume uploads PDFs and images through the SDK module
+    module.genai = SimpleNamespace(
+        configure=lambda **kwargs: None,
+        GenerativeModel=lambda name, **kwargs: FakeGenerativeModel(name, latency, jitter),
+        upload_file=_fake_upload_file,
+    )
+    return model
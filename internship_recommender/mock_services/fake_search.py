@@ -0,0 +1,47 @@
+"""
+Fake internship search backend with configurable latency. Importing this
+module registers it as "fake" in SEARCH_BACKENDS; install_fake_search()
+makes it the active backend.
+"""
+import random
+import time
+
+from utils.scraper import SearchBackend, SEARCH_BACKENDS, set_search_backend
+
+COMPANIES = ["Acme Analytics", "Nimbus Cloud", "Byteworks", "Orbit Labs", "Quantum Retail", "Greenleaf Health"]
+
+
+class FakeSearchBackend(SearchBackend):
+    """Returns synthetic postings shaped like DuckDuckGo results."""
+
+    name = "fake"
+
+    def __init__(self, latency=0.0, jitter=0.0, empty_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        # Share of searches that come back empty, to exercise the local fallback
+        self.empty_rate = empty_rate
+        self.calls = 0
+
+    def search(self, role, location, top_k=5):
+        self.calls += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if self.empty_rate and random.random() < self.empty_rate:
+            return []
+        slug = "-".join((role or "intern").lower().split())
+        return [{
+            "title": f"{role} Intern - {COMPANIES[i % len(COMPANIES)]}",
+            "link": f"https://jobs.example.com/{slug}/{i}",
+            "snippet": f"{COMPANIES[i % len(COMPANIES)]} is hiring a {role} intern in {location or 'India'}.",
+        } for i in range(top_k)]
+
+
+SEARCH_BACKENDS[FakeSearchBackend.name] = FakeSearchBackend
+
+
+def install_fake_search(latency=0.0, jitter=0.0, empty_rate=0.0):
+    backend = FakeSearchBackend(latency=latency, jitter=jitter, empty_rate=empty_rate)
+    set_search_backend(backend)
+    return backend
@@ -0,0 +1,376 @@
+"""
+Load-test driver: replays a student/HR traffic mix and reports throughput and
+p50/p95/p99 latency per route.
+
+By default everything runs in this process: a scratch SQLite database is
+filled with synthetic users and jobs, the mock Ollama server is started, the
+fake Gemini and search backends are installed, and virtual users hit the
+Flask app through its test client. With --url the same mix is sent to a
+running server instead; its database must already hold synthetic users
+(generate_synthetic_data.py) and it should be pointed at the mocks.
+
+    python -m mock_services.load_test --users 16 --duration 60 --hr-share 0.2
+    python -m mock_services.load_test --url http://127.0.0.1:5000 --users 32
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
+
+ROLES = ["Software Engineer", "Data Scientist", "Python Developer", "Frontend Developer", "Data Analyst"]
+LOCATIONS = ["Bangalore", "Chennai", "Hyderabad", "Pune", "Remote"]
+SKILLS = ["Python", "SQL", "Java", "React", "Machine Learning", "Docker", "AWS", "Git"]
+QUESTIONS = ["How do ATS systems score keywords?", "Should my resume be one page?",
+             "What does an ATS do with tables?"]
+HR_QUESTIONS = ["Summarize this candidate's strengths.", "Which skills is this candidate missing for the job?",
+                "Is this candidate a good fit?"]
+
+
+# ---- traffic mix ------------------------------------------------------------
+# Each action gets (client, ctx) and sends one request; the weights say how
+# often a virtual user of that kind picks it.
+
+def _student_dashboard(client, ctx):
+    return client.request("GET", "/dashboard")
+
+
+def _student_apply(client, ctx):
+    rng = ctx["rng"]
+    form = {"full_name": "Load Test", "email": "load@example.com", "role": rng.choice(ROLES),
+            "location": rng.choice(LOCATIONS), "degree": "B.Tech", "year": "3", "sector": "Technology",
+            "stream": "Computer Science", "skills": rng.sample(SKILLS, 4)}
+    return client.request("POST", "/apply", form=form)
+
+
+def _student_recommendations(client, ctx):
+    return client.request("GET", "/recommendations")
+
+
+def _student_predict_salary(client, ctx):
+    rng = ctx["rng"]
+    body = {"skills": rng.sample(SKILLS, 4), "role": rng.choice(ROLES), "experience": rng.randint(0, 2)}
+    return client.request("POST", "/api/predict_salary", json=body)
+
+
+def _student_ats_chat(client, ctx):
+    return client.request("POST", "/api/ats-educator/chat", json={"question": ctx["rng"].choice(QUESTIONS)})
+
+
+def _student_courses(client, ctx):
+    return client.request("POST", "/api/course_recommendations", json={"skill": ctx["rng"].choice(SKILLS)})
+
+
+def _student_rewrite(client, ctx):
+    body = {"text": "Worked on a web app using Python and SQL.", "style": "professional"}
+    return client.request("POST", "/api/rewrite-text", json=body)
+
+
+def _hr_dashboard(client, ctx):
+    return client.request("GET", "/hr/dashboard")
+
+
+def _hr_candidates(client, ctx):
+    rng = ctx["rng"]
+    return client.request("GET", "/hr/candidates", params={"skills": ", ".join(rng.sample(SKILLS, 2))})
+
+
+def _hr_job_match(client, ctx):
+    if not ctx["job_ids"]:
+        return None
+    return client.request("GET", f"/hr/job/{ctx['rng'].choice(ctx['job_ids'])}/match")
+
+
+def _hr_match_api(client, ctx):
+    if not ctx["job_ids"]:
+        return None
+    return client.request("POST", "/api/hr/match_candidates", json={"job_id": ctx["rng"].choice(ctx["job_ids"])})
+
+
+def _hr_chatbot(client, ctx):
+    rng = ctx["rng"]
+    body = {"question": rng.choice(HR_QUESTIONS), "candidate_id": rng.choice(ctx["candidate_ids"]) if ctx["candidate_ids"] else None}
+    return client.request("POST", "/api/hr/chatbot", json=body)
+
+
+STUDENT_MIX = [
+    ("GET /dashboard", _student_dashboard, 25),
+    ("POST /apply", _student_apply, 10),
+    ("GET /recommendations", _student_recommendations, 15),
+    ("POST /api/predict_salary", _student_predict_salary, 20),
+    ("POST /api/ats-educator/chat", _student_ats_chat, 10),
+    ("POST /api/course_recommendations", _student_courses, 15),
+    ("POST /api/rewrite-text", _student_rewrite, 5),
+]
+
+HR_MIX = [
+    ("GET /hr/dashboard", _hr_dashboard, 25),
+    ("GET /hr/candidates", _hr_candidates, 30),
+    ("GET /hr/job/<id>/match", _hr_job_match, 15),
+    ("POST /api/hr/match_candidates", _hr_match_api, 15),
+    ("POST /api/hr/chatbot", _hr_chatbot, 15),
+]
+
+
+# ---- clients ----------------------------------------------------------------
+# Both return a status code. A redirect to the login page means the session
+# was rejected, so it is reported as 401 rather than a successful 302.
+
+def _status(status_code, location):
+    if 300 <= status_code < 400 and (location or "").split("?")[0].endswith("/login"):
+        return 401
+    return status_code
+
+
+class TestClientAdapter:
+    """Sends requests through Flask's test client (no sockets)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, form=None, json=None, params=None):
+        response = self.client.open(path, method=method, data=form, json=json, query_string=params)
+        return _status(response.status_code, response.headers.get("Location"))
+
+
+class HttpClientAdapter:
+    """Sends requests to a running server over HTTP."""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def request(self, method, path, form=None, json=None, params=None):
+        response = self.session.request(method, self.base_url + path, data=form, json=json, params=params,
+                                        allow_redirects=False, timeout=120)
+        return _status(response.status_code, response.headers.get("Location"))
+
+
+# ---- stats ------------------------------------------------------------------
+
+class RouteStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, route, seconds, ok):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(stats, elapsed):
+    rows = []
+    every = []
+    for route in sorted(stats.latencies):
+        values = sorted(stats.latencies[route])
+        every.extend(values)
+        rows.append(_summary_row(route, values, stats.errors.get(route, 0), elapsed))
+    every.sort()
+    rows.append(_summary_row("TOTAL", every, sum(stats.errors.values()), elapsed))
+    return rows
+
+
+def _summary_row(route, values, errors, elapsed):
+    return {
+        "route": route,
+        "requests": len(values),
+        "errors": errors,
+        "rps": len(values) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def print_report(rows, elapsed, users):
+    print()
+    print(f"{users} virtual users, {elapsed:.1f}s")
+    header = f"{'route':<36}{'reqs':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        if row["route"] == "TOTAL":
+            print("-" * len(header))
+        print(f"{row['route']:<36}{row['requests']:>8}{row['errors']:>8}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+
+
+# ---- driver -----------------------------------------------------------------
+
+def virtual_user(make_client, account, password, mix, ctx, stats, deadline, max_requests, think_time):
+    client = make_client()
+    status = client.request("POST", "/login", form={"username": account, "password": password})
+    if status >= 400:
+        stats.record("POST /login", 0.0, False)
+        return
+    routes, actions, weights = zip(*mix)
+    sent = 0
+    while time.perf_counter() < deadline and (not max_requests or sent < max_requests):
+        i = ctx["rng"].choices(range(len(actions)), weights)[0]
+        started = time.perf_counter()
+        try:
+            status = actions[i](client, ctx)
+            ok = status is None or status < 400
+        except Exception as e:
+            print(f"[ERROR] {routes[i]}: {e}")
+            ok = False
+        if status is not None:
+            stats.record(routes[i], time.perf_counter() - started, ok)
+            sent += 1
+        if think_time:
+            time.sleep(ctx["rng"].uniform(0, 2 * think_time))
+
+
+def load_accounts(db, limit):
+    """Synthetic student and HR usernames, plus the ids the HR mix needs."""
+    cursor = db.connection.cursor()
+    try:
+        accounts = {}
+        for role in ("student", "hr"):
+            cursor.execute("SELECT username FROM users WHERE username LIKE 'synth%' AND user_role = "
+                           f"'{role}' ORDER BY id LIMIT {int(limit)}")
+            accounts[role] = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT id, hr_user_id FROM job_postings")
+        jobs = cursor.fetchall()
+        cursor.execute("SELECT id, username FROM users WHERE user_role = 'hr' AND username LIKE 'synth%'")
+        hr_ids = {username: user_id for user_id, username in cursor.fetchall()}
+        cursor.execute("SELECT id FROM users WHERE user_role = 'student' ORDER BY id LIMIT 1000")
+        candidate_ids = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    jobs_by_hr = {}
+    for job_id, hr_user_id in jobs:
+        jobs_by_hr.setdefault(hr_user_id, []).append(job_id)
+    hr_jobs = {name: jobs_by_hr.get(user_id, []) for name, user_id in hr_ids.items()}
+    return accounts["student"], accounts["hr"], hr_jobs, candidate_ids
+
+
+def setup_in_process(args, work_dir):
+    """Start the mocks, seed a scratch database and import the app."""
+    from mock_services.ollama_server import start_mock_ollama
+
+    ollama = start_mock_ollama(latency=args.ollama_latency, jitter=args.ollama_latency / 2,
+                               token_delay=args.token_delay)
+    os.environ.update({
+        "OLLAMA_BASE_URL": ollama.base_url,
+        "DB_BACKEND": "sqlite",
+        "SQLITE_PATH": os.path.join(work_dir, "load_test.db"),
+        "SALARY_BACKGROUND_TRAINING": "0",
+        "SESSION_SWEEP_INTERVAL": "0",
+    })
+    from utils.database import db
+    from utils import synthetic_data as synth
+    from mock_services.fake_gemini import install_fake_gemini
+    from mock_services.fake_search import install_fake_search
+
+    synth.bulk_load_users(db, synth.generate_candidates(args.candidates, seed=args.seed, start_id=synth.next_id(db, "users")),
+                          password=args.password)
+    hr_rows = list(synth.hr_user_rows(max(1, args.users), seed=args.seed, start_id=synth.next_id(db, "users")))
+    synth.bulk_load_users(db, hr_rows, user_role="hr", password=args.password, with_profiles=False)
+    synth.bulk_load_job_postings(db, synth.generate_job_postings(args.jobs, [r["id"] for r in hr_rows], seed=args.seed,
+                                                                 start_id=synth.next_id(db, "job_postings")))
+    db.connection.execute("ANALYZE")
+
+    install_fake_gemini(latency=args.gemini_latency, jitter=args.gemini_latency / 2)
+    install_fake_search(latency=args.search_latency, jitter=args.search_latency / 2)
+
+    from app import app
+    app.config["TESTING"] = True
+    return db, (lambda: TestClientAdapter(app)), ollama
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay student/HR traffic and report per-route latency")
+    parser.add_argument("--url", help="base URL of a running server (default: run the app in-process)")
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual users")
+    parser.add_argument("--hr-share", type=float, default=0.2, help="share of virtual users that are HR")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="stop each user after this many requests")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between a user's requests")
+    parser.add_argument("--password", default="password123", help="password of the synthetic accounts")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--candidates", type=int, default=2000, help="synthetic candidates to seed (in-process)")
+    parser.add_argument("--jobs", type=int, default=200, help="synthetic job postings to seed (in-process)")
+    parser.add_argument("--ollama-latency", type=float, default=0.2, help="mock Ollama first-token latency (in-process)")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="mock Ollama per-token delay (in-process)")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="fake Gemini latency (in-process)")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="fake search latency (in-process)")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="load_test_")
+    ollama = None
+    try:
+        if args.url:
+            from utils.database import db
+            make_client = lambda: HttpClientAdapter(args.url)
+        else:
+            db, make_client, ollama = setup_in_process(args, work_dir)
+
+        students, hr, hr_jobs, candidate_ids = load_accounts(db, limit=max(1000, args.users * 10))
+        n_hr = min(len(hr), round(args.users * args.hr_share))
+        n_students = min(len(students), args.users - n_hr)
+        if not n_hr + n_students:
+            print("[ERROR] No synthetic accounts found; run generate_synthetic_data.py first")
+            return 1
+
+        stats = RouteStats()
+        deadline = time.perf_counter() + args.duration
+        threads = []
+        for i in range(n_students + n_hr):
+            is_hr = i >= n_students
+            account = hr[i - n_students] if is_hr else students[i]
+            ctx = {"rng": random.Random(args.seed * 1000 + i), "job_ids": hr_jobs.get(account, []),
+                   "candidate_ids": candidate_ids}
+            threads.append(threading.Thread(
+                target=virtual_user, name=f"vu-{i}",
+                args=(make_client, account, args.password, HR_MIX if is_hr else STUDENT_MIX, ctx, stats,
+                      deadline, args.requests, args.think_time),
+                daemon=True))
+
+        print(f"Running {n_students} student and {n_hr} HR users for up to {args.duration:.0f}s")
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        rows = summarize(stats, elapsed)
+        print_report(rows, elapsed, len(threads))
+        if ollama is not None:
+            print(f"\nMock Ollama requests: {ollama.request_counts}")
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"users": len(threads), "elapsed_s": elapsed, "routes": rows}, f, indent=2)
+        return 0
+    finally:
+        if ollama is not None:
+            ollama.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
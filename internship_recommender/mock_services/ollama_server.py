@@ -0,0 +1,210 @@
+"""
+Mock Ollama server speaking /api/tags, /api/generate and /api/chat.
+Replies are canned text; latency before the first token and the delay
+between tokens are configurable, and "stream": true sends NDJSON chunks the
+way Ollama does. Point the app at it with OLLAMA_BASE_URL.
+
+    python -m mock_services.ollama_server --port 11435 --latency 0.3 --token-delay 0.02
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_MODELS = ["tinyllama:latest", "llama3.2:latest"]
+
+REPLY_TEXT = (
+    "I am a motivated computer science student with hands-on experience in Python, SQL and web development. "
+    "I have built several projects using Flask and React and enjoy turning data into clear insights. "
+    "The candidate shows strong fundamentals and matches most of the required skills for this role. "
+    "Applicant tracking systems rank resumes by keyword overlap, clear section headings and consistent formatting. "
+    "To improve your chances, quantify your achievements and mirror the wording of the job description."
+).split()
+
+
+class MockOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, token_delay=0.0, tokens=60,
+                 models=None, verbose=False):
+        super().__init__(address, MockOllamaHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.models = models or DEFAULT_MODELS
+        self.verbose = verbose
+        self.request_counts = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def first_token_delay(self):
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def reply_tokens(self, prompt):
+        # Deterministic per prompt, so identical requests get identical replies
+        rng = random.Random(len(prompt))
+        start = rng.randrange(len(REPLY_TEXT))
+        words = [REPLY_TEXT[(start + i) % len(REPLY_TEXT)] for i in range(self.tokens)]
+        return [w + " " for w in words[:-1]] + words[-1:]
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockOllama/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        self.server.count(self.path)
+        if self.path == "/api/tags":
+            now = datetime.now(timezone.utc).isoformat()
+            self._send_json(200, {"models": [
+                {"name": name, "model": name, "modified_at": now, "size": 0, "digest": ""}
+                for name in self.server.models
+            ]})
+        elif self.path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-mock"})
+        elif self.path == "/":
+            body = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        self.server.count(self.path)
+        if self.path not in ("/api/generate", "/api/chat"):
+            self._send_json(404, {"error": "not found"})
+            return
+        payload = self._read_json()
+        if payload is None:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+        model = payload.get("model", self.server.models[0])
+        chat = self.path == "/api/chat"
+        if chat:
+            prompt = " ".join(m.get("content", "") for m in payload.get("messages", []))
+        else:
+            prompt = payload.get("prompt", "")
+
+        started = time.perf_counter()
+        tokens = self.server.reply_tokens(prompt)
+        time.sleep(self.server.first_token_delay())
+        # Ollama streams unless told otherwise
+        if payload.get("stream", True):
+            self._stream(model, chat, tokens, started)
+        else:
+            time.sleep(self.server.token_delay * len(tokens))
+            text = "".join(tokens)
+            body = self._chunk(model, chat, text, done=False)
+            body.update(self._final(model, chat, tokens, prompt, started))
+            body.update(self._content(chat, text))
+            self._send_json(200, body)
+
+    def _content(self, chat, text):
+        return {"message": {"role": "assistant", "content": text}} if chat else {"response": text}
+
+    def _chunk(self, model, chat, text, done):
+        body = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+        body.update(self._content(chat, text))
+        return body
+
+    def _final(self, model, chat, tokens, prompt, started):
+        total_ns = int((time.perf_counter() - started) * 1e9)
+        body = self._chunk(model, chat, "", done=True)
+        body.update({
+            "done_reason": "stop",
+            "total_duration": total_ns,
+            "load_duration": 0,
+            "prompt_eval_count": len(prompt.split()),
+            "prompt_eval_duration": 0,
+            "eval_count": len(tokens),
+            "eval_duration": total_ns,
+        })
+        return body
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, model, chat, tokens, started):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i and self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            self._write_chunk(json.dumps(self._chunk(model, chat, token, done=False)).encode("utf-8") + b"\n")
+        self._write_chunk(json.dumps(self._final(model, chat, tokens, "", started)).encode("utf-8") + b"\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def start_mock_ollama(host="127.0.0.1", port=0, **options) -> MockOllamaServer:
+    """Serve on a background thread (port 0 picks a free port); stop with server.shutdown()."""
+    server = MockOllamaServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="mock-ollama", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.1, help="extra random first-token delay, up to this many seconds")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed tokens")
+    parser.add_argument("--tokens", type=int, default=60, help="tokens per reply")
+    parser.add_argument("--model", action="append", dest="models", help="model to list in /api/tags (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = MockOllamaServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                              token_delay=args.token_delay, tokens=args.tokens, models=args.models,
+                              verbose=args.verbose)
+    print(f"Mock Ollama listening on {server.base_url} (export OLLAMA_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
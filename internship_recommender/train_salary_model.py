@@ -0,0 +1,62 @@
+"""
+Train the salary prediction model and publish it as a versioned artifact.
+The running app reloads the promoted model on its next prediction.
+
+Usage: python train_salary_model.py [--roles "data scientist" "qa engineer"] [--no-promote]
+       python train_salary_model.py --incremental [--observations new_salaries.csv] [--refit]
+"""
+import argparse
+import json
+import os
+import sys
+
+# Add the project directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.salary_predictor import train_and_publish, list_model_artifacts, TRAINING_ROLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and publish the salary prediction model")
+    parser.add_argument("--roles", nargs="+", default=TRAINING_ROLES, help="Roles to collect salary data for")
+    parser.add_argument("--location", default="India", help="Location used in salary searches")
+    parser.add_argument("--no-promote", action="store_true", help="Save the artifact without serving it")
+    parser.add_argument("--list", action="store_true", help="List existing artifacts and exit")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Retrain from the observation store instead of scraping")
+    parser.add_argument("--observations", nargs="*", default=[],
+                        help="CSV files of new observations to append before an incremental retrain")
+    parser.add_argument("--refit", action="store_true",
+                        help="With --incremental, refit on the recent window instead of warm-starting")
+    args = parser.parse_args()
+
+    if args.list:
+        for path in list_model_artifacts():
+            meta_path = path.with_suffix(".json")
+            meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+            print(f"{path.name}  {meta.get('kind', '?'):8}  {meta.get('model_type', '?'):28}  {meta.get('metrics', {})}")
+        return
+
+    if args.incremental:
+        import pandas as pd
+        from utils.salary_retrainer import append_observations, retrain
+
+        for source in args.observations:
+            batch = append_observations(pd.read_csv(source), source=os.path.basename(source))
+            print(f"[OK] Appended {source} -> {batch.name if batch else 'nothing'}")
+        report = retrain(refit=args.refit, promote=not args.no_promote)
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 50)
+    print("Training salary model")
+    print("=" * 50)
+    path, metadata = train_and_publish(args.roles, args.location, promote=not args.no_promote)
+    if path is None:
+        return
+    print(f"\n[OK] {path.name}")
+    print(json.dumps(metadata, indent=2))
+
+
+if __name__ == "__main__":
+    main()
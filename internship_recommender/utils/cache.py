@@ -0,0 +1,134 @@
+"""
+Small caches shared by the service modules: an in-process LRU with
+expiry and a JSON-file cache that survives restarts.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Entries are fresh for ``ttl`` seconds, then stale for a further
+    ``stale_ttl`` seconds (still returned by ``lookup`` so callers can serve
+    them while revalidating), then dropped. ``ttl=None`` never expires.
+    ``on_evict(key, value)`` is called for entries dropped by expiry or to
+    make room (not by pop or clear).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, stale_ttl: float = 0,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> Tuple[Any, Optional[str]]:
+        """Return ``(value, FRESH|STALE)`` or ``(None, None)`` on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None, None
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if self.ttl is None or age <= self.ttl:
+                self._data.move_to_end(key)
+                return value, FRESH
+            if age <= self.ttl + self.stale_ttl:
+                return value, STALE
+            del self._data[key]
+        # Expired; callbacks run outside the lock
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+        return None, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh value or ``default``."""
+        value, state = self.lookup(key)
+        return value if state == FRESH else default
+
+    def set(self, key: Hashable, value: Any):
+        evicted = []
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                old_key, (old_value, _) = self._data.popitem(last=False)
+                evicted.append((old_key, old_value))
+        if self.on_evict is not None:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """
+    JSON-file cache with per-entry expiry, one file per key.
+    Keys are any JSON-serializable value; values must be JSON-serializable.
+    Writes are atomic, so several processes can share one directory.
+    """
+
+    def __init__(self, directory, ttl: Optional[float] = None):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, key) -> Path:
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, key, default: Any = None, ttl: Optional[float] = None) -> Any:
+        """Return the stored value, or ``default`` when missing or older than ``ttl``."""
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return default
+        if ttl is not None and time.time() - entry.get("stored_at", 0) > ttl:
+            return default
+        return entry.get("value", default)
+
+    def set(self, key, value: Any):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": time.time(), "value": value}, f)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def pop(self, key):
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
@@ -5,6 +5,7 @@ Uses skill analysis, semantic matching, and scoring algorithms
 from .recommender import analyze_skill_gap, find_best_role
 from .ner_extractor import extract_skills_and_summary
 from .salary_predictor import predict_salary
+from .metrics import timed
 import json
 from typing import List, Dict, Tuple
 import difflib
@@ -287,6 +288,7 @@ def calculate_match_score(candidate_skills: List[str], job_skills: List[str],
         }
     }
 
+@timed("candidate_matching")
 def match_candidates_to_job(candidates: List[Dict], job_posting: Dict) -> List[Dict]:
     """
     Match multiple candidates to a job posting and return sorted by match score.
@@ -384,6 +386,7 @@ def match_candidates_to_job(candidates: List[Dict], job_posting: Dict) -> List[D
     
     return matched_candidates
 
+@timed("candidate_search")
 def search_and_match_candidates(job_posting: Dict, filters: Dict = None) -> List[Dict]:
     """
     Search candidates based on filters and match them to job posting.
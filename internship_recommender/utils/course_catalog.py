@@ -0,0 +1,179 @@
+"""
+Unified course catalog indexed by canonical skill ID.
+Merges the built-in COURSE_DATA, data/resources.json and an optional
+external catalog file (COURSE_CATALOG_PATH, JSON or JSONL) so lookups are
+a dict hit, with alias and trigram fallbacks for variant spellings.
+"""
+import difflib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from .text_index import TrigramIndex, tokenize
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+RESOURCES_FILE = DATA_DIR / "resources.json"
+COURSE_CATALOG_PATH = os.getenv("COURSE_CATALOG_PATH")
+
+# Common variants that don't share enough characters for fuzzy matching
+COURSE_ALIASES = {
+    "js": "JavaScript",
+    "javascript es6": "JavaScript",
+    "ml": "Machine Learning",
+    "powerbi": "Power BI",
+    "microsoft excel": "Excel",
+    "ms excel": "Excel",
+    "html5": "HTML",
+    "css3": "CSS",
+    "amazon web services": "AWS",
+    "reactjs": "React",
+    "react.js": "React",
+    "github": "Git",
+    "mysql": "SQL",
+    "postgresql": "SQL",
+    "python3": "Python",
+}
+
+FUZZY_CUTOFF = 0.85
+
+
+def skill_id(skill: str) -> str:
+    """Canonical catalog key for a skill name."""
+    return " ".join((skill or "").lower().split())
+
+
+def _resource_course(skill: str, url: str, paid: bool) -> Dict:
+    """Course entry for a bare resource URL from resources.json."""
+    course = {
+        "title": f"{skill} - {urlparse(url).netloc.replace('www.', '')}",
+        "platform": urlparse(url).netloc.replace("www.", ""),
+        "url": url,
+        "duration": "Self-paced",
+        "rating": "N/A",
+    }
+    if paid:
+        course["price"] = "Paid"
+    return course
+
+
+class CourseCatalog:
+    """Course lists per canonical skill, with alias and fuzzy lookup."""
+
+    def __init__(self, cache_size: int = 4096):
+        self.entries: Dict[str, Dict] = {}
+        self.aliases: Dict[str, str] = {}
+        self._trigrams = None
+        self._keys: List[str] = []
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def add(self, skill: str, free: Iterable[Dict] = (), paid: Iterable[Dict] = (),
+            aliases: Iterable[str] = ()):
+        """Merge courses for a skill; courses already listed (same URL) are skipped."""
+        sid = skill_id(skill)
+        entry = self.entries.setdefault(sid, {"skill": skill, "free": [], "paid": []})
+        for tier, courses in (("free", free), ("paid", paid)):
+            seen = {c.get("url") for c in entry[tier]}
+            for course in courses:
+                if course.get("url") not in seen:
+                    entry[tier].append(course)
+                    seen.add(course.get("url"))
+        for alias in aliases:
+            self.add_alias(alias, skill)
+        self._invalidate()
+
+    def add_alias(self, alias: str, skill: str):
+        self.aliases[skill_id(alias)] = skill_id(skill)
+        self._invalidate()
+
+    def _invalidate(self):
+        self._trigrams = None
+        self.resolve.cache_clear()
+
+    def _index(self) -> TrigramIndex:
+        if self._trigrams is None:
+            self._keys = list(self.entries) + [a for a in self.aliases if a not in self.entries]
+            self._trigrams = TrigramIndex(self._keys)
+        return self._trigrams
+
+    def _target(self, key: str) -> Optional[str]:
+        # A skill with its own courses wins over an alias of the same name
+        if key in self.entries:
+            return key
+        sid = self.aliases.get(key)
+        return sid if sid in self.entries else None
+
+    def _resolve(self, key: str) -> Optional[str]:
+        # Exact skill or alias
+        sid = self._target(key)
+        if sid:
+            return sid
+
+        index = self._index()
+        # Longest catalog name whose every token appears in the query ("advanced python" -> python)
+        query_tokens = set(tokenize(key))
+        best = None
+        for item_id in index.contained_in(key):
+            candidate = self._keys[item_id]
+            if set(tokenize(candidate)) <= query_tokens and (best is None or len(candidate) > len(best)):
+                best = candidate
+        if best:
+            return self._target(best)
+
+        # Close spelling among the keys sharing the most trigrams
+        shortlist = [self._keys[i] for i in index.similar(key, 32)] if len(key) >= 3 else self._keys
+        match = difflib.get_close_matches(key, shortlist, n=1, cutoff=FUZZY_CUTOFF)
+        return self._target(match[0]) if match else None
+
+    def get(self, skill: str) -> Optional[Dict]:
+        """Catalog entry for a skill (``{"skill", "free", "paid"}``), or None."""
+        sid = self.resolve(skill_id(skill))
+        return self.entries.get(sid) if sid else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load_file(self, path):
+        """
+        Merge an external catalog: a JSON object {skill: {"free", "paid", "aliases"}}
+        or JSONL lines {"skill", "free", "paid", "aliases"}.
+        """
+        path = Path(path)
+        with open(path, "r", encoding="utf-8") as f:
+            if path.suffix.lower() in (".jsonl", ".ndjson"):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                records = [dict(v, skill=k) for k, v in data.items()]
+        for record in records:
+            self.add(record["skill"], record.get("free", []), record.get("paid", []),
+                     record.get("aliases", []))
+        print(f"Loaded {len(records)} skills from course catalog {path.name}")
+
+
+def build_course_catalog(course_data: Dict, resources_file: Path = RESOURCES_FILE,
+                         external_path: Optional[str] = COURSE_CATALOG_PATH) -> CourseCatalog:
+    catalog = CourseCatalog()
+    for alias, skill in COURSE_ALIASES.items():
+        catalog.add_alias(alias, skill)
+    for skill, courses in course_data.items():
+        catalog.add(skill, courses.get("free", []), courses.get("paid", []))
+    try:
+        with open(resources_file, "r", encoding="utf-8") as f:
+            resources = json.load(f)
+        for skill, links in resources.items():
+            catalog.add(
+                skill,
+                [_resource_course(skill, url, paid=False) for url in links.get("free", [])],
+                [_resource_course(skill, url, paid=True) for url in links.get("paid", [])],
+            )
+    except (OSError, ValueError) as e:
+        print(f"Could not load course resources: {e}")
+    if external_path:
+        try:
+            catalog.load_file(external_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load course catalog {external_path}: {e}")
+    return catalog
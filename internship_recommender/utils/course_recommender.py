@@ -1,8 +1,21 @@
 import requests
 import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import List, Dict, Tuple
 import time
+from abc import ABC, abstractmethod
+
+from .cache import DiskCache, TTLCache
+from .course_catalog import build_course_catalog, skill_id
+from .rate_limit import HostRateLimiter
+from .services import register_after_fork
+
+# Course lists are memoized per skill for this many seconds
+COURSE_CACHE_TTL = int(os.getenv("COURSE_CACHE_TTL", 3600))
+COURSE_FETCH_WORKERS = int(os.getenv("COURSE_FETCH_WORKERS", 16))
 
 # Course data structure
 COURSE_DATA = {
@@ -346,21 +359,17 @@ COURSE_DATA = {
     }
 }
 
+# Built-in courses merged with data/resources.json (and COURSE_CATALOG_PATH, if set)
+COURSE_CATALOG = build_course_catalog(COURSE_DATA)
+
 def get_course_recommendations(skill: str) -> Dict:
     """
     Get course recommendations for a specific skill.
     Returns both free and paid options.
     """
-    skill_lower = skill.lower()
-    
-    # Direct match
-    if skill_lower in COURSE_DATA:
-        return COURSE_DATA[skill_lower]
-    
-    # Fuzzy matching for similar skills
-    for key, courses in COURSE_DATA.items():
-        if skill_lower in key.lower() or key.lower() in skill_lower:
-            return courses
+    entry = COURSE_CATALOG.get(skill)
+    if entry:
+        return {"free": entry["free"], "paid": entry["paid"]}
     
     # Enhanced fallback with more comprehensive courses
     return {
@@ -415,6 +424,42 @@ def get_course_recommendations(skill: str) -> Dict:
         ]
     }
 
+def _udemy_course_templates(skill: str) -> List[Dict]:
+    slug = skill.lower().replace(' ', '-')
+    return [
+        {
+            "title": f"Complete {skill} Course - From Zero to Hero",
+            "platform": "Udemy",
+            "url": f"https://www.udemy.com/course/{slug}-complete/",
+            "price": "$89.99",
+            "duration": "15 hours",
+            "rating": 4.5,
+            "students": "50,000+"
+        },
+        {
+            "title": f"{skill} Bootcamp 2024",
+            "platform": "Udemy", 
+            "url": f"https://www.udemy.com/course/{slug}-bootcamp/",
+            "price": "$79.99",
+            "duration": "20 hours",
+            "rating": 4.6,
+            "students": "30,000+"
+        }
+    ]
+
+def _coursera_course_templates(skill: str) -> List[Dict]:
+    return [
+        {
+            "title": f"{skill} Specialization",
+            "platform": "Coursera",
+            "url": f"https://www.coursera.org/specializations/{skill.lower().replace(' ', '-')}",
+            "price": "$49/month",
+            "duration": "3 months",
+            "rating": 4.7,
+            "university": "Top University"
+        }
+    ]
+
 def scrape_udemy_courses(skill: str, max_results: int = 3) -> List[Dict]:
     """
     Scrape Udemy courses for a specific skill.
@@ -425,27 +470,7 @@ def scrape_udemy_courses(skill: str, max_results: int = 3) -> List[Dict]:
         time.sleep(0.5)
         
         # Mock data for demonstration
-        mock_courses = [
-            {
-                "title": f"Complete {skill} Course - From Zero to Hero",
-                "platform": "Udemy",
-                "url": f"https://www.udemy.com/course/{skill.lower().replace(' ', '-')}-complete/",
-                "price": "$89.99",
-                "duration": "15 hours",
-                "rating": 4.5,
-                "students": "50,000+"
-            },
-            {
-                "title": f"{skill} Bootcamp 2024",
-                "platform": "Udemy", 
-                "url": f"https://www.udemy.com/course/{skill.lower().replace(' ', '-')}-bootcamp/",
-                "price": "$79.99",
-                "duration": "20 hours",
-                "rating": 4.6,
-                "students": "30,000+"
-            }
-        ]
-        return mock_courses[:max_results]
+        return _udemy_course_templates(skill)[:max_results]
     except Exception as e:
         print(f"Error scraping Udemy courses: {e}")
         return []
@@ -458,92 +483,250 @@ def scrape_coursera_courses(skill: str, max_results: int = 3) -> List[Dict]:
     try:
         time.sleep(0.5)
         
-        mock_courses = [
-            {
-                "title": f"{skill} Specialization",
-                "platform": "Coursera",
-                "url": f"https://www.coursera.org/specializations/{skill.lower().replace(' ', '-')}",
-                "price": "$49/month",
-                "duration": "3 months",
-                "rating": 4.7,
-                "university": "Top University"
-            }
-        ]
-        return mock_courses[:max_results]
+        return _coursera_course_templates(skill)[:max_results]
     except Exception as e:
         print(f"Error scraping Coursera courses: {e}")
         return []
 
+class CourseProvider(ABC):
+    """Interface for course sources queried on top of the static catalog."""
+
+    name = "base"
+    # Minimum seconds between two calls to this provider
+    min_interval = 0.0
+
+    @abstractmethod
+    def fetch(self, skill: str, max_results: int = 3) -> List[Dict]:
+        """Return course dictionaries (title, platform, url, price, duration, rating)"""
+
+class UdemyCourseProvider(CourseProvider):
+    name = "udemy"
+    min_interval = 0.1
+
+    def fetch(self, skill, max_results=3):
+        return scrape_udemy_courses(skill, max_results)
+
+class CourseraCourseProvider(CourseProvider):
+    name = "coursera"
+    min_interval = 0.1
+
+    def fetch(self, skill, max_results=3):
+        return scrape_coursera_courses(skill, max_results)
+
+class FixtureCourseProvider(CourseProvider):
+    """
+    Offline stand-in for tests and air-gapped runs.
+    Serves courses from a JSON file ({skill: [course, ...]}) when given,
+    otherwise the Udemy/Coursera templates, without any delay.
+    """
+
+    name = "fixture"
+
+    def __init__(self, path: str = None):
+        self.courses = {}
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                self.courses = {skill_id(k): v for k, v in json.load(f).items()}
+
+    def fetch(self, skill, max_results=3):
+        if self.courses:
+            return list(self.courses.get(skill_id(skill), []))[:max_results]
+        return (_udemy_course_templates(skill) + _coursera_course_templates(skill))[:max_results]
+
+COURSE_PROVIDER_TYPES = {
+    UdemyCourseProvider.name: UdemyCourseProvider,
+    CourseraCourseProvider.name: CourseraCourseProvider,
+    FixtureCourseProvider.name: FixtureCourseProvider,
+}
+
+# Providers must answer within this many seconds; late results are cached for next time
+COURSE_PROVIDER_DEADLINE = float(os.getenv("COURSE_PROVIDER_DEADLINE", 2.0))
+COURSE_PROVIDER_CACHE_TTL = int(os.getenv("COURSE_PROVIDER_CACHE_TTL", 86400))
+COURSE_PROVIDER_CACHE_DIR = Path(os.getenv(
+    "COURSE_PROVIDER_CACHE_DIR", Path(__file__).resolve().parents[1] / "data" / "cache" / "courses"
+))
+
+def _providers_from_env() -> List[CourseProvider]:
+    names = [n.strip() for n in os.getenv("COURSE_PROVIDERS", "udemy,coursera").split(",") if n.strip()]
+    return [COURSE_PROVIDER_TYPES[n]() for n in names if n in COURSE_PROVIDER_TYPES]
+
+_providers = _providers_from_env()
+_provider_cache = DiskCache(COURSE_PROVIDER_CACHE_DIR, ttl=COURSE_PROVIDER_CACHE_TTL)
+_provider_limiter = HostRateLimiter(0.0)
+_course_cache = TTLCache(maxsize=2048, ttl=COURSE_CACHE_TTL)
+_course_pool = ThreadPoolExecutor(max_workers=COURSE_FETCH_WORKERS, thread_name_prefix="courses")
+
+def _reset_course_pool():
+    # The parent's pool threads don't exist in a forked worker
+    global _course_pool
+    _course_pool = ThreadPoolExecutor(max_workers=COURSE_FETCH_WORKERS, thread_name_prefix="courses")
+
+register_after_fork("course_pool", _reset_course_pool)
+
+def set_course_providers(providers: List[CourseProvider]):
+    """Swap the active course providers (e.g. fixtures in tests)."""
+    global _providers
+    _providers = list(providers)
+    _course_cache.clear()
+
+def get_course_providers() -> List[CourseProvider]:
+    return list(_providers)
+
+def _fetch_from_provider(provider: CourseProvider, key: str, skill: str) -> List[Dict]:
+    """One provider call through the persistent (provider, skill) cache and its rate limit."""
+    cache_key = [provider.name, key]
+    cached = _provider_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    _provider_limiter.wait(provider.name, provider.min_interval)
+    courses = provider.fetch(skill)
+    # Empty answers are usually failures; ask again next time
+    if courses:
+        _provider_cache.set(cache_key, courses)
+    return courses
+
+def _course_key(skill: str) -> str:
+    """Cache key: the catalog skill a name resolves to, else the normalized name."""
+    key = skill_id(skill)
+    return COURSE_CATALOG.resolve(key) or key
+
+def _copy_courses(courses: Dict) -> Dict:
+    # Cached lists are shared; hand out fresh ones
+    return {"free": list(courses.get("free", [])), "paid": list(courses.get("paid", []))}
+
+def get_enhanced_courses_for_skills(skills: List[str]) -> Dict[str, Dict]:
+    """
+    Enhanced course recommendations for several skills at once.
+    Cached skills are served from memory; every provider call for the
+    rest runs concurrently under COURSE_PROVIDER_DEADLINE. Providers that
+    miss the deadline are left out (and the result is not memoized).
+    """
+    built = {}
+    pending = {}
+    for skill in skills:
+        key = _course_key(skill)
+        cached = _course_cache.get(key)
+        if cached is not None:
+            built[key] = cached
+        elif key not in pending:
+            pending[key] = skill
+
+    providers = list(_providers)
+    futures = {
+        key: [_course_pool.submit(_fetch_from_provider, provider, key, skill) for provider in providers]
+        for key, skill in pending.items()
+    }
+    all_futures = [f for fs in futures.values() for f in fs]
+    if all_futures:
+        wait(all_futures, timeout=COURSE_PROVIDER_DEADLINE)
+
+    for key, skill in pending.items():
+        # Get base recommendations
+        base_courses = get_course_recommendations(skill)
+        scraped = []
+        complete = True
+        for provider, future in zip(providers, futures[key]):
+            if not future.done():
+                complete = False
+                continue
+            try:
+                scraped.extend(future.result())
+            except Exception as e:
+                print(f"Course provider {provider.name} failed for {skill}: {e}")
+        
+        # Combine with existing paid courses
+        courses = {
+            "free": base_courses.get("free", []),
+            "paid": base_courses.get("paid", []) + scraped
+        }
+        built[key] = courses
+        if complete:
+            _course_cache.set(key, courses)
+
+    return {skill: _copy_courses(built[_course_key(skill)]) for skill in skills}
+
 def get_enhanced_course_recommendations(skill: str) -> Dict:
     """
     Get enhanced course recommendations including scraped data.
     """
-    # Get base recommendations
-    base_courses = get_course_recommendations(skill)
+    return get_enhanced_courses_for_skills([skill])[skill]
+
+# Skill dependency mapping
+SKILL_DEPENDENCIES = {
+    "Machine Learning": ["Python", "Statistics", "Linear Algebra"],
+    "Deep Learning": ["Machine Learning", "Python", "TensorFlow"],
+    "Data Science": ["Python", "SQL", "Statistics"],
+    "Web Development": ["HTML", "CSS", "JavaScript"],
+    "React": ["JavaScript", "HTML", "CSS"],
+    "Django": ["Python", "SQL", "HTML"],
+    "Flask": ["Python", "SQL"],
+    "AWS": ["Linux", "Networking"],
+    "Docker": ["Linux", "Command Line"],
+    "Kubernetes": ["Docker", "Linux"],
+    "DevOps": ["Linux", "Git", "Docker"],
+    "Data Analysis": ["Python", "SQL", "Excel"],
+    "UI Design": ["Figma", "Adobe XD"],
+    "UX Design": ["User Research", "Figma"],
+    "Mobile Development": ["JavaScript", "React Native"],
+    "Blockchain": ["JavaScript", "Solidity"],
+    "Cybersecurity": ["Linux", "Networking", "Python"]
+}
+_DEPENDENCIES_BY_KEY = {skill_id(k): v for k, v in SKILL_DEPENDENCIES.items()}
+
+def order_learning_path(missing_skills: List[str], have_skills: List[str] = None) -> List[str]:
+    """
+    Order missing skills so that dependencies come first (Kahn's algorithm).
+    Skills become learnable in layers, each layer in input order. Skills
+    blocked by a dependency the user neither has nor is missing (or by a
+    cycle) are appended at the end in input order.
+    """
+    have = {skill_id(s) for s in (have_skills or [])}
+    skills = list(dict.fromkeys(missing_skills))
+    position = {skill_id(s): i for i, s in reversed(list(enumerate(skills)))}
     
-    # Add scraped courses
-    udemy_courses = scrape_udemy_courses(skill)
-    coursera_courses = scrape_coursera_courses(skill)
+    indegree = [0] * len(skills)
+    dependents = defaultdict(list)
+    for i, skill in enumerate(skills):
+        for dep in _DEPENDENCIES_BY_KEY.get(skill_id(skill), []):
+            dep_key = skill_id(dep)
+            if dep_key in have:
+                continue
+            if dep_key in position and position[dep_key] != i:
+                dependents[position[dep_key]].append(i)
+                indegree[i] += 1
+            else:
+                # Unmet dependency outside the path: never satisfied
+                indegree[i] = float("inf")
     
-    # Combine with existing paid courses
-    enhanced_paid = base_courses.get("paid", []) + udemy_courses + coursera_courses
+    order = []
+    layer = [i for i in range(len(skills)) if indegree[i] == 0]
+    while layer:
+        order.extend(layer)
+        next_layer = []
+        for i in layer:
+            for j in dependents[i]:
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    next_layer.append(j)
+        layer = sorted(next_layer)
     
-    return {
-        "free": base_courses.get("free", []),
-        "paid": enhanced_paid
-    }
+    if len(order) < len(skills):
+        placed = set(order)
+        order.extend(i for i in range(len(skills)) if i not in placed)
+    return [skills[i] for i in order]
 
 def create_learning_path(missing_skills: List[str], have_skills: List[str] = None) -> List[Dict]:
     """
     Create a personalized learning path by ordering missing skills.
     """
-    # Skill dependency mapping
-    skill_dependencies = {
-        "Machine Learning": ["Python", "Statistics", "Linear Algebra"],
-        "Deep Learning": ["Machine Learning", "Python", "TensorFlow"],
-        "Data Science": ["Python", "SQL", "Statistics"],
-        "Web Development": ["HTML", "CSS", "JavaScript"],
-        "React": ["JavaScript", "HTML", "CSS"],
-        "Django": ["Python", "SQL", "HTML"],
-        "Flask": ["Python", "SQL"],
-        "AWS": ["Linux", "Networking"],
-        "Docker": ["Linux", "Command Line"],
-        "Kubernetes": ["Docker", "Linux"],
-        "DevOps": ["Linux", "Git", "Docker"],
-        "Data Analysis": ["Python", "SQL", "Excel"],
-        "UI Design": ["Figma", "Adobe XD"],
-        "UX Design": ["User Research", "Figma"],
-        "Mobile Development": ["JavaScript", "React Native"],
-        "Blockchain": ["JavaScript", "Solidity"],
-        "Cybersecurity": ["Linux", "Networking", "Python"]
-    }
-    
-    # Create learning order based on dependencies
-    learning_path = []
-    remaining_skills = missing_skills.copy()
-    have_set = set((have_skills or []))
-    
-    while remaining_skills:
-        # Find skills that can be learned (dependencies are met)
-        learnable = []
-        for skill in remaining_skills:
-            dependencies = skill_dependencies.get(skill, [])
-            if all(dep in have_set for dep in dependencies):
-                learnable.append(skill)
-        
-        if not learnable:
-            # If no skills are learnable, add remaining skills
-            learnable = remaining_skills
-        
-        # Add learnable skills to path
-        for skill in learnable:
-            courses = get_enhanced_course_recommendations(skill)
-            learning_path.append({
-                "skill": skill,
-                "courses": courses,
-                "dependencies": skill_dependencies.get(skill, [])
-            })
-            have_set.add(skill)
-            remaining_skills.remove(skill)
+    ordered = order_learning_path(missing_skills, have_skills)
+    courses = get_enhanced_courses_for_skills(ordered)
     
-    return learning_path
+    return [
+        {
+            "skill": skill,
+            "courses": courses[skill],
+            "dependencies": _DEPENDENCIES_BY_KEY.get(skill_id(skill), [])
+        }
+        for skill in ordered
+    ]
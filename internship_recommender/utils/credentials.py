@@ -0,0 +1,122 @@
+"""
+Password hashing service.
+PBKDF2 runs on a bounded process pool so a burst of logins doesn't tie up
+the threads serving pages; admission control rejects work beyond
+PASSWORD_HASH_MAX_PENDING instead of queueing it without limit.
+
+Hashes are stored as ``pbkdf2_sha256$<iterations>$<salt>$<hex digest>`` so
+the cost can be raised later; older hashes are upgraded on the next login.
+Rows written before this format (bare hex digest + separate salt column)
+are still accepted.
+"""
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .services import register_after_fork
+
+ALGORITHM = "pbkdf2_sha256"
+LEGACY_ITERATIONS = 100000
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", LEGACY_ITERATIONS))
+# 0 hashes in the calling thread (no process pool)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", max(PASSWORD_HASH_WORKERS, 1) * 4))
+# Seconds a request waits for a hashing slot before giving up
+PASSWORD_HASH_ADMIT_TIMEOUT = float(os.getenv("PASSWORD_HASH_ADMIT_TIMEOUT", 2.0))
+
+
+class CredentialServiceBusy(Exception):
+    """Raised when too many password hashes are already in flight."""
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    # Module-level so the process pool can pickle it
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations).hex()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Never fork the (multithreaded) server itself: a lock held by another
+            # thread at fork time stays locked forever in the child
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                        mp_context=multiprocessing.get_context(method))
+        return _pool
+
+
+def reset_pool():
+    """Drop the process pool (e.g. in a freshly forked worker); it is recreated on demand."""
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+register_after_fork("credentials", reset_pool)
+
+
+def _derive(password: str, salt: str, iterations: int) -> str:
+    if not _slots.acquire(timeout=PASSWORD_HASH_ADMIT_TIMEOUT):
+        raise CredentialServiceBusy("Password hashing is saturated; try again shortly")
+    try:
+        pool = _get_pool()
+        if pool is None:
+            return _pbkdf2(password, salt, iterations)
+        return pool.submit(_pbkdf2, password, salt, iterations).result()
+    finally:
+        _slots.release()
+
+
+def encode(iterations: int, salt: str, digest: str) -> str:
+    return f"{ALGORITHM}${iterations}${salt}${digest}"
+
+
+def decode(stored_hash: str, legacy_salt: str = None):
+    """(algorithm, iterations, salt, digest) of a stored hash, legacy rows included."""
+    if "$" not in stored_hash:
+        return ALGORITHM, LEGACY_ITERATIONS, legacy_salt or "", stored_hash
+    algorithm, iterations, salt, digest = stored_hash.split("$", 3)
+    return algorithm, int(iterations), salt, digest
+
+
+def hash_password(password: str, salt: str = None, iterations: int = None) -> str:
+    """Encoded hash of a new password at the current cost."""
+    salt = salt or secrets.token_hex(16)
+    iterations = iterations or PASSWORD_HASH_ITERATIONS
+    return encode(iterations, salt, _derive(password, salt, iterations))
+
+
+def verify_password(password: str, stored_hash: str, legacy_salt: str = None) -> bool:
+    """Constant-time check of a password against a stored hash."""
+    if not stored_hash:
+        return False
+    algorithm, iterations, salt, digest = decode(stored_hash, legacy_salt)
+    if algorithm != ALGORITHM:
+        return False
+    return hmac.compare_digest(_derive(password, salt, iterations), digest)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """True when a hash predates the encoded format or uses a different cost."""
+    if not stored_hash or "$" not in stored_hash:
+        return True
+    algorithm, iterations, _, _ = decode(stored_hash)
+    return algorithm != ALGORITHM or iterations != PASSWORD_HASH_ITERATIONS
+
+
+def salt_of(stored_hash: str) -> str:
+    """Salt embedded in an encoded hash (kept in the legacy salt column too)."""
+    return decode(stored_hash)[2]
@@ -1,18 +1,285 @@
 import mysql.connector 
 from mysql.connector import Error 
-import hashlib
+import atexit
+import base64
 import secrets
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 import os
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+
+from . import credentials
+from .cache import TTLCache
+from .credentials import CredentialServiceBusy
+from .metrics import DB_QUERY_DURATION
+from .migrations import run_migrations
+from .services import LazyService, register_after_fork, reset_service
+from .sql_dialect import DictRowFactory, detect as detect_dialect
+from .write_behind import WriteBehindQueue
+
+# Seconds a session lookup is served from memory; bounds staleness across worker processes
+SESSION_CACHE_TTL = int(os.getenv('SESSION_CACHE_TTL', 30))
+SESSION_CACHE_SIZE = int(os.getenv('SESSION_CACHE_SIZE', 10000))
+# Seconds between expired-session sweeps (0 disables the sweeper)
+SESSION_SWEEP_INTERVAL = int(os.getenv('SESSION_SWEEP_INTERVAL', 3600))
+
+# "sqlite" skips MySQL and uses the SQLite database directly
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').lower()
+
+# SQLite fallback tuning
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'internship_recommender.db')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+# Recommendation history is written behind the request (0 writes it inline)
+DB_WRITE_BEHIND = os.getenv('DB_WRITE_BEHIND', '1') not in ('0', 'false', 'False')
+WRITE_BEHIND_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL', 0.5))
+WRITE_BEHIND_BATCH = int(os.getenv('WRITE_BEHIND_BATCH', 500))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', 10000))
+
+def tune_sqlite(connection):
+    """WAL so readers don't block on writers, with a larger page cache and mmap"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Durable at checkpoints; a crash can lose only the last few commits
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+# Named statements rendered once per dialect: {p} is the parameter placeholder, {now} the current time
+STATEMENTS = {
+    'user_exists': "SELECT id FROM users WHERE username = {p} OR email = {p}",
+    'insert_user': """
+        INSERT INTO users (username, email, password_hash, salt, full_name, user_role)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+    """,
+    'user_credentials': """
+        SELECT id, username, email, password_hash, salt, full_name, user_role, is_active
+        FROM users WHERE username = {p} OR email = {p}
+    """,
+    'update_password_hash': "UPDATE users SET password_hash = {p}, salt = {p} WHERE id = {p}",
+    'user_by_username': """
+        SELECT id, username, email, full_name, user_role, is_active
+        FROM users 
+        WHERE username = {p} OR email = {p}
+    """,
+    'update_user_role': "UPDATE users SET user_role = {p} WHERE id = {p}",
+    'insert_session': """
+        INSERT INTO user_sessions (user_id, session_token, expires_at)
+        VALUES ({p}, {p}, {p})
+    """,
+    'user_by_session': """
+        SELECT u.id, u.username, u.email, u.full_name, u.user_role, u.is_active, s.expires_at
+        FROM users u
+        JOIN user_sessions s ON u.id = s.user_id
+        WHERE s.session_token = {p} AND s.expires_at > {now} AND u.is_active = 1
+    """,
+    'delete_session': "DELETE FROM user_sessions WHERE session_token = {p}",
+    'purge_sessions': {
+        # SQLite has no DELETE ... LIMIT by default
+        'sqlite': """
+            DELETE FROM user_sessions WHERE id IN (
+                SELECT id FROM user_sessions WHERE expires_at < {p} LIMIT {p}
+            )
+        """,
+        'mysql': "DELETE FROM user_sessions WHERE expires_at < {p} LIMIT {p}",
+    },
+    'profile_exists': "SELECT id FROM user_profiles WHERE user_id = {p}",
+    'update_profile': """
+        UPDATE user_profiles 
+        SET degree = {p}, study_year = {p}, sector = {p}, stream = {p}, 
+            skills = {p}, resume_path = {p}, updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = {p}
+    """,
+    'insert_profile': """
+        INSERT INTO user_profiles (user_id, degree, study_year, sector, stream, skills, resume_path)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+    """,
+    'user_profile': "SELECT * FROM user_profiles WHERE user_id = {p}",
+    'insert_history': """
+        INSERT INTO recommendation_history 
+        (user_id, role, location, skills_used, missing_skills, salary_range_low, salary_range_high)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+    """,
+    'recommendation_history': """
+        SELECT * FROM recommendation_history 
+        WHERE user_id = {p} 
+        ORDER BY created_at DESC 
+        LIMIT {p}
+    """,
+    'all_candidates': """
+        SELECT u.id, u.username, u.email, u.full_name, u.created_at,
+               p.degree, p.study_year, p.sector, p.stream, p.skills, p.resume_path
+        FROM users u
+        LEFT JOIN user_profiles p ON u.id = p.user_id
+        WHERE u.user_role = 'student' AND u.is_active = 1
+        ORDER BY u.created_at DESC, u.id DESC
+        LIMIT {p}
+    """,
+    'all_candidates_after': """
+        SELECT u.id, u.username, u.email, u.full_name, u.created_at,
+               p.degree, p.study_year, p.sector, p.stream, p.skills, p.resume_path
+        FROM users u
+        LEFT JOIN user_profiles p ON u.id = p.user_id
+        WHERE u.user_role = 'student' AND u.is_active = 1
+          AND u.created_at <= {p} AND (u.created_at < {p} OR u.id < {p})
+        ORDER BY u.created_at DESC, u.id DESC
+        LIMIT {p}
+    """,
+    'count_candidates': "SELECT COUNT(*) FROM users WHERE user_role = 'student' AND is_active = 1",
+    'candidate_by_id': """
+        SELECT u.id, u.username, u.email, u.full_name, u.created_at,
+               p.degree, p.study_year, p.sector, p.stream, p.skills, p.resume_path
+        FROM users u
+        LEFT JOIN user_profiles p ON u.id = p.user_id
+        WHERE u.id = {p} AND u.user_role = 'student' AND u.is_active = 1
+    """,
+    'insert_job_posting': """
+        INSERT INTO job_postings (hr_user_id, title, description, required_skills, location, salary_range_low, salary_range_high)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+    """,
+    'job_postings_by_hr': """
+        SELECT * FROM job_postings 
+        WHERE hr_user_id = {p} AND is_active = 1
+        ORDER BY created_at DESC
+    """,
+    'job_postings': """
+        SELECT * FROM job_postings 
+        WHERE is_active = 1
+        ORDER BY created_at DESC
+    """,
+    'job_posting_by_id': "SELECT * FROM job_postings WHERE id = {p} AND is_active = 1",
+    'insert_resume_modification': """
+        INSERT INTO resume_modifications 
+        (user_id, original_resume_path, modified_resume_path, modifications_json, 
+         ats_score_before, ats_score_after, job_description)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+    """,
+    'modification_history': """
+        SELECT * FROM resume_modifications 
+        WHERE user_id = {p} 
+        ORDER BY created_at DESC 
+        LIMIT {p}
+    """,
+    'delete_user_profile': "DELETE FROM user_profiles WHERE user_id = {p}",
+    'delete_user_history': "DELETE FROM recommendation_history WHERE user_id = {p}",
+    'delete_user_modifications': "DELETE FROM resume_modifications WHERE user_id = {p}",
+}
+
+class SessionCache:
+    """Session token -> user row, invalidated per token or per user."""
+    
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE, ttl: int = SESSION_CACHE_TTL):
+        # Evicted and expired tokens leave the per-user index too, so it stays
+        # bounded by the cache size
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=self._forget)
+        self._tokens_by_user = defaultdict(set)
+        self._lock = threading.Lock()
+    
+    def _forget(self, token: str, entry):
+        user_id = entry[0]['id']
+        with self._lock:
+            tokens = self._tokens_by_user.get(user_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[user_id]
+    
+    def get(self, token: str) -> Optional[Dict]:
+        entry = self._cache.get(token)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at is not None and expires_at <= datetime.now():
+            self.invalidate_token(token)
+            return None
+        # Callers may modify the row
+        return dict(user)
+    
+    def set(self, token: str, user: Dict, expires_at: Optional[datetime]):
+        with self._lock:
+            self._tokens_by_user[user['id']].add(token)
+        self._cache.set(token, (dict(user), expires_at))
+    
+    def invalidate_token(self, token: str):
+        entry = self._cache.pop(token)
+        if entry:
+            self._forget(token, entry)
+    
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            tokens = self._tokens_by_user.pop(user_id, set())
+        for token in tokens:
+            self._cache.pop(token)
+    
+    def clear(self):
+        with self._lock:
+            self._tokens_by_user.clear()
+        self._cache.clear()
+
+def encode_page_cursor(row: Dict) -> str:
+    """Opaque keyset cursor for the row a page ended on: its (created_at, id)."""
+    created_at = row['created_at']
+    if isinstance(created_at, datetime):
+        created_at = created_at.strftime('%Y-%m-%d %H:%M:%S')
+    raw = f"{created_at}|{row['id']}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_page_cursor(cursor: str) -> Tuple[str, int]:
+    """(created_at, id) from a page cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, row_id = raw.rsplit('|', 1)
+        return created_at, int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+
+def _as_datetime(value) -> Optional[datetime]:
+    """expires_at as stored: a datetime (MySQL) or an ISO string (SQLite)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
 
 class DatabaseManager:
     def __init__(self):
         self.connection = None
+        self.dialect = None
+        # Idle prepared MySQL cursors of the current connection, keyed by
+        # (statement, dictionary); a cursor is checked out while in use
+        self._prepared = defaultdict(list)
+        self._prepared_connection = None
+        self._checked_out = {}
+        self._prepared_lock = threading.Lock()
+        # Statement name -> column names, for building dict rows on SQLite
+        self._column_names = {}
+        self.session_cache = SessionCache()
+        self._sweeper = None
+        self._sweeper_stop = threading.Event()
+        self._mysql_config = None
+        self.history_writes = None
+        if DB_WRITE_BEHIND:
+            self.history_writes = WriteBehindQueue(self._open_connection, WRITE_BEHIND_INTERVAL,
+                                                   WRITE_BEHIND_BATCH, WRITE_BEHIND_MAX_PENDING,
+                                                   name="history-writer")
+            atexit.register(self.history_writes.close)
         self.connect()
     
     def connect(self):
         """Connect to MySQL database"""
+        if DB_BACKEND == 'sqlite':
+            self.setup_sqlite_fallback()
+            return
         try:
             # Database configuration - update these with your MySQL credentials
             config = {
@@ -26,6 +293,8 @@ class DatabaseManager:
             }
             
             self.connection = mysql.connector.connect(**config)
+            self._mysql_config = config
+            self.dialect = detect_dialect(self.connection)
             if self.connection.is_connected():
                 print("Connected to MySQL database")
                 self.create_tables()
@@ -40,20 +309,31 @@ class DatabaseManager:
         try:
             import sqlite3
             # Use check_same_thread=False to allow cross-thread usage
-            self.connection = sqlite3.connect('internship_recommender.db', check_same_thread=False)
+            self.connection = sqlite3.connect(SQLITE_PATH, check_same_thread=False,
+                                              cached_statements=len(STATEMENTS) + 64)
+            tune_sqlite(self.connection)
+            self.dialect = detect_dialect(self.connection)
             print("Using SQLite fallback database")
             self.create_tables()
             self._ensure_migrations()
         except Exception as e:
             print(f"Error setting up SQLite fallback: {e}")
     
+    def _open_connection(self):
+        """A new connection to the active backend, for background writers"""
+        if self._mysql_config is not None:
+            return mysql.connector.connect(**self._mysql_config)
+        import sqlite3
+        connection = sqlite3.connect(SQLITE_PATH, check_same_thread=False)
+        tune_sqlite(connection)
+        return connection
+    
     def _ensure_migrations(self):
         """Ensure migrations are run even if tables already exist"""
         cursor = None
         try:
             cursor = self.connection.cursor()
-            is_sqlite = 'sqlite' in str(type(self.connection)).lower()
-            self._run_migrations(cursor, is_sqlite)
+            self._run_migrations(cursor, self.dialect.is_sqlite)
             self.connection.commit()
         except Exception as e:
             print(f"Error ensuring migrations: {e}")
@@ -68,7 +348,7 @@ class DatabaseManager:
             cursor = self.connection.cursor()
             
             # Check if we're using SQLite or MySQL
-            is_sqlite = 'sqlite' in str(type(self.connection)).lower()
+            is_sqlite = self.dialect.is_sqlite
             
             if is_sqlite:
                 # SQLite syntax
@@ -192,11 +472,10 @@ class DatabaseManager:
             cursor.execute(create_profiles_table)
             cursor.execute(create_sessions_table)
             cursor.execute(create_recommendations_table)
-            
-            # Run migrations for existing databases
-            self._run_migrations(cursor, is_sqlite)
+            cursor.execute(self._job_postings_table_sql(is_sqlite))
             
             self.connection.commit()
+            self.create_resume_modifications_table()
             print("Database tables created successfully")
             
         except Exception as e:
@@ -205,162 +484,262 @@ class DatabaseManager:
             if cursor:
                 cursor.close()
     
+    def _job_postings_table_sql(self, is_sqlite):
+        """CREATE TABLE statement for job_postings"""
+        if is_sqlite:
+            return """
+            CREATE TABLE IF NOT EXISTS job_postings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hr_user_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                required_skills TEXT,
+                location TEXT,
+                salary_range_low INTEGER,
+                salary_range_high INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_active BOOLEAN DEFAULT 1,
+                FOREIGN KEY (hr_user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            """
+        return """
+            CREATE TABLE IF NOT EXISTS job_postings (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                hr_user_id INT NOT NULL,
+                title VARCHAR(200) NOT NULL,
+                description TEXT,
+                required_skills TEXT,
+                location VARCHAR(100),
+                salary_range_low INT,
+                salary_range_high INT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                is_active BOOLEAN DEFAULT TRUE,
+                FOREIGN KEY (hr_user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            """
+    
     def _run_migrations(self, cursor, is_sqlite):
         """Run database migrations for existing databases"""
         try:
-            # Check if users table exists first
-            if is_sqlite:
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-                if not cursor.fetchone():
-                    return  # Table doesn't exist yet, will be created with new schema
-                
-                # Check if user_role column exists in users table
-                cursor.execute("PRAGMA table_info(users)")
-                columns = [column[1] for column in cursor.fetchall()]
-                
-                if 'user_role' not in columns:
-                    print("Migrating: Adding user_role column to users table...")
-                    cursor.execute("ALTER TABLE users ADD COLUMN user_role TEXT DEFAULT 'student'")
-                    # Update existing rows to have 'student' as default
-                    cursor.execute("UPDATE users SET user_role = 'student' WHERE user_role IS NULL")
-                    print("Migration completed: user_role column added")
-            else:
-                # For MySQL, check if table exists
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_SCHEMA = DATABASE() 
-                    AND TABLE_NAME = 'users'
-                """)
-                if cursor.fetchone()[0] == 0:
-                    return  # Table doesn't exist yet
-                
-                # Check if column exists
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM INFORMATION_SCHEMA.COLUMNS 
-                    WHERE TABLE_SCHEMA = DATABASE() 
-                    AND TABLE_NAME = 'users' 
-                    AND COLUMN_NAME = 'user_role'
-                """)
-                if cursor.fetchone()[0] == 0:
-                    print("Migrating: Adding user_role column to users table...")
-                    cursor.execute("ALTER TABLE users ADD COLUMN user_role VARCHAR(20) DEFAULT 'student'")
-                    # Update existing rows to have 'student' as default
-                    cursor.execute("UPDATE users SET user_role = 'student' WHERE user_role IS NULL")
-                    print("Migration completed: user_role column added")
+            run_migrations(cursor, is_sqlite)
         except Exception as e:
             print(f"Error running migrations: {e}")
     
     def _get_placeholder(self):
         """Get the correct placeholder for the current database"""
-        is_sqlite = 'sqlite' in str(type(self.connection)).lower()
-        return '?' if is_sqlite else '%s'
+        return self.dialect.placeholder
     
     def _get_cursor(self, dictionary=False):
         """Get cursor with appropriate settings for current database"""
-        is_sqlite = 'sqlite' in str(type(self.connection)).lower()
-        if is_sqlite:
+        if self.dialect.is_sqlite:
+            cursor = self.connection.cursor()
             if dictionary:
                 # For SQLite, use row_factory to get dictionary-like results
-                cursor = self.connection.cursor()
-                cursor.row_factory = lambda cursor, row: dict(zip([col[0] for col in cursor.description], row))
-                return cursor
-            else:
-                return self.connection.cursor()
+                cursor.row_factory = DictRowFactory()
+            return cursor
         else:
             # MySQL supports dictionary parameter
             return self.connection.cursor(dictionary=dictionary)
     
+    def _sql(self, name: str) -> str:
+        """Rendered SQL of a named statement for the current database"""
+        return self.dialect.sql(name, STATEMENTS)
+    
+    def _prepared_cursor(self, sql: str, dictionary: bool):
+        """Check out a prepared cursor for a statement on the current connection"""
+        key = (sql, dictionary)
+        with self._prepared_lock:
+            if self._prepared_connection is not self.connection:
+                # Connection replaced: its statements can't be reused
+                self._close_prepared()
+                self._prepared_connection = self.connection
+            idle = self._prepared[key]
+            cursor = idle.pop() if idle else None
+        if cursor is None:
+            cursor = self.connection.cursor(prepared=True, dictionary=dictionary)
+        with self._prepared_lock:
+            self._checked_out[id(cursor)] = (key, cursor)
+        return cursor
+    
+    def _close_prepared(self):
+        """Close every idle prepared cursor (caller holds _prepared_lock)"""
+        for cursors in self._prepared.values():
+            for cursor in cursors:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+        self._prepared.clear()
+        # Cursors still in use are closed when they come back
+        self._checked_out.clear()
+    
+    def _execute(self, name: str, params=(), dictionary=False):
+        """
+        Execute a named statement and return its cursor; pass it to _finish().
+        With DB_PREPARED_STATEMENTS on MySQL, each statement is prepared once
+        per connection and its cursors are reused; on SQLite sqlite3's
+        statement cache already avoids re-parsing.
+        """
+        sql = self._sql(name)
+        if self.dialect.is_sqlite:
+            return self.connection.execute(sql, params)
+        if not self.dialect.prepared:
+            # MySQLConnection has no execute(); use a plain (dictionary) cursor
+            cursor = self.connection.cursor(dictionary=dictionary)
+            try:
+                cursor.execute(sql, params)
+            except Exception:
+                cursor.close()
+                raise
+            return cursor
+        cursor = self._prepared_cursor(sql, dictionary)
+        try:
+            cursor.execute(sql, params)
+        except Exception:
+            self._discard(cursor)
+            raise
+        return cursor
+    
+    def _finish(self, cursor):
+        if self.dialect.is_sqlite:
+            cursor.close()
+            return
+        if cursor.with_rows:
+            # Leave no unread rows on the connection
+            cursor.fetchall()
+        if not self.dialect.prepared:
+            cursor.close()
+            return
+        with self._prepared_lock:
+            entry = self._checked_out.pop(id(cursor), None)
+            if entry is not None:
+                self._prepared[entry[0]].append(cursor)
+                return
+        # Its connection was replaced while it was in use
+        self._discard(cursor)
+    
+    def _discard(self, cursor):
+        """Close a prepared cursor that failed or outlived its connection; it is re-prepared on next use"""
+        with self._prepared_lock:
+            self._checked_out.pop(id(cursor), None)
+        try:
+            cursor.close()
+        except Exception:
+            pass
+    
+    def _columns(self, name: str, cursor) -> tuple:
+        """Column names of a named statement, taken from its first execution"""
+        columns = self._column_names.get(name)
+        if columns is None:
+            columns = self._column_names[name] = tuple(col[0] for col in cursor.description)
+        return columns
+    
+    def _fetchone(self, name: str, params=(), dictionary=False):
+        started = time.perf_counter()
+        cursor = self._execute(name, params, dictionary)
+        try:
+            row = cursor.fetchone()
+        finally:
+            self._finish(cursor)
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, name)
+        if row is None or not dictionary or not self.dialect.is_sqlite:
+            # MySQL dictionary cursors already return dicts
+            return row
+        return dict(zip(self._columns(name, cursor), row))
+    
+    def _fetchall(self, name: str, params=(), dictionary=False) -> List:
+        started = time.perf_counter()
+        cursor = self._execute(name, params, dictionary)
+        try:
+            rows = cursor.fetchall()
+        finally:
+            self._finish(cursor)
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, name)
+        if not rows or not dictionary or not self.dialect.is_sqlite:
+            return rows
+        columns = self._columns(name, cursor)
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def _run(self, name: str, params=()) -> tuple:
+        """Execute a write; returns (rowcount, lastrowid). The caller commits."""
+        started = time.perf_counter()
+        cursor = self._execute(name, params)
+        try:
+            return cursor.rowcount, cursor.lastrowid
+        finally:
+            self._finish(cursor)
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, name)
+    
     def hash_password(self, password: str, salt: str = None) -> tuple:
-        """Hash password with salt"""
-        if salt is None:
-            salt = secrets.token_hex(16)
-        
-        password_hash = hashlib.pbkdf2_hmac('sha256', 
-                                          password.encode('utf-8'), 
-                                          salt.encode('utf-8'), 
-                                          100000)
-        return password_hash.hex(), salt
+        """Hash password with salt; returns (encoded hash, salt)"""
+        password_hash = credentials.hash_password(password, salt)
+        return password_hash, credentials.salt_of(password_hash)
     
     def verify_password(self, password: str, stored_hash: str, salt: str) -> bool:
-        """Verify password against stored hash"""
-        password_hash, _ = self.hash_password(password, salt)
-        return password_hash == stored_hash
+        """Verify password against stored hash (constant-time)"""
+        return credentials.verify_password(password, stored_hash, salt)
     
     def create_user(self, username: str, email: str, password: str, full_name: str = None, user_role: str = 'student') -> bool:
         """Create a new user"""
-        cursor = None
         try:
-            cursor = self._get_cursor()
-            
-            # Get correct placeholder for current database
-            placeholder = self._get_placeholder()
-            
             # Check if user already exists
-            cursor.execute(f"SELECT id FROM users WHERE username = {placeholder} OR email = {placeholder}", (username, email))
-            if cursor.fetchone():
+            if self._fetchone('user_exists', (username, email)):
                 return False
             
             # Hash password
             password_hash, salt = self.hash_password(password)
             
             # Insert user
-            cursor.execute(f"""
-                INSERT INTO users (username, email, password_hash, salt, full_name, user_role)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            """, (username, email, password_hash, salt, full_name, user_role))
+            self._run('insert_user', (username, email, password_hash, salt, full_name, user_role))
             
             self.connection.commit()
             return True
             
+        except CredentialServiceBusy:
+            raise
         except Exception as e:
             print(f"Error creating user: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
     
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
         """Authenticate user and return user data"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                SELECT id, username, email, password_hash, salt, full_name, user_role, is_active
-                FROM users WHERE username = {placeholder} OR email = {placeholder}
-            """, (username, username))
-            
-            user = cursor.fetchone()
+            user = self._fetchone('user_credentials', (username, username), dictionary=True)
             if user and self.verify_password(password, user['password_hash'], user['salt']):
+                if credentials.needs_rehash(user['password_hash']):
+                    self._rehash_password(user['id'], password)
                 return user
             return None
             
         except Error as e:
             print(f"Error authenticating user: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
+        except ValueError as e:
+            # Malformed stored hash: a failed login, not a server error
+            print(f"Error authenticating user: unreadable password hash ({e})")
+            return None
+    
+    def _rehash_password(self, user_id: int, password: str):
+        """Re-store a password with the current hash parameters after a successful login"""
+        try:
+            password_hash, salt = self.hash_password(password)
+            self._run('update_password_hash', (password_hash, salt, user_id))
+            self.connection.commit()
+        except Exception as e:
+            # The old hash still works; try again next login
+            print(f"Error upgrading password hash: {e}")
     
     def create_session(self, user_id: int) -> str:
         """Create a new session for user"""
-        cursor = None
         try:
-            cursor = self._get_cursor()
-            
             # Generate session token
             session_token = secrets.token_hex(32)
             expires_at = datetime.now() + timedelta(days=7)  # 7 days expiry
             
             # Insert session
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                INSERT INTO user_sessions (user_id, session_token, expires_at)
-                VALUES ({placeholder}, {placeholder}, {placeholder})
-            """, (user_id, session_token, expires_at))
+            self._run('insert_session', (user_id, session_token, expires_at))
             
             self.connection.commit()
             return session_token
@@ -368,72 +747,123 @@ class DatabaseManager:
         except Error as e:
             print(f"Error creating session: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_user_by_session(self, session_token: str) -> Optional[Dict]:
         """Get user by session token"""
-        cursor = None
+        if not session_token:
+            return None
+        cached = self.session_cache.get(session_token)
+        if cached is not None:
+            return cached
+        
         try:
-            cursor = self._get_cursor(dictionary=True)
-            
-            placeholder = self._get_placeholder()
-            is_sqlite = 'sqlite' in str(type(self.connection)).lower()
-            if is_sqlite:
-                cursor.execute(f"""
-                    SELECT u.id, u.username, u.email, u.full_name, u.user_role, u.is_active
-                    FROM users u
-                    JOIN user_sessions s ON u.id = s.user_id
-                    WHERE s.session_token = {placeholder} AND s.expires_at > datetime('now') AND u.is_active = 1
-                """, (session_token,))
-            else:
-                cursor.execute(f"""
-                    SELECT u.id, u.username, u.email, u.full_name, u.user_role, u.is_active
-                    FROM users u
-                    JOIN user_sessions s ON u.id = s.user_id
-                    WHERE s.session_token = {placeholder} AND s.expires_at > NOW() AND u.is_active = 1
-                """, (session_token,))
-            
-            user = cursor.fetchone()
+            user = self._fetchone('user_by_session', (session_token,), dictionary=True)
+            if user:
+                expires_at = _as_datetime(user.pop('expires_at'))
+                self.session_cache.set(session_token, user, expires_at)
             return user
             
         except Error as e:
             print(f"Error getting user by session: {e}")
             return None
+    
+    def delete_session(self, session_token: str) -> bool:
+        """End a session (logout)"""
+        self.session_cache.invalidate_token(session_token)
+        if not session_token:
+            return False
+        try:
+            rowcount, _ = self._run('delete_session', (session_token,))
+            self.connection.commit()
+            return rowcount > 0
+        except Exception as e:
+            print(f"Error deleting session: {e}")
+            return False
+    
+    def purge_expired_sessions(self, batch_size: int = 1000, connection=None) -> int:
+        """
+        Delete expired sessions in batches; returns the number removed.
+        Runs on ``connection`` (a new one if not given), never on the shared
+        request connection, so its commits can't touch a request's transaction.
+        """
+        owned = connection is None
+        removed = 0
+        cursor = None
+        try:
+            if owned:
+                connection = self._open_connection()
+            sql = self._sql('purge_sessions')
+            now = datetime.now()
+            cursor = connection.cursor()
+            while True:
+                # Short transactions so logins aren't blocked behind one big delete
+                started = time.perf_counter()
+                cursor.execute(sql, (now, batch_size))
+                connection.commit()
+                DB_QUERY_DURATION.observe(time.perf_counter() - started, 'purge_sessions')
+                removed += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    break
+            return removed
+        except Exception as e:
+            if not owned:
+                # The caller's connection may be broken; let it reconnect
+                raise
+            print(f"Error purging expired sessions: {e}")
+            return removed
         finally:
-            if cursor:
+            if cursor is not None:
                 cursor.close()
+            if owned and connection is not None:
+                connection.close()
+    
+    def start_session_sweeper(self, interval: int = SESSION_SWEEP_INTERVAL):
+        """Purge expired sessions now and then every ``interval`` seconds on a daemon thread"""
+        if interval <= 0 or self._sweeper is not None:
+            return
+        
+        def run():
+            # The sweeper's own connection, like the write-behind queue's
+            connection = None
+            while True:
+                try:
+                    if connection is None:
+                        connection = self._open_connection()
+                    removed = self.purge_expired_sessions(connection=connection)
+                    if removed:
+                        print(f"Purged {removed} expired sessions")
+                except Exception as e:
+                    print(f"Error purging expired sessions: {e}")
+                    if connection is not None:
+                        try:
+                            connection.close()
+                        except Exception:
+                            pass
+                    connection = None
+                if self._sweeper_stop.wait(interval):
+                    break
+            if connection is not None:
+                connection.close()
+        
+        self._sweeper = threading.Thread(target=run, name="session-sweeper", daemon=True)
+        self._sweeper.start()
     
     def update_user_profile(self, user_id: int, profile_data: Dict) -> bool:
         """Update user profile"""
-        cursor = None
         try:
-            cursor = self._get_cursor()
-            
             # Check if profile exists
-            placeholder = self._get_placeholder()
-            cursor.execute(f"SELECT id FROM user_profiles WHERE user_id = {placeholder}", (user_id,))
-            profile_exists = cursor.fetchone()
+            profile_exists = self._fetchone('profile_exists', (user_id,))
             
             if profile_exists:
                 # Update existing profile
-                cursor.execute(f"""
-                    UPDATE user_profiles 
-                    SET degree = {placeholder}, study_year = {placeholder}, sector = {placeholder}, stream = {placeholder}, 
-                        skills = {placeholder}, resume_path = {placeholder}, updated_at = CURRENT_TIMESTAMP
-                    WHERE user_id = {placeholder}
-                """, (profile_data.get('degree'), profile_data.get('study_year'),
-                      profile_data.get('sector'), profile_data.get('stream'),
-                      profile_data.get('skills'), profile_data.get('resume_path'), user_id))
+                self._run('update_profile', (profile_data.get('degree'), profile_data.get('study_year'),
+                                             profile_data.get('sector'), profile_data.get('stream'),
+                                             profile_data.get('skills'), profile_data.get('resume_path'), user_id))
             else:
                 # Create new profile
-                cursor.execute(f"""
-                    INSERT INTO user_profiles (user_id, degree, study_year, sector, stream, skills, resume_path)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-                """, (user_id, profile_data.get('degree'), profile_data.get('study_year'),
-                      profile_data.get('sector'), profile_data.get('stream'),
-                      profile_data.get('skills'), profile_data.get('resume_path')))
+                self._run('insert_profile', (user_id, profile_data.get('degree'), profile_data.get('study_year'),
+                                             profile_data.get('sector'), profile_data.get('stream'),
+                                             profile_data.get('skills'), profile_data.get('resume_path')))
             
             self.connection.commit()
             return True
@@ -441,89 +871,76 @@ class DatabaseManager:
         except Error as e:
             print(f"Error updating profile: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_user_profile(self, user_id: int) -> Optional[Dict]:
         """Get user profile"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                SELECT * FROM user_profiles WHERE user_id = {placeholder}
-            """, (user_id,))
-            
-            profile = cursor.fetchone()
-            return profile
+            return self._fetchone('user_profile', (user_id,), dictionary=True)
             
         except Error as e:
             print(f"Error getting profile: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def save_recommendation_history(self, user_id: int, role: str, location: str, 
                                   skills_used: List[str], missing_skills: List[str],
                                   salary_range: tuple) -> bool:
-        """Save recommendation history"""
-        cursor = None
-        try:
-            cursor = self._get_cursor()
-            
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                INSERT INTO recommendation_history 
-                (user_id, role, location, skills_used, missing_skills, salary_range_low, salary_range_high)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            """, (user_id, role, location, 
+        """Save recommendation history (queued; visible within WRITE_BEHIND_INTERVAL)"""
+        params = (user_id, role, location, 
                   ','.join(skills_used), ','.join(missing_skills),
-                  salary_range[0], salary_range[1]))
-            
+                  salary_range[0], salary_range[1])
+        if self.history_writes is not None and self.history_writes.put(self._sql('insert_history'), params):
+            return True
+        
+        # Write-behind disabled or backed up: write it now
+        try:
+            self._run('insert_history', params)
             self.connection.commit()
             return True
             
         except Error as e:
             print(f"Error saving recommendation history: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_recommendation_history(self, user_id: int, limit: int = 10) -> List[Dict]:
         """Get user's recommendation history"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                SELECT * FROM recommendation_history 
-                WHERE user_id = {placeholder} 
-                ORDER BY created_at DESC 
-                LIMIT {placeholder}
-            """, (user_id, limit))
-            
-            history = cursor.fetchall()
-            return history
+            return self._fetchall('recommendation_history', (user_id, limit), dictionary=True)
             
         except Error as e:
             print(f"Error getting recommendation history: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
     
-    def search_candidates(self, skills=None, role=None, location=None, degree=None, stream=None, limit=50):
-        """Search candidates based on filters"""
+    def _candidate_filters(self, skills=None, degree=None, stream=None) -> Tuple[str, list]:
+        """WHERE clause (beyond active students) and params for candidate filters"""
+        placeholder = self._get_placeholder()
+        clauses = []
+        params = []
+        if skills:
+            skills_list = [s.strip().lower() for s in skills.split(',') if s.strip()]
+            if skills_list:
+                clauses.append("(" + " OR ".join([f"LOWER(p.skills) LIKE {placeholder}"] * len(skills_list)) + ")")
+                params.extend(f"%{skill}%" for skill in skills_list)
+        
+        if degree:
+            clauses.append(f"p.degree = {placeholder}")
+            params.append(degree)
+        
+        if stream:
+            clauses.append(f"p.stream = {placeholder}")
+            params.append(stream)
+        
+        return "".join(f" AND {clause}" for clause in clauses), params
+    
+    def search_candidates(self, skills=None, role=None, location=None, degree=None, stream=None, limit=50, after=None):
+        """
+        Search candidates based on filters, newest first.
+        ``after`` is a page cursor (see encode_page_cursor) to continue from.
+        """
         cursor = None
         try:
             cursor = self._get_cursor(dictionary=True)
             placeholder = self._get_placeholder()
-            is_sqlite = 'sqlite' in str(type(self.connection)).lower()
+            filters, params = self._candidate_filters(skills, degree, stream)
             
             query = """
                 SELECT u.id, u.username, u.email, u.full_name, u.created_at,
@@ -531,42 +948,23 @@ class DatabaseManager:
                 FROM users u
                 LEFT JOIN user_profiles p ON u.id = p.user_id
                 WHERE u.user_role = 'student' AND u.is_active = 1
-            """
-            params = []
-            
-            if skills:
-                skills_list = [s.strip().lower() for s in skills.split(',') if s.strip()]
-                if skills_list:
-                    if is_sqlite:
-                        query += " AND ("
-                        for i, skill in enumerate(skills_list):
-                            if i > 0:
-                                query += " OR "
-                            query += f"LOWER(p.skills) LIKE {placeholder}"
-                            params.append(f"%{skill}%")
-                        query += ")"
-                    else:
-                        query += " AND ("
-                        for i, skill in enumerate(skills_list):
-                            if i > 0:
-                                query += " OR "
-                            query += f"LOWER(p.skills) LIKE {placeholder}"
-                            params.append(f"%{skill}%")
-                        query += ")"
-            
-            if degree:
-                query += f" AND p.degree = {placeholder}"
-                params.append(degree)
-            
-            if stream:
-                query += f" AND p.stream = {placeholder}"
-                params.append(stream)
-            
-            query += f" ORDER BY u.created_at DESC LIMIT {placeholder}"
+            """ + filters
+            
+            if after:
+                # Keyset pagination: seek past the last row instead of OFFSET;
+                # the bare <= bound lets the created_at index range-scan
+                created_at, last_id = decode_page_cursor(after)
+                query += f" AND u.created_at <= {placeholder} AND (u.created_at < {placeholder} OR u.id < {placeholder})"
+                params.extend([created_at, created_at, last_id])
+            
+            query += f" ORDER BY u.created_at DESC, u.id DESC LIMIT {placeholder}"
             params.append(limit)
             
+            started = time.perf_counter()
             cursor.execute(query, params)
-            return cursor.fetchall()
+            rows = cursor.fetchall()
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, "search_candidates")
+            return rows
             
         except Exception as e:
             print(f"Error searching candidates: {e}")
@@ -575,213 +973,125 @@ class DatabaseManager:
             if cursor:
                 cursor.close()
     
-    def get_all_candidates(self, limit=100):
-        """Get all candidate profiles"""
+    def get_all_candidates(self, limit=100, after=None):
+        """Get all candidate profiles, newest first, optionally after a page cursor"""
+        try:
+            if after:
+                created_at, last_id = decode_page_cursor(after)
+                return self._fetchall('all_candidates_after', (created_at, created_at, last_id, limit), dictionary=True)
+            return self._fetchall('all_candidates', (limit,), dictionary=True)
+        except Exception as e:
+            print(f"Error getting candidates: {e}")
+            return []
+    
+    def get_candidates_page(self, page_size=25, after=None, skills=None, degree=None, stream=None):
+        """
+        One page of candidates and the cursor for the next page (None on the last page).
+        Costs O(page_size) however deep the page is.
+        """
+        if any([skills, degree, stream]):
+            rows = self.search_candidates(skills=skills, degree=degree, stream=stream,
+                                          limit=page_size + 1, after=after)
+        else:
+            rows = self.get_all_candidates(limit=page_size + 1, after=after)
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            return rows, encode_page_cursor(rows[-1])
+        return rows, None
+    
+    def count_candidates(self, skills=None, degree=None, stream=None) -> int:
+        """Number of active candidates matching the filters"""
         cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            placeholder = self._get_placeholder()
+            if not any([skills, degree, stream]):
+                return self._fetchone('count_candidates')[0]
             
-            query = f"""
-                SELECT u.id, u.username, u.email, u.full_name, u.created_at,
-                       p.degree, p.study_year, p.sector, p.stream, p.skills, p.resume_path
-                FROM users u
+            filters, params = self._candidate_filters(skills, degree, stream)
+            cursor = self._get_cursor()
+            started = time.perf_counter()
+            cursor.execute("""
+                SELECT COUNT(*) FROM users u
                 LEFT JOIN user_profiles p ON u.id = p.user_id
                 WHERE u.user_role = 'student' AND u.is_active = 1
-                ORDER BY u.created_at DESC
-                LIMIT {placeholder}
-            """
-            cursor.execute(query, (limit,))
-            return cursor.fetchall()
+            """ + filters, params)
+            count = cursor.fetchone()[0]
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, "count_candidates_filtered")
+            return count
         except Exception as e:
-            print(f"Error getting candidates: {e}")
-            return []
+            print(f"Error counting candidates: {e}")
+            return 0
         finally:
             if cursor:
                 cursor.close()
     
     def get_candidate_by_id(self, candidate_id):
         """Get detailed candidate profile"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            placeholder = self._get_placeholder()
-            
-            query = f"""
-                SELECT u.id, u.username, u.email, u.full_name, u.created_at,
-                       p.degree, p.study_year, p.sector, p.stream, p.skills, p.resume_path
-                FROM users u
-                LEFT JOIN user_profiles p ON u.id = p.user_id
-                WHERE u.id = {placeholder} AND u.user_role = 'student' AND u.is_active = 1
-            """
-            cursor.execute(query, (candidate_id,))
-            return cursor.fetchone()
+            return self._fetchone('candidate_by_id', (candidate_id,), dictionary=True)
         except Exception as e:
             print(f"Error getting candidate: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def create_job_posting(self, hr_user_id, title, description, required_skills, location, salary_range_low=None, salary_range_high=None):
         """Create a new job posting"""
-        cursor = None
         try:
-            cursor = self._get_cursor()
-            placeholder = self._get_placeholder()
-            is_sqlite = 'sqlite' in str(type(self.connection)).lower()
-            
-            if is_sqlite:
-                create_jobs_table = """
-                CREATE TABLE IF NOT EXISTS job_postings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    hr_user_id INTEGER NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    required_skills TEXT,
-                    location TEXT,
-                    salary_range_low INTEGER,
-                    salary_range_high INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT 1,
-                    FOREIGN KEY (hr_user_id) REFERENCES users(id) ON DELETE CASCADE
-                )
-                """
-            else:
-                create_jobs_table = """
-                CREATE TABLE IF NOT EXISTS job_postings (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    hr_user_id INT NOT NULL,
-                    title VARCHAR(200) NOT NULL,
-                    description TEXT,
-                    required_skills TEXT,
-                    location VARCHAR(100),
-                    salary_range_low INT,
-                    salary_range_high INT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    FOREIGN KEY (hr_user_id) REFERENCES users(id) ON DELETE CASCADE
-                )
-                """
-            cursor.execute(create_jobs_table)
-            
-            cursor.execute(f"""
-                INSERT INTO job_postings (hr_user_id, title, description, required_skills, location, salary_range_low, salary_range_high)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            """, (hr_user_id, title, description, required_skills, location, salary_range_low, salary_range_high))
-            
+            _, job_id = self._run('insert_job_posting', (hr_user_id, title, description, required_skills, location,
+                                                         salary_range_low, salary_range_high))
             self.connection.commit()
-            return cursor.lastrowid
+            return job_id
         except Exception as e:
             print(f"Error creating job posting: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_job_postings(self, hr_user_id=None):
         """Get job postings"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            placeholder = self._get_placeholder()
-            
             if hr_user_id:
-                query = f"""
-                    SELECT * FROM job_postings 
-                    WHERE hr_user_id = {placeholder} AND is_active = 1
-                    ORDER BY created_at DESC
-                """
-                cursor.execute(query, (hr_user_id,))
-            else:
-                query = """
-                    SELECT * FROM job_postings 
-                    WHERE is_active = 1
-                    ORDER BY created_at DESC
-                """
-                cursor.execute(query)
-            
-            return cursor.fetchall()
+                return self._fetchall('job_postings_by_hr', (hr_user_id,), dictionary=True)
+            return self._fetchall('job_postings', dictionary=True)
         except Exception as e:
             print(f"Error getting job postings: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_job_posting_by_id(self, job_id):
         """Get a specific job posting"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            placeholder = self._get_placeholder()
-            
-            query = f"SELECT * FROM job_postings WHERE id = {placeholder} AND is_active = 1"
-            cursor.execute(query, (job_id,))
-            return cursor.fetchone()
+            return self._fetchone('job_posting_by_id', (job_id,), dictionary=True)
         except Exception as e:
             print(f"Error getting job posting: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def update_user_role(self, user_id: int, new_role: str) -> bool:
         """Update user role"""
-        cursor = None
         try:
             if new_role not in ['student', 'hr']:
                 return False
             
-            cursor = self._get_cursor()
-            placeholder = self._get_placeholder()
-            
-            cursor.execute(f"""
-                UPDATE users 
-                SET user_role = {placeholder}
-                WHERE id = {placeholder}
-            """, (new_role, user_id))
+            rowcount, _ = self._run('update_user_role', (new_role, user_id))
             
             self.connection.commit()
-            return cursor.rowcount > 0
+            # Cached sessions still carry the old role
+            self.session_cache.invalidate_user(user_id)
+            return rowcount > 0
         except Exception as e:
             print(f"Error updating user role: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_user_by_username(self, username: str):
         """Get user by username"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            placeholder = self._get_placeholder()
-            
-            cursor.execute(f"""
-                SELECT id, username, email, full_name, user_role, is_active
-                FROM users 
-                WHERE username = {placeholder} OR email = {placeholder}
-            """, (username, username))
-            
-            return cursor.fetchone()
+            return self._fetchone('user_by_username', (username, username), dictionary=True)
         except Exception as e:
             print(f"Error getting user by username: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def create_resume_modifications_table(self):
         """Create table for resume modifications history"""
         cursor = None
         try:
             cursor = self._get_cursor()
-            is_sqlite = 'sqlite' in str(type(self.connection)).lower()
             
-            if is_sqlite:
+            if self.dialect.is_sqlite:
                 create_table = """
                 CREATE TABLE IF NOT EXISTS resume_modifications (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -822,86 +1132,60 @@ class DatabaseManager:
     
     def save_resume_modification(self, user_id, original_path, modified_path, modifications, score_before, score_after, job_desc):
         """Save resume modification record"""
-        cursor = None
         try:
-            cursor = self._get_cursor()
-            placeholder = self._get_placeholder()
-            
             import json
             modifications_json = json.dumps(modifications)
             
-            cursor.execute(f"""
-                INSERT INTO resume_modifications 
-                (user_id, original_resume_path, modified_resume_path, modifications_json, 
-                 ats_score_before, ats_score_after, job_description)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            """, (user_id, original_path, modified_path, modifications_json, score_before, score_after, job_desc))
+            _, modification_id = self._run('insert_resume_modification', (
+                user_id, original_path, modified_path, modifications_json, score_before, score_after, job_desc))
             
             self.connection.commit()
-            return cursor.lastrowid
+            return modification_id
         except Exception as e:
             print(f"Error saving resume modification: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_modification_history(self, user_id, limit=10):
         """Get user's resume modification history"""
-        cursor = None
         try:
-            cursor = self._get_cursor(dictionary=True)
-            placeholder = self._get_placeholder()
-            
-            cursor.execute(f"""
-                SELECT * FROM resume_modifications 
-                WHERE user_id = {placeholder} 
-                ORDER BY created_at DESC 
-                LIMIT {placeholder}
-            """, (user_id, limit))
-            
-            return cursor.fetchall()
+            return self._fetchall('modification_history', (user_id, limit), dictionary=True)
         except Exception as e:
             print(f"Error getting modification history: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
-
+    
     def reset_user_data(self, user_id: int) -> bool:
         """
         Hard reset: Clears all user data (Profile, Recommendations, Enhancements) except the user account itself.
         """
-        cursor = None
         try:
-            cursor = self._get_cursor()
-            placeholder = self._get_placeholder()
-            
             # 1. Delete Profile Data (Cascades usually handle this if user is deleted, but here we just want to clear data)
             # Actually, let's just delete the profile record entirely to force a fresh start
-            cursor.execute(f"DELETE FROM user_profiles WHERE user_id = {placeholder}", (user_id,))
+            self._run('delete_user_profile', (user_id,))
             
             # 2. Delete Recommendation History
-            cursor.execute(f"DELETE FROM recommendation_history WHERE user_id = {placeholder}", (user_id,))
+            self._run('delete_user_history', (user_id,))
             
             # 3. Delete Resume Modifications (if table exists)
             try:
-                cursor.execute(f"DELETE FROM resume_modifications WHERE user_id = {placeholder}", (user_id,))
+                self._run('delete_user_modifications', (user_id,))
             except Exception:
                 pass # Table might not exist yet
                 
             self.connection.commit()
+            self.session_cache.invalidate_user(user_id)
             return True
         except Exception as e:
             print(f"Error resetting user data: {e}")
             self.connection.rollback()
             return False
-        finally:
-            if cursor:
-                cursor.close()
-
+    
     def close(self):
         """Close database connection"""
+        self._sweeper_stop.set()
+        if self.history_writes is not None:
+            self.history_writes.close()
+        with self._prepared_lock:
+            self._close_prepared()
         if self.connection and hasattr(self.connection, 'is_connected') and self.connection.is_connected():
             self.connection.close()
             print("Database connection closed")
@@ -911,5 +1195,7 @@ class DatabaseManager:
              except:
                  pass
 
-# Global database instance
-db = DatabaseManager()
+# Global database instance (built on first use)
+db = LazyService("db", DatabaseManager)
+# A forked worker opens its own connections and starts its own writer/sweeper threads
+register_after_fork("db", lambda: reset_service("db"))
@@ -8,18 +8,20 @@ from dataclasses import dataclass
 import json
 from datetime import datetime
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
+from .metrics import timed
+from .services import LazyService, module_available, shared_resource
 
-try:
-    import shap
-    SHAP_AVAILABLE = True
-except ImportError:
-    SHAP_AVAILABLE = False
+# Checked without importing; sentence-transformers is imported when the model loads
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+SHAP_AVAILABLE = module_available("shap")
+
+
+def load_embedding_model(name: str):
+    """SentenceTransformer ``name``, loaded once per process and shared (ATS engine, RAG educator)."""
+    def load():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name)
+    return shared_resource(("sentence_transformer", name), load)
 
 
 @dataclass
@@ -73,7 +75,7 @@ class ExplainableATSEngine:
         """Load sentence transformer model for embeddings"""
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.embedding_model = SentenceTransformer(self.embedding_model_name)
+                self.embedding_model = load_embedding_model(self.embedding_model_name)
                 print(f"Loaded embedding model: {self.embedding_model_name}")
             except Exception as e:
                 print(f"Warning: Could not load embedding model: {e}")
@@ -113,6 +115,7 @@ class ExplainableATSEngine:
             print(f"Error in semantic matching: {e}")
             return 0.0
     
+    @timed("ats_analysis")
     def analyze_resume_vs_jd(
         self,
         resume_skills: List[str],
@@ -729,6 +732,6 @@ class ExplainableATSEngine:
         }
 
 
-# Global instance
-ats_engine = ExplainableATSEngine()
+# Global instance (built on first use)
+ats_engine = LazyService("ats_engine", ExplainableATSEngine)
 
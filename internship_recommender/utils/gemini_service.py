@@ -1,13 +1,25 @@
 import os
-import google.generativeai as genai
 import json
 from typing import Dict, Any, Optional
 import mimetypes
 
+from .metrics import timed
+from .services import LazyService, register_after_fork, reset_service
+
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    genai = None
+    GENAI_AVAILABLE = False
+
 class GeminiService:
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
+        if not GENAI_AVAILABLE:
+            print("Warning: google-generativeai not installed; Gemini features disabled.")
+            self.api_key = None
+        elif not self.api_key:
             print("Warning: GOOGLE_API_KEY not found in environment variables.")
         else:
             genai.configure(api_key=self.api_key)
@@ -17,6 +29,7 @@ class GeminiService:
             except Exception:
                 self.model = genai.GenerativeModel('gemini-2.5-flash')
 
+    @timed("llm.gemini")
     def generate_content(self, prompt: str) -> str:
         """Generic method to generate text content using Gemini."""
         if not self.api_key:
@@ -163,6 +176,7 @@ class GeminiService:
         
         return self.generate_content(prompt)
 
+    @timed("llm.gemini_parse_resume")
     def parse_resume(self, file_path: str) -> Dict[str, Any]:
         """
         Parses a resume file using Gemini to extract structured data and generate suggestions.
@@ -378,5 +392,7 @@ class GeminiService:
             print(f"Error parsing resume with Gemini: {e}")
             return {"error": str(e)}
 
-# Global instance
-gemini_service = GeminiService()
+# Global instance (built on first use)
+gemini_service = LazyService("gemini_service", GeminiService)
+# The SDK's gRPC channels don't survive a fork; workers configure their own
+register_after_fork("gemini_service", lambda: reset_service("gemini_service"))
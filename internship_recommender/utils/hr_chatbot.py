@@ -9,10 +9,13 @@ from typing import Dict, List, Optional
 from .database import db
 from .resume_parser import extract_text_from_file
 from .candidate_matcher import get_candidate_insights, match_candidates_to_job
+from .ollama_summarizer import OLLAMA_BASE_URL
+from .metrics import timed
+from .services import LazyService
 
 
 class HRChatbot:
-    def __init__(self, model="llama3.2", base_url="http://localhost:11434"):
+    def __init__(self, model="llama3.2", base_url=OLLAMA_BASE_URL):
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.chat_url = f"{base_url}/api/chat"
@@ -337,6 +340,7 @@ Answer the HR's question directly and concisely. If they ask for just a name, gi
         
         return answer
 
+    @timed("llm.hr_chatbot")
     def chat(self, question: str, candidate_id: Optional[int] = None, 
              job_id: Optional[int] = None, conversation_history: List[Dict] = None) -> Dict:
         """
@@ -353,7 +357,7 @@ Answer the HR's question directly and concisely. If they ask for just a name, gi
         """
         if not self.is_available():
             return {
-                'response': 'Ollama server is not available. Please ensure Ollama is running on localhost:11434',
+                'response': f'Ollama server is not available. Please ensure Ollama is running on {self.base_url}',
                 'status': 'error',
                 'error': 'Ollama not available'
             }
@@ -518,7 +522,7 @@ Answer:"""
                 }
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             return {
-                'response': 'Cannot connect to Ollama server. Please ensure Ollama is running on localhost:11434. Start it with: ollama serve',
+                'response': f'Cannot connect to Ollama server. Please ensure Ollama is running on {self.base_url}. Start it with: ollama serve',
                 'status': 'error',
                 'error': 'Connection error'
             }
@@ -560,6 +564,6 @@ Answer:"""
             ]
 
 
-# Global instance
-hr_chatbot = HRChatbot()
+# Global instance (built on first use)
+hr_chatbot = LazyService("hr_chatbot", HRChatbot)
 
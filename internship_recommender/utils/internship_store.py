@@ -0,0 +1,280 @@
+"""
+Indexed internship catalog backed by SQLite + FTS5.
+Large CSV/JSONL feeds are streamed in chunks, deduplicated by link and
+written with their extracted skills, so the recommender can query the
+catalog lazily instead of holding it in memory.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .services import register_after_fork
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+STORE_PATH = Path(os.getenv("INTERNSHIP_STORE_PATH", DATA_DIR / "internships.db"))
+
+# Column names seen in common job feeds, mapped onto our schema
+COLUMN_ALIASES = {
+    "job_title": "title",
+    "name": "title",
+    "company_name": "company",
+    "employer": "company",
+    "city": "location",
+    "url": "link",
+    "href": "link",
+    "apply_link": "link",
+    "snippet": "description",
+    "body": "description",
+    "job_description": "description",
+}
+FIELDS = ["title", "company", "location", "link", "description"]
+
+_WS_RE = re.compile(r"\s+")
+_NO_IDS = np.empty(0, dtype=np.int64)
+
+
+def _normalize_text(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return _WS_RE.sub(" ", str(value)).strip()
+
+
+def _dedup_key(record: Dict) -> str:
+    """Link identifies a posting; fall back to a hash of its visible fields."""
+    if record["link"]:
+        return record["link"]
+    raw = "|".join(record[f].lower() for f in ("title", "company", "location"))
+    return "sha1:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _fts_query(phrases: List[str]) -> str:
+    """OR together quoted phrases; FTS5 escapes quotes by doubling them."""
+    quoted = []
+    for phrase in phrases:
+        phrase = _normalize_text(phrase)
+        if phrase:
+            quoted.append('"' + phrase.replace('"', '""') + '"')
+    return " OR ".join(dict.fromkeys(quoted))
+
+
+class InternshipStore:
+    """SQLite store for the internship catalog with an FTS5 index."""
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._fts = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _has_fts5(self) -> bool:
+        if self._fts is None:
+            try:
+                probe = sqlite3.connect(":memory:")
+                probe.execute("CREATE VIRTUAL TABLE t USING fts5(a)")
+                probe.close()
+                self._fts = True
+            except sqlite3.OperationalError:
+                print("Note: SQLite FTS5 not available; internship search will use LIKE queries.")
+                self._fts = False
+        return self._fts
+
+    def init_schema(self):
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS internships (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedup_key TEXT UNIQUE NOT NULL,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                link TEXT,
+                description TEXT,
+                skills TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS catalog_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        if self._has_fts5():
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS internships_fts USING fts5(
+                    title, description, location, skills,
+                    content='internships', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS internships_ai AFTER INSERT ON internships BEGIN
+                    INSERT INTO internships_fts(rowid, title, description, location, skills)
+                    VALUES (new.id, new.title, new.description, new.location, new.skills);
+                END;
+                CREATE TRIGGER IF NOT EXISTS internships_ad AFTER DELETE ON internships BEGIN
+                    INSERT INTO internships_fts(internships_fts, rowid, title, description, location, skills)
+                    VALUES ('delete', old.id, old.title, old.description, old.location, old.skills);
+                END;
+                CREATE TRIGGER IF NOT EXISTS internships_au AFTER UPDATE ON internships BEGIN
+                    INSERT INTO internships_fts(internships_fts, rowid, title, description, location, skills)
+                    VALUES ('delete', old.id, old.title, old.description, old.location, old.skills);
+                    INSERT INTO internships_fts(rowid, title, description, location, skills)
+                    VALUES (new.id, new.title, new.description, new.location, new.skills);
+                END;
+            """)
+        conn.commit()
+
+    def version(self) -> int:
+        """Catalog version, bumped after every ingest; 0 when the store is empty."""
+        if not self.exists():
+            return 0
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM catalog_meta WHERE key = 'version'"
+            ).fetchone()
+            return int(row[0]) if row else 0
+        except sqlite3.Error:
+            return 0
+
+    def count(self) -> int:
+        if not self.exists():
+            return 0
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM internships").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    @staticmethod
+    def _read_chunks(source: Path, chunk_size: int):
+        suffix = source.suffix.lower()
+        if suffix in (".jsonl", ".ndjson", ".json"):
+            return pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False)
+        return pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+    def _normalize_chunk(self, chunk: pd.DataFrame, extract_skills) -> List[tuple]:
+        chunk = chunk.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+        # Later rows win, matching the upsert across chunks
+        latest = {}
+        for raw in chunk.to_dict("records"):
+            record = {f: _normalize_text(raw.get(f)) for f in FIELDS}
+            if record["title"]:
+                latest[_dedup_key(record)] = record
+        rows = []
+        for key, record in latest.items():
+            skills = extract_skills(f"{record['title']} {record['description']}")
+            rows.append((key, record["title"], record["company"], record["location"],
+                         record["link"], record["description"], ",".join(skills)))
+        return rows
+
+    def ingest(self, source, chunk_size: int = 5000) -> Dict[str, int]:
+        """
+        Stream a CSV/JSONL feed into the store.
+        Re-ingesting a posting with a known link updates it in place.
+        """
+        from .ner_extractor import simple_skill_extract
+
+        source = Path(source)
+        self.init_schema()
+        conn = self._conn()
+        stats = {"read": 0, "written": 0}
+        for chunk in self._read_chunks(source, chunk_size):
+            stats["read"] += len(chunk)
+            rows = self._normalize_chunk(chunk, simple_skill_extract)
+            if not rows:
+                continue
+            with conn:
+                conn.executemany("""
+                    INSERT INTO internships (dedup_key, title, company, location, link, description, skills)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(dedup_key) DO UPDATE SET
+                        title = excluded.title, company = excluded.company,
+                        location = excluded.location, link = excluded.link,
+                        description = excluded.description, skills = excluded.skills,
+                        updated_at = CURRENT_TIMESTAMP
+                """, rows)
+            stats["written"] += len(rows)
+            print(f"  Ingested {stats['written']} postings from {source.name}...")
+        with conn:
+            conn.execute("""
+                INSERT INTO catalog_meta (key, value) VALUES ('version', '1')
+                ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+            """)
+        return stats
+
+    def match_ids(self, fields: Sequence[str], phrase: str) -> np.ndarray:
+        """
+        Sorted ids of every posting whose ``fields`` contain ``phrase``.
+        FTS5 narrows to rows with the phrase's tokens and a LIKE check confirms
+        the substring, so matching agrees with the in-memory CSV index.
+        """
+        phrase = _normalize_text(phrase).lower()
+        if not phrase or not self.exists():
+            return _NO_IDS
+        pattern = "%" + phrase.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        like = " OR ".join(f"i.{f} LIKE ? ESCAPE '\\'" for f in fields)
+        try:
+            if self._has_fts5():
+                query = " ".join(fields)
+                rows = self._conn().execute(f"""
+                    SELECT i.id FROM internships_fts f JOIN internships i ON i.id = f.rowid
+                    WHERE internships_fts MATCH ? AND ({like})
+                """, ["{" + query + "} : " + _fts_query([phrase])] + [pattern] * len(fields)).fetchall()
+            else:
+                rows = self._conn().execute(
+                    f"SELECT i.id FROM internships i WHERE {like}", [pattern] * len(fields)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching internship store: {e}")
+            return _NO_IDS
+        return np.sort(np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)))
+
+    def fetch(self, ids: Sequence[int]) -> pd.DataFrame:
+        """Postings with the given ids, in that order."""
+        columns = ["title", "company", "location", "link", "description"]
+        ids = [int(i) for i in ids]
+        if not ids or not self.exists():
+            return pd.DataFrame(columns=columns)
+        marks = ",".join("?" * len(ids))
+        try:
+            rows = self._conn().execute(
+                f"SELECT id, title, company, location, link, description FROM internships WHERE id IN ({marks})", ids
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading internship store: {e}")
+            return pd.DataFrame(columns=columns)
+        by_id = {r[0]: tuple(r)[1:] for r in rows}
+        return pd.DataFrame([by_id[i] for i in ids if i in by_id], columns=columns)
+
+
+_store: Optional[InternshipStore] = None
+
+
+def get_internship_store() -> InternshipStore:
+    """Get or create the shared internship store."""
+    global _store
+    if _store is None:
+        _store = InternshipStore()
+    return _store
+
+
+def reset_internship_store():
+    """Forget the shared store (and its connections); the next call opens a new one."""
+    global _store
+    _store = None
+
+
+register_after_fork("internship_store", reset_internship_store)
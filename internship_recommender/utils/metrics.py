@@ -0,0 +1,259 @@
+"""
+In-process latency metrics exposed in Prometheus text format.
+Requests are timed by Flask hooks (init_app), named stages by @timed /
+``with timed(...)``, and DB queries per named statement. Stage timings are
+labelled with the route being served, so /metrics shows which stage of a
+route is slow. Set METRICS_ENABLED=0 to turn recording off.
+
+Each process records its own histograms. When several worker processes
+serve one app, set METRICS_DIR to a directory they share: every worker
+writes a snapshot there from a background thread (every
+METRICS_FLUSH_INTERVAL seconds, and at exit), and /metrics on any worker
+returns the sum over all of them.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5.0))
+
+# Upper bounds in seconds; from fast DB lookups up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labelvalues: str):
+        if not METRICS_ENABLED:
+            return
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # per-bucket counts (last slot is +Inf), then sum
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> Dict[Tuple[str, ...], list]:
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def render(self, snapshot: Dict[Tuple[str, ...], list] = None) -> List[str]:
+        if snapshot is None:
+            snapshot = self.snapshot()
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues in sorted(snapshot):
+            series = snapshot[labelvalues]
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labelvalues))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-1]!r}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Time spent serving HTTP requests.",
+                             ("method", "route", "status"))
+STAGE_DURATION = Histogram("stage_duration_seconds", "Time spent in named processing stages.",
+                           ("stage", "route"))
+DB_QUERY_DURATION = Histogram("db_query_duration_seconds", "Time spent running named SQL statements.",
+                              ("query",))
+
+HISTOGRAMS = [REQUEST_DURATION, STAGE_DURATION, DB_QUERY_DURATION]
+
+
+def _current_route() -> str:
+    """URL rule of the request being served, or "" outside a request."""
+    try:
+        from flask import has_request_context, request
+    except ImportError:
+        return ""
+    if not has_request_context():
+        return ""
+    rule = request.url_rule
+    return rule.rule if rule is not None else ""
+
+
+class timed:
+    """
+    Time a stage, as a decorator or a context manager:
+
+        @timed("salary_prediction")
+        def predict_salary(...): ...
+
+        with timed("llm.chat"):
+            ...
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._starts = threading.local()
+
+    def __call__(self, func):
+        stage = self.stage
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_DURATION.observe(time.perf_counter() - started, stage, _current_route())
+        return wrapper
+
+    def __enter__(self):
+        stack = getattr(self._starts, "stack", None)
+        if stack is None:
+            stack = self._starts.stack = []
+        stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        started = self._starts.stack.pop()
+        STAGE_DURATION.observe(time.perf_counter() - started, self.stage, _current_route())
+        return False
+
+
+_flush_lock = threading.Lock()
+# Pid of the process whose flush thread is running (a forked worker starts its own)
+_flusher_pid = None
+
+
+def _snapshot_path() -> str:
+    return os.path.join(METRICS_DIR, f"metrics-{os.getpid()}.json")
+
+
+def flush_snapshot():
+    """Write this process's histograms to METRICS_DIR."""
+    if not METRICS_DIR or not METRICS_ENABLED:
+        return
+    with _flush_lock:
+        data = {h.name: [[list(labels), series] for labels, series in h.snapshot().items()] for h in HISTOGRAMS}
+        if not any(data.values()):
+            # Nothing recorded (e.g. the server's master process)
+            return
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=METRICS_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, _snapshot_path())
+        except OSError as e:
+            print(f"[ERROR] Could not write metrics snapshot: {e}")
+
+
+def _start_flusher():
+    """Flush this process's snapshot every METRICS_FLUSH_INTERVAL seconds on a daemon thread."""
+    global _flusher_pid
+    if not METRICS_DIR or _flusher_pid == os.getpid():
+        return
+    with _flush_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+
+    def run():
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            flush_snapshot()
+
+    threading.Thread(target=run, name="metrics-flush", daemon=True).start()
+
+
+def _merged_snapshots() -> Dict[str, Dict[Tuple[str, ...], list]]:
+    """Per histogram, series summed over every process's snapshot in METRICS_DIR."""
+    flush_snapshot()
+    merged = {h.name: {} for h in HISTOGRAMS}
+    try:
+        names = [n for n in os.listdir(METRICS_DIR) if n.startswith("metrics-") and n.endswith(".json")]
+    except OSError:
+        names = []
+    # Files of exited workers are kept so the totals never go backwards
+    for name in names:
+        try:
+            with open(os.path.join(METRICS_DIR, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for hist_name, entries in data.items():
+            target = merged.get(hist_name)
+            if target is None:
+                continue
+            for labels, series in entries:
+                current = target.get(tuple(labels))
+                if current is None or len(current) != len(series):
+                    target[tuple(labels)] = list(series)
+                else:
+                    target[tuple(labels)] = [a + b for a, b in zip(current, series)]
+    return merged
+
+
+def render_metrics() -> str:
+    lines = []
+    merged = _merged_snapshots() if METRICS_DIR else {}
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render(merged.get(histogram.name)))
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+def init_app(app, endpoint: str = "/metrics"):
+    """Time every request and serve the histograms at ``endpoint``."""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request_duration(response):
+        started = g.pop("_metrics_started", None)
+        if started is not None:
+            rule = request.url_rule
+            # Unmatched URLs share one label so 404 scans can't blow up the series count
+            route = rule.rule if rule is not None else "<unmatched>"
+            REQUEST_DURATION.observe(time.perf_counter() - started, request.method, route, str(response.status_code))
+        _start_flusher()
+        return response
+
+    def metrics():
+        return Response(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    app.add_url_rule(endpoint, "metrics", metrics)
+    atexit.register(flush_snapshot)
@@ -0,0 +1,111 @@
+"""
+Schema migrations for the auth/profile database (MySQL or SQLite).
+Each migration runs once; applied IDs are recorded in schema_migrations.
+"""
+from typing import Callable, List, Tuple
+
+# (table, index name, columns) created on both backends
+INDEXES = [
+    ("user_sessions", "idx_sessions_expires", ["expires_at"]),
+    ("user_sessions", "idx_sessions_user", ["user_id", "expires_at"]),
+    ("user_profiles", "idx_profiles_user", ["user_id"]),
+    ("users", "idx_users_role_active_created", ["user_role", "is_active", "created_at"]),
+    ("recommendation_history", "idx_history_user_created", ["user_id", "created_at"]),
+    ("job_postings", "idx_jobs_hr_active_created", ["hr_user_id", "is_active", "created_at"]),
+    ("job_postings", "idx_jobs_active_created", ["is_active", "created_at"]),
+    ("resume_modifications", "idx_resume_mods_user_created", ["user_id", "created_at"]),
+]
+
+
+def _table_exists(cursor, is_sqlite: bool, table: str) -> bool:
+    if is_sqlite:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (table,))
+        return cursor.fetchone() is not None
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def _column_exists(cursor, is_sqlite: bool, table: str, column: str) -> bool:
+    if is_sqlite:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return column in [row[1] for row in cursor.fetchall()]
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def _create_index(cursor, is_sqlite: bool, table: str, name: str, columns: List[str]):
+    if not _table_exists(cursor, is_sqlite, table):
+        return
+    if is_sqlite:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+        return
+    # MySQL has no CREATE INDEX IF NOT EXISTS
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, name))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+
+
+def add_user_role_column(cursor, is_sqlite: bool):
+    """users.user_role for databases created before roles existed."""
+    if not _table_exists(cursor, is_sqlite, "users"):
+        return
+    if not _column_exists(cursor, is_sqlite, "users", "user_role"):
+        print("Migrating: Adding user_role column to users table...")
+        column_type = "TEXT" if is_sqlite else "VARCHAR(20)"
+        cursor.execute(f"ALTER TABLE users ADD COLUMN user_role {column_type} DEFAULT 'student'")
+        # Update existing rows to have 'student' as default
+        cursor.execute("UPDATE users SET user_role = 'student' WHERE user_role IS NULL")
+        print("Migration completed: user_role column added")
+
+
+def create_indexes(cursor, is_sqlite: bool):
+    """Secondary indexes for the columns the app filters and orders by."""
+    for table, name, columns in INDEXES:
+        _create_index(cursor, is_sqlite, table, name, columns)
+
+
+# Append only; never renumber
+MIGRATIONS: List[Tuple[str, Callable]] = [
+    ("0001_user_role", add_user_role_column),
+    ("0002_secondary_indexes", create_indexes),
+]
+
+
+def run_migrations(cursor, is_sqlite: bool) -> List[str]:
+    """Apply pending migrations in order; returns the IDs applied now."""
+    if is_sqlite:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                id TEXT PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    else:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                id VARCHAR(64) PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    cursor.execute("SELECT id FROM schema_migrations")
+    applied = {row[0] for row in cursor.fetchall()}
+
+    placeholder = "?" if is_sqlite else "%s"
+    newly_applied = []
+    for migration_id, migrate in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        migrate(cursor, is_sqlite)
+        cursor.execute(f"INSERT INTO schema_migrations (id) VALUES ({placeholder})", (migration_id,))
+        newly_applied.append(migration_id)
+        print(f"Applied migration {migration_id}")
+    return newly_applied
@@ -1,13 +1,31 @@
-import spacy
 import re
+import threading
 from pathlib import Path
 
-# load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except Exception:
-    # If not present, user must download separately
-    nlp = None
+from .metrics import timed
+from .services import register_warmup
+
+# spaCy pipeline, loaded on first use; False once loading has failed
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """The spaCy pipeline, or None if spaCy or en_core_web_sm is missing."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                try:
+                    import spacy
+                    _nlp = spacy.load("en_core_web_sm")
+                except Exception:
+                    # If not present, user must download separately
+                    _nlp = False
+    return _nlp or None
+
+
+register_warmup("spacy", get_nlp)
 
 # simple skills list for keyword matching (extendable)
 BASE_SKILLS = [
@@ -86,8 +104,10 @@ def extract_profile_summary(text, max_sent=3):
     valid_sents = [s for s in sents if len(s) > 10][:max_sent]
     return " ".join(valid_sents)[:500]
 
+@timed("skill_extraction")
 def extract_skills_and_summary(text):
     skills = set()
+    nlp = get_nlp()
     if nlp:
         doc = nlp(text)
         # Use noun chunks + entities as candidate phrases to match skills
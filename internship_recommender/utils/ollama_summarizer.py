@@ -1,9 +1,16 @@
+import os
 import requests
 import json
 import time
 
+from .metrics import timed
+from .services import LazyService
+
+# Ollama server used by every Ollama client in utils (summarizer, chatbot, RAG educator, resume editor)
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
+
 class OllamaSummarizer:
-    def __init__(self, model="tinyllama", base_url="http://localhost:11434"):
+    def __init__(self, model="tinyllama", base_url=OLLAMA_BASE_URL):
         self.model = model
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
@@ -16,6 +23,7 @@ class OllamaSummarizer:
         except:
             return False
 
+    @timed("llm.ollama_summarize")
     def summarize_resume(self, resume_text, max_length=500):
         """Generate a professional profile summary using Ollama"""
         if not self.is_available():
@@ -107,5 +115,5 @@ Summary:"""
         valid_sents = [s for s in sents if len(s) > 10][:3]
         return " ".join(valid_sents)[:max_length]
 
-# Global instance
-summarizer = OllamaSummarizer()
+# Global instance (built on first use)
+summarizer = LazyService("summarizer", OllamaSummarizer)
@@ -0,0 +1,122 @@
+"""
+Pre-fork loading for servers that fork workers from a preloaded app
+(gunicorn with preload_app; see gunicorn.conf.py).
+
+begin() runs early in the master and pauses the garbage collector.
+preload() then loads the read-only models and indexes once, in the master,
+and freezes them with gc.freeze(), so every worker shares those pages
+copy-on-write instead of loading its own copy. after_fork() runs in each
+worker: it re-creates state that must not cross a fork (DB connections,
+HTTP clients, thread and process pools) and turns the collector back on.
+"""
+import gc
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import services
+
+PREFORK_ENABLED = os.getenv("PREFORK_LOAD", "1").lower() in ("1", "true", "yes")
+# Warm-up steps run in the master. Only read-only state belongs here: db and
+# gemini_service hold sockets/gRPC channels and are built per worker.
+PREFORK_WARMUP = [n.strip() for n in os.getenv(
+    "PREFORK_WARMUP", "spacy,salary_model,ats_engine,rag_educator,internship_index"
+).split(",") if n.strip()]
+
+TRAIN_SCRIPT = Path(__file__).resolve().parents[1] / "train_salary_model.py"
+
+_in_master = False
+_torch_threads = None
+
+
+def in_master() -> bool:
+    """True between begin() and fork, i.e. in the process that will fork workers."""
+    return _in_master
+
+
+def begin():
+    """
+    Call as early as possible in the master (before the app is imported):
+    with collection paused, objects built while loading aren't freed into
+    holes that later allocations in the workers would write to.
+    """
+    global _in_master
+    _in_master = True
+    # Tokenizers' Rust thread pool must not be started before forking
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    gc.disable()
+
+
+def _limit_torch_threads():
+    """Keep torch single-threaded in the master; an OpenMP pool started before fork can hang workers."""
+    global _torch_threads
+    if not services.module_available("torch"):
+        return
+    import torch
+    _torch_threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+
+
+def _restore_torch_threads():
+    if _torch_threads is not None:
+        import torch
+        torch.set_num_threads(_torch_threads)
+
+
+def _warm(names: List[str]) -> Dict[str, float]:
+    from . import salary_predictor
+
+    # A background training thread in the master would not survive the fork
+    background = salary_predictor.SALARY_BACKGROUND_TRAINING
+    salary_predictor.SALARY_BACKGROUND_TRAINING = False
+    try:
+        timings = services.warmup(names)
+    finally:
+        salary_predictor.SALARY_BACKGROUND_TRAINING = background
+    if background and salary_predictor.serving_baseline():
+        # Train in a separate process; workers reload the promoted model on their next prediction
+        _start_training_process()
+    return timings
+
+
+def _start_training_process():
+    """Run train_salary_model.py unless another process is already training."""
+    from . import salary_predictor
+
+    pid = salary_predictor.training_pid()
+    if pid is not None:
+        print(f"Salary model training already running (pid {pid})")
+        return
+    # The script claims salary_predictor.TRAINING_PID_FILE itself, so two
+    # masters starting together still train once
+    process = subprocess.Popen([sys.executable, str(TRAIN_SCRIPT)], cwd=str(TRAIN_SCRIPT.parent))
+    print(f"Serving the baseline salary model; training the full model in a subprocess (pid {process.pid})")
+
+
+def preload(names: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Load read-only models and indexes in the master, then freeze everything
+    allocated so far out of the collector. Returns seconds spent per step.
+    """
+    if not _in_master:
+        begin()
+    started = time.perf_counter()
+    _limit_torch_threads()
+    timings = _warm(names or PREFORK_WARMUP)
+    gc.freeze()
+    print(f"[OK] Pre-fork load finished in {time.perf_counter() - started:.2f}s; "
+          f"{gc.get_freeze_count()} objects frozen for copy-on-write sharing")
+    return timings
+
+
+def after_fork():
+    """In a newly forked worker: rebuild per-process state, then resume garbage collection."""
+    global _in_master
+    _in_master = False
+    _restore_torch_threads()
+    services.after_fork()
+    # Frozen objects stay out of collections, so the shared pages aren't touched
+    gc.enable()
@@ -6,14 +6,15 @@ import json
 import os
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+import numpy as np
 import requests
 
-try:
-    from sentence_transformers import SentenceTransformer
-    import numpy as np
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from .ollama_summarizer import OLLAMA_BASE_URL
+from .metrics import timed
+from .services import LazyService, module_available
+from .explainable_ats_engine import load_embedding_model
+
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
 
 
 @dataclass
@@ -32,7 +33,7 @@ class RAGATSEducator:
     Uses vector search to retrieve relevant knowledge and LLM to generate explanations
     """
     
-    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2", ollama_base_url: str = "http://localhost:11434"):
+    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2", ollama_base_url: str = OLLAMA_BASE_URL):
         self.embedding_model_name = embedding_model
         self.embedding_model = None
         self.ollama_base_url = ollama_base_url
@@ -46,7 +47,7 @@ class RAGATSEducator:
         """Load embedding model"""
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.embedding_model = SentenceTransformer(self.embedding_model_name)
+                self.embedding_model = load_embedding_model(self.embedding_model_name)
                 print(f"Loaded RAG embedding model: {self.embedding_model_name}")
             except Exception as e:
                 print(f"Warning: Could not load embedding model: {e}")
@@ -473,6 +474,7 @@ class RAGATSEducator:
             'confidence': float(relevant_chunks[0][1]) if relevant_chunks else 0.0
         }
     
+    @timed("llm.rag_educator")
     def _generate_with_llm(
         self,
         question: str,
@@ -554,6 +556,6 @@ Answer the user's question clearly and concisely based on the provided Context.
         return self.generate_explanation(question, context=context)
 
 
-# Global instance
-rag_educator = RAGATSEducator()
+# Global instance (built on first use)
+rag_educator = LazyService("rag_educator", RAGATSEducator)
 
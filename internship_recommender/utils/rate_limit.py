@@ -0,0 +1,26 @@
+"""
+Rate limiting shared by the outbound fetchers (salary scrapers, course providers).
+"""
+import threading
+import time
+from typing import Optional
+
+
+class HostRateLimiter:
+    """Spaces out requests per key (host or provider); safe to share between worker threads."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str, interval: Optional[float] = None):
+        """Block until ``host`` may be called again; ``interval`` overrides the default spacing."""
+        interval = self.min_interval if interval is None else interval
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -1,8 +1,14 @@
 import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import difflib
-from .skill_graph import rank_missing_skills
+from collections import namedtuple
+from .skill_graph import rank_missing_skills, register_graph_listener
+from .text_index import InvertedIndex
+from .internship_store import get_internship_store
+from .role_resolver import RoleResolver
+from .cache import TTLCache
+from .services import register_warmup
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 SKILLS_FILE = DATA_DIR / "skills.json"
@@ -15,7 +21,148 @@ with open(SKILLS_FILE, "r", encoding="utf-8") as f:
 with open(RESOURCES_FILE, "r", encoding="utf-8") as f:
     RESOURCES = json.load(f)
 
-intern_df = pd.read_csv(INTERNS_CSV)
+
+class InternshipIndex:
+    """
+    Search index over the internship catalog, built once per load.
+    Holds lowercased title/description/location arrays plus per-field
+    token postings, so a query only touches rows sharing a token with it.
+    """
+
+    FIELDS = ("title", "company", "location", "link", "description")
+    # Score per match: role in title / description, location, each skill
+    ROLE_TITLE, ROLE_DESCRIPTION, LOCATION, SKILL = 4, 2, 3, 1
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self.columns = {}
+        for field in self.FIELDS:
+            if field in df.columns:
+                values = df[field].fillna("").astype(str).tolist()
+            else:
+                values = [""] * self.size
+            self.columns[field] = values
+
+        self.title = np.array([t.lower() for t in self.columns["title"]], dtype=object)
+        self.description = np.array([d.lower() for d in self.columns["description"]], dtype=object)
+        self.location = np.array([l.lower() for l in self.columns["location"]], dtype=object)
+
+        self.title_index = InvertedIndex.from_texts(self.title)
+        self.description_index = InvertedIndex.from_texts(self.description)
+        self.location_index = InvertedIndex.from_texts(self.location)
+
+    @staticmethod
+    def _phrase_rows(index: InvertedIndex, texts: np.ndarray, phrase: str) -> np.ndarray:
+        """Rows whose text contains ``phrase``; only token candidates are checked."""
+        rows = index.rows_with_all(phrase)
+        if rows.size == 0:
+            return rows
+        mask = np.fromiter((phrase in texts[i] for i in rows), dtype=bool, count=rows.size)
+        return rows[mask]
+
+    def score(self, role_kw: str, loc_kw: str, skills_l) -> np.ndarray:
+        """Score every row: role in title (+4) / description (+2), location (+3), +1 per skill."""
+        scores = np.zeros(self.size, dtype=np.int32)
+        if role_kw:
+            scores[self._phrase_rows(self.title_index, self.title, role_kw)] += self.ROLE_TITLE
+            scores[self._phrase_rows(self.description_index, self.description, role_kw)] += self.ROLE_DESCRIPTION
+        if loc_kw:
+            scores[self._phrase_rows(self.location_index, self.location, loc_kw)] += self.LOCATION
+
+        skill_rows = {}
+        for s in skills_l:
+            if not s:
+                continue
+            rows = skill_rows.get(s)
+            if rows is None:
+                rows = np.union1d(
+                    self._phrase_rows(self.title_index, self.title, s),
+                    self._phrase_rows(self.description_index, self.description, s),
+                )
+                skill_rows[s] = rows
+            scores[rows] += self.SKILL
+        return scores
+
+    def top_k(self, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Row ids of the best ``top_k`` positive scores, highest first (ties by catalog order)."""
+        return _top_k(np.arange(self.size), scores, top_k)
+
+    def record(self, row: int) -> dict:
+        cols = self.columns
+        return _record(*(cols[f][row] for f in self.FIELDS))
+
+
+def _top_k(ids: np.ndarray, scores: np.ndarray, top_k: int) -> np.ndarray:
+    """The ``top_k`` ids with the best positive scores, highest first (ties by lowest id)."""
+    positive = np.flatnonzero(scores > 0)
+    if top_k <= 0 or positive.size == 0:
+        return ids[:0]
+    if positive.size > top_k:
+        part = np.argpartition(-scores[positive], top_k - 1)[:top_k]
+        positive = positive[part]
+    order = np.lexsort((ids[positive], -scores[positive]))
+    return ids[positive[order]]
+
+
+def _record(title, company, location, link, description) -> dict:
+    return {
+        "title": title,
+        "company": company,
+        "location": location,
+        "link": link,
+        "snippet": description[:300]
+    }
+
+
+def _score_store(store, role_kw: str, loc_kw: str, skills_l, top_k: int) -> list:
+    """
+    Score the ingested catalog like InternshipIndex.score, without loading it.
+    Each phrase is one indexed query returning matching ids; scores are summed
+    over the union of those ids, so nothing outside them can outrank them.
+    """
+    matches = []
+    if role_kw:
+        matches.append((store.match_ids(("title",), role_kw), InternshipIndex.ROLE_TITLE))
+        matches.append((store.match_ids(("description",), role_kw), InternshipIndex.ROLE_DESCRIPTION))
+    if loc_kw:
+        matches.append((store.match_ids(("location",), loc_kw), InternshipIndex.LOCATION))
+    skill_ids = {}
+    for s in skills_l:
+        if not s:
+            continue
+        if s not in skill_ids:
+            skill_ids[s] = store.match_ids(("title", "description"), s)
+        matches.append((skill_ids[s], InternshipIndex.SKILL))
+    if not matches:
+        return []
+
+    all_ids = np.concatenate([ids for ids, _ in matches])
+    weights = np.concatenate([np.full(ids.size, w, dtype=np.int64) for ids, w in matches])
+    ids, inverse = np.unique(all_ids, return_inverse=True)
+    scores = np.bincount(inverse, weights=weights, minlength=ids.size).astype(np.int64)
+    best = _top_k(ids, scores, top_k)
+    return [_record(*row) for row in store.fetch(best).itertuples(index=False)]
+
+# Index over the bundled CSV, built on first use and rebuilt when the file changes
+_csv_index = None
+_csv_index_mtime = None
+
+
+def get_csv_index() -> InternshipIndex:
+    """Return the CSV catalog index, (re)building it if the file changed."""
+    global _csv_index, _csv_index_mtime
+    try:
+        mtime = INTERNS_CSV.stat().st_mtime
+    except OSError:
+        mtime = None
+    if _csv_index is None or mtime != _csv_index_mtime:
+        df = pd.read_csv(INTERNS_CSV) if mtime is not None else pd.DataFrame(columns=InternshipIndex.FIELDS)
+        _csv_index = InternshipIndex(df)
+        _csv_index_mtime = mtime
+    return _csv_index
+
+
+register_warmup("internship_index", get_csv_index)
 
 # Cache for internship skill extraction to improve efficiency
 skill_cache = {}
@@ -23,26 +170,34 @@ skill_cache = {}
 # Build a canonical map for skill casing so acronyms (e.g., SQL) are preserved
 # and names match the skill graph nodes.
 CANONICAL_SKILL_MAP = {}
-try:
-    # Known skills from roles
-    for role_values in ROLE_SKILLS.values():
-        for skill in role_values:
-            CANONICAL_SKILL_MAP.setdefault(skill.lower(), skill)
-    # Known skills from graph
-    from .skill_graph import G as _SKILL_GRAPH
-    for node in _SKILL_GRAPH.nodes:
-        CANONICAL_SKILL_MAP.setdefault(str(node).lower(), str(node))
-    # Known skills from base extractor list (optional)
+
+
+def _build_canonical_skill_map():
+    """(Re)fill CANONICAL_SKILL_MAP in place; other modules import the dict itself."""
+    CANONICAL_SKILL_MAP.clear()
     try:
-        from .ner_extractor import BASE_SKILLS as _BASE_SKILLS
-        for base_skill in _BASE_SKILLS:
-            # Prefer already-known canonical casing if present
-            CANONICAL_SKILL_MAP.setdefault(base_skill.lower(), base_skill.title() if base_skill.islower() else base_skill)
+        # Known skills from roles
+        for role_values in ROLE_SKILLS.values():
+            for skill in role_values:
+                CANONICAL_SKILL_MAP.setdefault(skill.lower(), skill)
+        # Known skills from graph
+        from .skill_graph import G as _SKILL_GRAPH
+        for node in _SKILL_GRAPH.nodes:
+            CANONICAL_SKILL_MAP.setdefault(str(node).lower(), str(node))
+        # Known skills from base extractor list (optional)
+        try:
+            from .ner_extractor import BASE_SKILLS as _BASE_SKILLS
+            for base_skill in _BASE_SKILLS:
+                # Prefer already-known canonical casing if present
+                CANONICAL_SKILL_MAP.setdefault(base_skill.lower(), base_skill.title() if base_skill.islower() else base_skill)
+        except Exception:
+            pass
     except Exception:
+        # In case of any import-time issues, keep map minimal
         pass
-except Exception:
-    # In case of any import-time issues, keep map minimal
-    CANONICAL_SKILL_MAP = CANONICAL_SKILL_MAP or {}
+
+
+_build_canonical_skill_map()
 
 
 def _canonicalize_pretty(skill: str) -> str:
@@ -55,184 +210,173 @@ def _canonicalize_pretty(skill: str) -> str:
         return ""
     return CANONICAL_SKILL_MAP.get(key, skill.title())
 
+# alias-based mapping to improve matching across common variants
+ROLE_ALIASES = {
+    "software developer": "Software Engineer",
+    "software dev": "Software Engineer",
+    "software eng": "Software Engineer",
+    "python dev": "Python Developer",
+    "python developer": "Python Developer",
+    "frontend dev": "Frontend Developer",
+    "frontend developer": "Frontend Developer",
+    "front end": "Frontend Developer",
+    "backend dev": "Backend Developer",
+    "backend developer": "Backend Developer",
+    "full stack dev": "Full Stack Developer",
+    "full stack developer": "Full Stack Developer",
+    "mobile dev": "Mobile App Developer",
+    "mobile developer": "Mobile App Developer",
+    "game dev": "Game Developer",
+    "game developer": "Game Developer",
+    "blockchain dev": "Blockchain Developer",
+    "blockchain developer": "Blockchain Developer",
+    "ai dev": "AI Engineer",
+    "ai developer": "AI Engineer",
+    "ai engineer": "AI Engineer",
+    "ml engineer": "Machine Learning Engineer",
+    "ml dev": "Machine Learning Engineer",
+    "machine learning engineer": "Machine Learning Engineer",
+    "devops dev": "DevOps Engineer",
+    "devops engineer": "DevOps Engineer",
+    "cloud dev": "Cloud Engineer",
+    "cloud engineer": "Cloud Engineer",
+    "qa dev": "QA Engineer",
+    "qa engineer": "QA Engineer",
+    "test engineer": "QA Engineer",
+    "ui designer": "UI Designer",
+    "ux designer": "UX Designer",
+    "ui ux": "UI UX Designer",
+    "ui/ux": "UI UX Designer",
+    "data science": "Data Scientist",
+    "data scientist": "Data Scientist",
+    "data analyst": "Data Analyst"
+}
+
+ROLE_RESOLVER = RoleResolver(ROLE_SKILLS.keys(), ROLE_ALIASES)
+
+
 def find_best_role(role_input):
     """
     Return the best matching role key from ROLE_SKILLS (case-insensitive, substring, fuzzy).
     If nothing matches, return None.
+    Resolution is memoized by ROLE_RESOLVER, so repeat inputs are a cache hit.
     """
     if not role_input:
         return None
-    role_input = role_input.strip().lower()
-
-    # exact / case insensitive
-    for k in ROLE_SKILLS.keys():
-        if k.lower() == role_input:
-            return k
-
-    # substring (user typed 'python dev' or 'python developer' vs 'Python Developer')
-    for k in ROLE_SKILLS.keys():
-        if role_input in k.lower() or k.lower() in role_input:
-            return k
-
-    # alias-based mapping to improve matching across common variants
-    # Check for exact alias matches first (most specific)
-    ROLE_ALIASES = {
-        "software developer": "Software Engineer",
-        "software dev": "Software Engineer", 
-        "software eng": "Software Engineer",
-        "python dev": "Python Developer",
-        "python developer": "Python Developer",
-        "frontend dev": "Frontend Developer",
-        "frontend developer": "Frontend Developer",
-        "front end": "Frontend Developer",
-        "backend dev": "Backend Developer",
-        "backend developer": "Backend Developer",
-        "full stack dev": "Full Stack Developer",
-        "full stack developer": "Full Stack Developer",
-        "mobile dev": "Mobile App Developer",
-        "mobile developer": "Mobile App Developer",
-        "game dev": "Game Developer",
-        "game developer": "Game Developer",
-        "blockchain dev": "Blockchain Developer",
-        "blockchain developer": "Blockchain Developer",
-        "ai dev": "AI Engineer",
-        "ai developer": "AI Engineer",
-        "ai engineer": "AI Engineer",
-        "ml engineer": "Machine Learning Engineer",
-        "ml dev": "Machine Learning Engineer",
-        "machine learning engineer": "Machine Learning Engineer",
-        "devops dev": "DevOps Engineer",
-        "devops engineer": "DevOps Engineer",
-        "cloud dev": "Cloud Engineer",
-        "cloud engineer": "Cloud Engineer",
-        "qa dev": "QA Engineer",
-        "qa engineer": "QA Engineer",
-        "test engineer": "QA Engineer",
-        "ui designer": "UI Designer",
-        "ux designer": "UX Designer",
-        "ui ux": "UI UX Designer",
-        "ui/ux": "UI UX Designer",
-        "data science": "Data Scientist",
-        "data scientist": "Data Scientist",
-        "data analyst": "Data Analyst"
-    }
-    
-    # Check for exact alias matches first
-    for alias, target in ROLE_ALIASES.items():
-        if role_input == alias:
-            return target
-    
-    # Then check for partial alias matches
-    for alias, target in ROLE_ALIASES.items():
-        if alias in role_input:
-            return target
-
-    # fuzzy match using difflib
-    candidates = [k.lower() for k in ROLE_SKILLS.keys()]
-    matches = difflib.get_close_matches(role_input, candidates, n=1, cutoff=0.6)
-    if matches:
-        # find original key whose lower() == matches[0]
-        lower_to_key = {k.lower(): k for k in ROLE_SKILLS.keys()}
-        return lower_to_key[matches[0]]
-
-    return None
+    return ROLE_RESOLVER.resolve(role_input.strip().lower())
 
-def analyze_skill_gap(extracted_skills, role_input):
+# Immutable skill-gap result shared by every caller with the same (skills, role)
+SkillGapResult = namedtuple("SkillGapResult", ["have", "missing", "ranked_missing"])
+
+SKILL_GAP_CACHE_SIZE = 4096
+_skill_gap_cache = TTLCache(maxsize=SKILL_GAP_CACHE_SIZE)
+_EMPTY_GAP = SkillGapResult((), (), ())
+
+
+def invalidate_skill_gap_cache():
+    """Drop memoized skill gaps (role table or skill graph changed)."""
+    _skill_gap_cache.clear()
+
+
+register_graph_listener(invalidate_skill_gap_cache)
+
+
+def reload_role_skills():
     """
-    Returns: (have_pretty, missing_pretty, ranked_missing)
-    - have_pretty: list of skills from role that user already has
-    - missing_pretty: list of required skills user misses
-    - ranked_missing: missing skills ordered by importance via skill graph
+    Re-read skills.json and rebuild everything derived from it:
+    the canonical skill map, the role resolver and the skill-gap cache.
     """
-    try:
-        # Handle None or empty inputs
-        if not extracted_skills or not role_input:
-            return [], [], []
+    global ROLE_RESOLVER
+    with open(SKILLS_FILE, "r", encoding="utf-8") as f:
+        role_skills = json.load(f)
+    ROLE_SKILLS.clear()
+    ROLE_SKILLS.update(role_skills)
+    _build_canonical_skill_map()
+    ROLE_RESOLVER = RoleResolver(ROLE_SKILLS.keys(), ROLE_ALIASES)
+    invalidate_skill_gap_cache()
 
-        # normalize extracted skills set
-        extracted = {s.lower().strip() for s in extracted_skills if isinstance(s, str)}
 
-        # find best role key
-        role_key = find_best_role(role_input)
-        if role_key is None:
-            # Extract skills from role_input for unknown roles
-            from .ner_extractor import extract_skills_and_summary
-            req_skills, _ = extract_skills_and_summary(role_input)
-            req_set = {r.lower().strip() for r in req_skills}
-        else:
-            req = ROLE_SKILLS.get(role_key, [])
-            req_set = {r.lower().strip() for r in req}
+def get_skill_gap(extracted_skills, role_input) -> SkillGapResult:
+    """
+    Memoized skill gap keyed by (frozenset of canonical skill ids, role key).
+    Returns an immutable SkillGapResult of tuples; repeat profiles are a dict lookup.
+    """
+    # Handle None or empty inputs
+    if not extracted_skills or not role_input:
+        return _EMPTY_GAP
 
-        # compute intersection relative to required skills (so have = required ∩ extracted)
-        have = [r for r in req_set if r in extracted]
-        missing = [r for r in req_set if r not in extracted]
+    # normalize extracted skills set
+    extracted = frozenset(s.lower().strip() for s in extracted_skills if isinstance(s, str))
 
-        have_pretty = [_canonicalize_pretty(h) for h in have]
-        missing_pretty = [_canonicalize_pretty(m) for m in missing]
+    # find best role key; unknown roles are keyed by their text
+    role_key = find_best_role(role_input)
+    cache_key = (extracted, role_key or ("text", role_input.strip().lower()))
+    cached = _skill_gap_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-        # ranked missing uses title-cased have and missing as skill_graph expects readable names
-        # Handle empty missing skills
-        if not missing_pretty:
-            ranked_missing = []
-        else:
-            ranked_missing = rank_missing_skills(have_pretty, missing_pretty)
+    if role_key is None:
+        # Extract skills from role_input for unknown roles
+        from .ner_extractor import extract_skills_and_summary
+        req_skills, _ = extract_skills_and_summary(role_input)
+        req_set = {r.lower().strip() for r in req_skills}
+    else:
+        req = ROLE_SKILLS.get(role_key, [])
+        req_set = {r.lower().strip() for r in req}
 
-        return have_pretty, missing_pretty, ranked_missing
+    # compute intersection relative to required skills (so have = required ∩ extracted)
+    have = [r for r in req_set if r in extracted]
+    missing = [r for r in req_set if r not in extracted]
+
+    have_pretty = [_canonicalize_pretty(h) for h in have]
+    missing_pretty = [_canonicalize_pretty(m) for m in missing]
+
+    # ranked missing uses title-cased have and missing as skill_graph expects readable names
+    ranked_missing = rank_missing_skills(have_pretty, missing_pretty) if missing_pretty else []
+
+    result = SkillGapResult(tuple(have_pretty), tuple(missing_pretty), tuple(ranked_missing))
+    _skill_gap_cache.set(cache_key, result)
+    return result
+
+
+def analyze_skill_gap(extracted_skills, role_input):
+    """
+    Returns: (have_pretty, missing_pretty, ranked_missing)
+    - have_pretty: list of skills from role that user already has
+    - missing_pretty: list of required skills user misses
+    - ranked_missing: missing skills ordered by importance via skill graph
+    Lists are fresh copies of the cached result, so callers may mutate them.
+    """
+    try:
+        gap = get_skill_gap(extracted_skills, role_input)
+        return list(gap.have), list(gap.missing), list(gap.ranked_missing)
     except Exception as e:
         # Log the error and return empty lists to prevent app crash
         print(f"Error in analyze_skill_gap: {e}")
         return [], [], []
 
+
 def recommend_internships_from_profile(skills, role_input, location, top_k=5):
     """
     Fallback local CSV-based recommender.
     Score by: role match (strong), location match, plus skill matches.
     """
-    df = intern_df.copy()
-    df["title"] = df["title"].astype(str)
-    df["description"] = df["description"].astype(str)
-    df["location"] = df["location"].astype(str)
-
     # choose role keyword: use fuzzy-matched role if available
-    best_role = find_best_role(role_input) or role_input
+    best_role = find_best_role(role_input) or role_input or ""
     role_kw = best_role.lower()
     loc_kw = (location or "").lower()
 
     skills_l = [s.lower() for s in skills if isinstance(s, str)]
 
-    def row_score(r):
-        score = 0
-        title = r["title"].lower()
-        desc = r["description"].lower()
-        loc = r["location"].lower()
-        # strong weight for explicit role keyword in title/description
-        if role_kw and role_kw in title:
-            score += 4
-        if role_kw and role_kw in desc:
-            score += 2
-        # location match
-        if loc_kw and loc_kw in loc:
-            score += 3
-        # skills matches (each skill match adds 1)
-        for s in skills_l:
-            if s and (s in title or s in desc):
-                score += 1
-        return score
-
-    df["score"] = df.apply(row_score, axis=1)
-    df = df[df["score"] > 0].sort_values("score", ascending=False)
-
-    results = []
-    for _, row in df.head(top_k).iterrows():
-        results.append({
-            "title": row["title"],
-            "company": row.get("company", "") or "",
-            "location": row.get("location", "") or "",
-            "link": row.get("link", "") or "",
-            "snippet": (row.get("description", "") or "")[:300]
-        })
-
-    return results
+    # Prefer the ingested catalog; it is queried live so refreshes need no restart
+    store = get_internship_store()
+    if store.version() > 0:
+        return _score_store(store, role_kw, loc_kw, skills_l, top_k)
+
+    index = get_csv_index()
+
+    scores = index.score(role_kw, loc_kw, skills_l)
+    return [index.record(row) for row in index.top_k(scores, top_k)]
 
 def analyze_internship_skill_gap(user_skills, internship_description):
     """
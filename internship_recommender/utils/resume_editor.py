@@ -9,6 +9,9 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import json
 
+from .metrics import timed
+from .services import LazyService
+
 try:
     from docx import Document
     from docx.shared import RGBColor, Pt
@@ -24,6 +27,9 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# Same setting as ollama_summarizer.OLLAMA_BASE_URL; read here so this module works without requests
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
+
 
 @dataclass
 class ResumeSection:
@@ -50,7 +56,7 @@ class ResumeEditor:
     AI-powered resume editor using Ollama
     """
     
-    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "tinyllama"):
+    def __init__(self, ollama_url: str = OLLAMA_BASE_URL, model: str = "tinyllama"):
         """
         Initialize the resume editor
         
@@ -250,6 +256,7 @@ class ResumeEditor:
             traceback.print_exc()
             return False
     
+    @timed("llm.resume_editor")
     def _call_ollama(self, prompt: str, system_prompt: str = None) -> str:
         """
         Call Ollama API to generate text
@@ -732,5 +739,5 @@ Ensure the output is entirely in ENGLISH."""
                     doc.add_paragraph(line.strip())
 
 
-# Global instance
-resume_editor = ResumeEditor()
+# Global instance (built on first use)
+resume_editor = LazyService("resume_editor", ResumeEditor)
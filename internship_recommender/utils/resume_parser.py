@@ -1,7 +1,9 @@
-import pdfplumber
-import docx
+from .metrics import timed
+
+# pdfplumber and python-docx are imported per call (cached after the first) to keep startup fast
 
 def extract_text_from_pdf(path):
+    import pdfplumber
     text = []
     with pdfplumber.open(path) as pdf:
         for page in pdf.pages:
@@ -11,12 +13,14 @@ def extract_text_from_pdf(path):
     return "\n".join(text)
 
 def extract_text_from_docx(path):
+    import docx
     doc = docx.Document(path)
     fullText = []
     for para in doc.paragraphs:
         fullText.append(para.text)
     return "\n".join(fullText)
 
+@timed("resume_parsing")
 def extract_text_from_file(path):
     """Extract text from resume file (PDF, DOCX, or TXT)"""
     try:
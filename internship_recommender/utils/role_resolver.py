@@ -0,0 +1,80 @@
+"""
+Role title resolution for user-typed roles.
+Resolves free text ('python dev', 'data scince') to a known role key via
+exact/alias hash lookups, trigram-narrowed substring checks and a
+trigram-shortlisted fuzzy match, memoizing resolved inputs.
+"""
+import difflib
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from .text_index import TrigramIndex
+
+
+class RoleResolver:
+    """Built once per role table; ``resolve`` expects stripped, lowercased input."""
+
+    def __init__(self, roles: Iterable[str], aliases: Dict[str, str] = None,
+                 cache_size: int = 4096, fuzzy_shortlist: int = 64):
+        self.roles = list(roles)
+        self.role_lower = [k.lower() for k in self.roles]
+        self.exact = {}
+        for key, lower in zip(self.roles, self.role_lower):
+            self.exact.setdefault(lower, key)
+        self.lower_to_key = {lower: key for key, lower in zip(self.roles, self.role_lower)}
+        self.role_trigrams = TrigramIndex(self.role_lower)
+
+        self.aliases = {a.lower(): t for a, t in (aliases or {}).items()}
+        self.alias_list = list(self.aliases)
+        self.alias_trigrams = TrigramIndex(self.alias_list)
+
+        self.fuzzy_shortlist = fuzzy_shortlist
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _first_substring_role(self, text: str) -> Optional[int]:
+        """Earliest role where ``text in role`` or ``role in text``."""
+        candidates = self.role_trigrams.containing(text) | self.role_trigrams.contained_in(text)
+        for role_id in sorted(candidates):
+            lower = self.role_lower[role_id]
+            if text in lower or lower in text:
+                return role_id
+        return None
+
+    def _first_partial_alias(self, text: str) -> Optional[str]:
+        for alias_id in sorted(self.alias_trigrams.contained_in(text)):
+            alias = self.alias_list[alias_id]
+            if alias in text:
+                return alias
+        return None
+
+    def _fuzzy_role(self, text: str) -> Optional[str]:
+        if len(text) < 3:
+            pool = self.role_lower
+        else:
+            pool = [self.role_lower[i] for i in self.role_trigrams.similar(text, self.fuzzy_shortlist)]
+        matches = difflib.get_close_matches(text, pool, n=1, cutoff=0.6)
+        if matches:
+            return self.lower_to_key[matches[0]]
+        return None
+
+    def _resolve(self, role_input: str) -> Optional[str]:
+        if not role_input:
+            return None
+
+        # exact / case insensitive
+        if role_input in self.exact:
+            return self.exact[role_input]
+
+        # substring (user typed 'python dev' or 'python developer' vs 'Python Developer')
+        role_id = self._first_substring_role(role_input)
+        if role_id is not None:
+            return self.roles[role_id]
+
+        # exact alias, then partial alias
+        if role_input in self.aliases:
+            return self.aliases[role_input]
+        alias = self._first_partial_alias(role_input)
+        if alias is not None:
+            return self.aliases[alias]
+
+        return self._fuzzy_role(role_input)
@@ -0,0 +1,121 @@
+"""
+Precomputed salary predictions over the model's small integer feature space.
+The salary model only sees (skills_count, experience, role_encoded) plus
+terms derived from them, so every reachable input can be predicted (and
+explained) once and then served by array indexing.
+Enable with SALARY_GRID=1.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .services import module_available
+
+# shap is imported only when a grid is built
+SHAP_AVAILABLE = module_available("shap")
+
+SALARY_GRID_ENABLED = os.getenv("SALARY_GRID", "0").lower() in ("1", "true", "yes")
+GRID_MAX_SKILLS = int(os.getenv("SALARY_GRID_MAX_SKILLS", 40))
+GRID_MAX_YEARS = int(os.getenv("SALARY_GRID_MAX_YEARS", 20))
+
+
+def feature_rows(skills_count, experience, role_encoded) -> np.ndarray:
+    """Model feature matrix for (broadcastable) arrays of the three raw inputs."""
+    skills_count, experience, role_encoded = np.broadcast_arrays(
+        np.asarray(skills_count, dtype=float),
+        np.asarray(experience, dtype=float),
+        np.asarray(role_encoded, dtype=float),
+    )
+    return np.column_stack([
+        skills_count.ravel(),
+        experience.ravel(),
+        role_encoded.ravel(),
+        experience.ravel() ** 2,
+        (skills_count * experience).ravel(),
+    ])
+
+
+class SalaryGrid:
+    """
+    Predictions (and SHAP values, when available) for every
+    role x 0..max_skills x 0..max_years combination.
+    """
+
+    def __init__(self, model_data: Dict, max_skills: int = GRID_MAX_SKILLS,
+                 max_years: int = GRID_MAX_YEARS, with_shap: bool = True):
+        model = model_data['model']
+        label_encoder = model_data.get('label_encoder')
+        n_roles = max(len(getattr(label_encoder, 'classes_', [])), 1)
+        self.shape = (n_roles, max_skills + 1, max_years + 1)
+
+        roles, skills, years = np.meshgrid(
+            np.arange(n_roles), np.arange(max_skills + 1), np.arange(max_years + 1), indexing='ij'
+        )
+        features = feature_rows(skills, years, roles)
+
+        self.predictions = model.predict(features).astype(np.float32).reshape(self.shape)
+        self.shap_values = None
+        if with_shap and SHAP_AVAILABLE:
+            try:
+                import shap
+                values = shap.TreeExplainer(model).shap_values(features)
+                if isinstance(values, list):
+                    values = values[0]
+                self.shap_values = np.asarray(values, dtype=np.float32).reshape(self.shape + (features.shape[1],))
+            except Exception as e:
+                print(f"SHAP grid precompute failed: {e}; explanations will use the live model")
+
+    def _index(self, skills_count, experience, role_encoded) -> Optional[Tuple[int, int, int]]:
+        if float(experience) != int(experience):
+            return None
+        idx = (int(role_encoded), int(skills_count), int(experience))
+        if all(0 <= i < n for i, n in zip(idx, self.shape)):
+            return idx
+        return None
+
+    def predict(self, skills_count, experience, role_encoded) -> Optional[float]:
+        """Grid prediction, or None when the input falls outside the grid."""
+        idx = self._index(skills_count, experience, role_encoded)
+        return None if idx is None else float(self.predictions[idx])
+
+    def explain(self, skills_count, experience, role_encoded) -> Optional[Tuple[float, np.ndarray]]:
+        """(prediction, shap row) from the grid, or None on a miss."""
+        if self.shap_values is None:
+            return None
+        idx = self._index(skills_count, experience, role_encoded)
+        if idx is None:
+            return None
+        return float(self.predictions[idx]), self.shap_values[idx]
+
+    @property
+    def nbytes(self) -> int:
+        total = self.predictions.nbytes
+        if self.shap_values is not None:
+            total += self.shap_values.nbytes
+        return total
+
+
+_grids = {}
+_grid_lock = threading.Lock()
+
+
+def get_salary_grid(model_path: Path, model_data: Dict, mtime: float) -> Optional[SalaryGrid]:
+    """
+    Shared grid for a model file, rebuilt when the file changes.
+    Returns None unless SALARY_GRID is enabled.
+    """
+    if not SALARY_GRID_ENABLED or not model_data:
+        return None
+    key = str(model_path)
+    with _grid_lock:
+        cached = _grids.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        print("Precomputing salary grid...")
+        grid = SalaryGrid(model_data)
+        _grids[key] = (mtime, grid)
+        print(f"Salary grid ready: {grid.shape} ({grid.nbytes / 1024:.0f} KB)")
+        return grid
@@ -1,142 +1,394 @@
+import hashlib
+import json
 import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import mean_absolute_error, r2_score
 import joblib
 from .salary_scraper import create_comprehensive_salary_dataset
+from .salary_grid import get_salary_grid
+from .metrics import timed
+from .services import register_warmup
 
+# The artifact being served; versioned artifacts are promoted onto it
 MODEL_PATH = Path(__file__).resolve().parents[1] / "models" / "salary_model.pkl"
+ARTIFACT_DIR = MODEL_PATH.parent / "salary"
 SAMPLE_DATA = Path(__file__).resolve().parents[1] / "data" / "salary_sample.csv"
+# PID of the process running a full training; shared by every worker and master
+TRAINING_PID_FILE = ARTIFACT_DIR / "training.pid"
 
-def ensure_trained_model():
-    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if MODEL_PATH.exists():
-        return
-    
-    print("Training salary prediction model with scraped data...")
-    
-    # Create comprehensive dataset using web scraping
-    roles = [
-        "python developer", "data scientist", "frontend developer", 
-        "software engineer", "data analyst", "ui ux designer",
-        "devops engineer", "machine learning engineer", "backend developer",
-        "full stack developer", "mobile app developer", "qa engineer"
-    ]
-    
+# Train a full model in the background when only a baseline is available
+SALARY_BACKGROUND_TRAINING = os.getenv("SALARY_BACKGROUND_TRAINING", "1").lower() in ("1", "true", "yes")
+
+FEATURE_COLUMNS = ["skills_count", "experience", "role_encoded", "experience_squared", "skills_experience_interaction"]
+TRAINING_ROLES = [
+    "python developer", "data scientist", "frontend developer", 
+    "software engineer", "data analyst", "ui ux designer",
+    "devops engineer", "machine learning engineer", "backend developer",
+    "full stack developer", "mobile app developer", "qa engineer"
+]
+
+# (mtime, model_data) of the last loaded model file
+_model_cache = None
+_training_thread = None
+_training_lock = threading.Lock()
+_ensure_lock = threading.Lock()
+
+def _fallback_training_frame():
+    """Built-in salary observations used when scraping fails."""
+    return pd.DataFrame([
+        # Python Developer
+        {"skills_count": 3, "experience": 0, "role": "python developer", "salary": 300000},
+        {"skills_count": 4, "experience": 1, "role": "python developer", "salary": 450000},
+        {"skills_count": 5, "experience": 2, "role": "python developer", "salary": 600000},
+        {"skills_count": 6, "experience": 3, "role": "python developer", "salary": 800000},
+        {"skills_count": 7, "experience": 5, "role": "python developer", "salary": 1200000},
+        
+        # Data Scientist
+        {"skills_count": 4, "experience": 0, "role": "data scientist", "salary": 400000},
+        {"skills_count": 5, "experience": 1, "role": "data scientist", "salary": 600000},
+        {"skills_count": 6, "experience": 2, "role": "data scientist", "salary": 800000},
+        {"skills_count": 7, "experience": 3, "role": "data scientist", "salary": 1100000},
+        {"skills_count": 8, "experience": 5, "role": "data scientist", "salary": 1500000},
+        
+        # Frontend Developer
+        {"skills_count": 3, "experience": 0, "role": "frontend developer", "salary": 250000},
+        {"skills_count": 4, "experience": 1, "role": "frontend developer", "salary": 400000},
+        {"skills_count": 5, "experience": 2, "role": "frontend developer", "salary": 550000},
+        {"skills_count": 6, "experience": 3, "role": "frontend developer", "salary": 700000},
+        {"skills_count": 7, "experience": 5, "role": "frontend developer", "salary": 1000000},
+        
+        # Software Engineer
+        {"skills_count": 4, "experience": 0, "role": "software engineer", "salary": 350000},
+        {"skills_count": 5, "experience": 1, "role": "software engineer", "salary": 500000},
+        {"skills_count": 6, "experience": 2, "role": "software engineer", "salary": 700000},
+        {"skills_count": 7, "experience": 3, "role": "software engineer", "salary": 900000},
+        {"skills_count": 8, "experience": 5, "role": "software engineer", "salary": 1300000},
+        
+        # Data Analyst
+        {"skills_count": 3, "experience": 0, "role": "data analyst", "salary": 300000},
+        {"skills_count": 4, "experience": 1, "role": "data analyst", "salary": 450000},
+        {"skills_count": 5, "experience": 2, "role": "data analyst", "salary": 600000},
+        {"skills_count": 6, "experience": 3, "role": "data analyst", "salary": 750000},
+        {"skills_count": 7, "experience": 5, "role": "data analyst", "salary": 1000000},
+        
+        # UI/UX Designer
+        {"skills_count": 3, "experience": 0, "role": "ui ux designer", "salary": 250000},
+        {"skills_count": 4, "experience": 1, "role": "ui ux designer", "salary": 400000},
+        {"skills_count": 5, "experience": 2, "role": "ui ux designer", "salary": 550000},
+        {"skills_count": 6, "experience": 3, "role": "ui ux designer", "salary": 700000},
+        {"skills_count": 7, "experience": 5, "role": "ui ux designer", "salary": 950000},
+    ])
+
+def collect_training_data(roles=None, location="India"):
+    """Scraped salary dataset for the given roles, or the built-in fallback data."""
     try:
         # Scrape real salary data
-        df = create_comprehensive_salary_dataset(roles, "India")
+        df = create_comprehensive_salary_dataset(roles or TRAINING_ROLES, location)
         print(f"Scraped {len(df)} salary records")
     except Exception as e:
         print(f"Scraping failed, using fallback data: {e}")
-        # Fallback to enhanced sample data
-        df = pd.DataFrame([
-            # Python Developer
-            {"skills_count": 3, "experience": 0, "role": "python developer", "salary": 300000},
-            {"skills_count": 4, "experience": 1, "role": "python developer", "salary": 450000},
-            {"skills_count": 5, "experience": 2, "role": "python developer", "salary": 600000},
-            {"skills_count": 6, "experience": 3, "role": "python developer", "salary": 800000},
-            {"skills_count": 7, "experience": 5, "role": "python developer", "salary": 1200000},
-            
-            # Data Scientist
-            {"skills_count": 4, "experience": 0, "role": "data scientist", "salary": 400000},
-            {"skills_count": 5, "experience": 1, "role": "data scientist", "salary": 600000},
-            {"skills_count": 6, "experience": 2, "role": "data scientist", "salary": 800000},
-            {"skills_count": 7, "experience": 3, "role": "data scientist", "salary": 1100000},
-            {"skills_count": 8, "experience": 5, "role": "data scientist", "salary": 1500000},
-            
-            # Frontend Developer
-            {"skills_count": 3, "experience": 0, "role": "frontend developer", "salary": 250000},
-            {"skills_count": 4, "experience": 1, "role": "frontend developer", "salary": 400000},
-            {"skills_count": 5, "experience": 2, "role": "frontend developer", "salary": 550000},
-            {"skills_count": 6, "experience": 3, "role": "frontend developer", "salary": 700000},
-            {"skills_count": 7, "experience": 5, "role": "frontend developer", "salary": 1000000},
-            
-            # Software Engineer
-            {"skills_count": 4, "experience": 0, "role": "software engineer", "salary": 350000},
-            {"skills_count": 5, "experience": 1, "role": "software engineer", "salary": 500000},
-            {"skills_count": 6, "experience": 2, "role": "software engineer", "salary": 700000},
-            {"skills_count": 7, "experience": 3, "role": "software engineer", "salary": 900000},
-            {"skills_count": 8, "experience": 5, "role": "software engineer", "salary": 1300000},
-            
-            # Data Analyst
-            {"skills_count": 3, "experience": 0, "role": "data analyst", "salary": 300000},
-            {"skills_count": 4, "experience": 1, "role": "data analyst", "salary": 450000},
-            {"skills_count": 5, "experience": 2, "role": "data analyst", "salary": 600000},
-            {"skills_count": 6, "experience": 3, "role": "data analyst", "salary": 750000},
-            {"skills_count": 7, "experience": 5, "role": "data analyst", "salary": 1000000},
-            
-            # UI/UX Designer
-            {"skills_count": 3, "experience": 0, "role": "ui ux designer", "salary": 250000},
-            {"skills_count": 4, "experience": 1, "role": "ui ux designer", "salary": 400000},
-            {"skills_count": 5, "experience": 2, "role": "ui ux designer", "salary": 550000},
-            {"skills_count": 6, "experience": 3, "role": "ui ux designer", "salary": 700000},
-            {"skills_count": 7, "experience": 5, "role": "ui ux designer", "salary": 950000},
-        ])
-    
-    # Save the dataset
-    df.to_csv(SAMPLE_DATA, index=False)
-    
-    # Enhanced feature engineering
-    le = LabelEncoder()
-    df['role_encoded'] = le.fit_transform(df['role'])
+        df = _fallback_training_frame()
+    return df
+
+def data_hash(df):
+    """Stable fingerprint of a training dataset."""
+    columns = [c for c in ("skills_count", "experience", "role", "salary") if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[columns], index=False).values
+    return hashlib.sha256(hashed.tobytes()).hexdigest()[:16]
+
+def prepare_features(df, label_encoder=None):
+    """Feature matrix for a salary dataset; fits a role encoder if none is given."""
+    df = df.copy()
+    if label_encoder is None:
+        from sklearn.preprocessing import LabelEncoder
+        label_encoder = LabelEncoder()
+        df['role_encoded'] = label_encoder.fit_transform(df['role'])
+    else:
+        df['role_encoded'] = label_encoder.transform(df['role'])
     
     # Create additional features
     df['experience_squared'] = df['experience'] ** 2
     df['skills_experience_interaction'] = df['skills_count'] * df['experience']
-    df['seniority_level'] = pd.cut(df['experience'], bins=[-1, 1, 3, 5, 10], labels=[0, 1, 2, 3])
+    return df[FEATURE_COLUMNS], df["salary"], label_encoder
+
+def train_salary_model(df, baseline=False):
+    """
+    Fit the salary model on a dataset.
+    Returns model data ready for save_model_artifact, metrics included.
+    A baseline is a single small forest fitted on all rows, cheap enough for startup.
+    Rows in the retrainer's holdout are never fitted, so holdout MAEs stay honest.
+    """
+    # Imported here: salary_retrainer imports this module
+    from .salary_retrainer import split_holdout
+    # scikit-learn is imported here, not at module level, to keep app startup fast
+    import sklearn
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    df, _ = split_holdout(df)
+    X, y, le = prepare_features(df)
     
-    # Prepare features
-    feature_columns = ["skills_count", "experience", "role_encoded", "experience_squared", "skills_experience_interaction"]
-    X = df[feature_columns]
-    y = df["salary"]
+    if baseline:
+        model = RandomForestRegressor(n_estimators=20, max_depth=6, random_state=42)
+        model.fit(X, y)
+        metrics = {"train_mae": float(mean_absolute_error(y, model.predict(X)))}
+        kind = "baseline"
+    else:
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        
+        # Train ensemble model
+        rf_model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42)
+        gb_model = GradientBoostingRegressor(n_estimators=100, max_depth=6, random_state=42)
+        
+        rf_model.fit(X_train, y_train)
+        gb_model.fit(X_train, y_train)
+        
+        # Evaluate models
+        rf_pred = rf_model.predict(X_test)
+        gb_pred = gb_model.predict(X_test)
+        
+        rf_mae = mean_absolute_error(y_test, rf_pred)
+        gb_mae = mean_absolute_error(y_test, gb_pred)
+        
+        print(f"Random Forest MAE: {rf_mae:,.0f}")
+        print(f"Gradient Boosting MAE: {gb_mae:,.0f}")
+        
+        # Use the better model
+        if rf_mae < gb_mae:
+            model, best_pred = rf_model, rf_pred
+            print("Using Random Forest model")
+        else:
+            model, best_pred = gb_model, gb_pred
+            print("Using Gradient Boosting model")
+        
+        metrics = {
+            "rf_mae": float(rf_mae),
+            "gb_mae": float(gb_mae),
+            "mae": float(mean_absolute_error(y_test, best_pred)),
+            "r2": float(r2_score(y_test, best_pred)) if len(y_test) > 1 else None,
+            "n_train": int(len(X_train)),
+            "n_test": int(len(X_test)),
+        }
+        kind = "trained"
     
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return {
+        'model': model,
+        'label_encoder': le,
+        'feature_columns': FEATURE_COLUMNS,
+        'metadata': {
+            "kind": kind,
+            "model_type": type(model).__name__,
+            "feature_columns": FEATURE_COLUMNS,
+            "roles": [str(r) for r in le.classes_],
+            "metrics": metrics,
+            "data_hash": data_hash(df),
+            "n_rows": int(len(df)),
+            "sklearn_version": sklearn.__version__,
+        }
+    }
+
+def save_model_artifact(model_data, promote=True):
+    """
+    Write model data as a new versioned artifact (plus a JSON metadata sidecar).
+    Promoting makes it the served model; running processes reload it on their next prediction.
+    """
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    version = now.strftime("%Y%m%dT%H%M%S%fZ")
+    model_data['metadata'] = dict(model_data.get('metadata', {}), version=version, created_at=now.isoformat())
+    
+    path = ARTIFACT_DIR / f"salary_model-{version}.pkl"
+    joblib.dump(model_data, path)
+    with open(path.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(model_data['metadata'], f, indent=2)
+    print(f"Model artifact saved to {path}")
     
-    # Train ensemble model
-    rf_model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42)
-    gb_model = GradientBoostingRegressor(n_estimators=100, max_depth=6, random_state=42)
+    if promote:
+        promote_artifact(path)
+    return path
+
+def promote_artifact(path):
+    """Atomically make an artifact the served model."""
+    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=MODEL_PATH.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, MODEL_PATH)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    print(f"Serving salary model {Path(path).name}")
+
+def list_model_artifacts():
+    """Versioned artifacts, newest first."""
+    return sorted(ARTIFACT_DIR.glob("salary_model-*.pkl"), reverse=True)
+
+def load_model_artifact(path):
+    """Model data from an artifact, or None if it is missing, unreadable or incomplete."""
+    try:
+        model_data = joblib.load(path)
+    except Exception as e:
+        print(f"Could not load salary model {Path(path).name}: {e}")
+        return None
+    if not isinstance(model_data, dict) or not all(k in model_data for k in ('model', 'label_encoder', 'feature_columns')):
+        return None
+    return model_data
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def training_pid():
+    """PID of a live process holding the training claim, or None."""
+    try:
+        pid = int(TRAINING_PID_FILE.read_text().strip() or 0)
+    except (OSError, ValueError):
+        return None
+    return pid if pid and _pid_alive(pid) else None
+
+def claim_training():
+    """
+    Atomically record this process as the one running a full training.
+    False if another live process holds the claim; a claim left by a
+    finished or killed run is taken over.
+    """
+    TRAINING_PID_FILE.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(TRAINING_PID_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            pid = training_pid()
+            if pid is not None and pid != os.getpid():
+                return False
+            try:
+                TRAINING_PID_FILE.unlink()
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+def release_training():
+    """Drop this process's training claim."""
+    try:
+        if TRAINING_PID_FILE.read_text().strip() == str(os.getpid()):
+            TRAINING_PID_FILE.unlink()
+    except (OSError, ValueError):
+        pass
+
+def train_and_publish(roles=None, location="India", promote=True):
+    """
+    Full training run: collect data, fit, save a versioned artifact.
+    Returns (None, None) without training if another process is already at it.
+    """
+    if not claim_training():
+        print(f"Salary model training already running (pid {training_pid()})")
+        return None, None
+    try:
+        return _train_and_publish(roles, location, promote)
+    finally:
+        release_training()
+
+def _train_and_publish(roles, location, promote):
+    print("Training salary prediction model with scraped data...")
+    df = collect_training_data(roles, location)
     
-    rf_model.fit(X_train, y_train)
-    gb_model.fit(X_train, y_train)
+    # Save the dataset
+    SAMPLE_DATA.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(SAMPLE_DATA, index=False)
     
-    # Evaluate models
-    rf_pred = rf_model.predict(X_test)
-    gb_pred = gb_model.predict(X_test)
+    # Seed the observation store used by incremental retraining (new rows only)
+    from .salary_retrainer import append_observations
+    append_observations(df)
     
-    rf_mae = mean_absolute_error(y_test, rf_pred)
-    gb_mae = mean_absolute_error(y_test, gb_pred)
+    model_data = train_salary_model(df)
+    return save_model_artifact(model_data, promote=promote), model_data['metadata']
+
+def start_background_training():
+    """Run train_and_publish on a daemon thread (at most one at a time)."""
+    global _training_thread
+    with _training_lock:
+        if _training_thread is not None and _training_thread.is_alive():
+            return _training_thread
+
+        def run():
+            try:
+                train_and_publish()
+            except Exception as e:
+                print(f"Background salary model training failed: {e}")
+
+        _training_thread = threading.Thread(target=run, name="salary-training", daemon=True)
+        _training_thread.start()
+        return _training_thread
+
+def ensure_trained_model():
+    """
+    Make sure a usable salary model is being served without blocking on training.
+    Uses the current artifact, else the newest valid versioned artifact, else a
+    baseline fitted on built-in data; while only a baseline is served, a full
+    training run is started in the background.
+    """
+    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    current = load_model_artifact(MODEL_PATH) if MODEL_PATH.exists() else None
     
-    print(f"Random Forest MAE: {rf_mae:,.0f}")
-    print(f"Gradient Boosting MAE: {gb_mae:,.0f}")
+    if current is None:
+        for path in list_model_artifacts():
+            current = load_model_artifact(path)
+            if current is not None:
+                promote_artifact(path)
+                break
     
-    # Use the better model
-    if rf_mae < gb_mae:
-        model = rf_model
-        print("Using Random Forest model")
-    else:
-        model = gb_model
-        print("Using Gradient Boosting model")
+    if current is None:
+        print("No salary model available; serving a baseline until training finishes")
+        current = train_salary_model(_fallback_training_frame(), baseline=True)
+        save_model_artifact(current)
     
-    # Save model and encoders
-    model_data = {
-        'model': model,
-        'label_encoder': le,
-        'feature_columns': feature_columns
-    }
-    joblib.dump(model_data, MODEL_PATH)
-    print(f"Model saved to {MODEL_PATH}")
+    if current.get('metadata', {}).get('kind') == 'baseline' and SALARY_BACKGROUND_TRAINING:
+        start_background_training()
 
-def predict_salary(skills, role, experience_years=0):
-    if not MODEL_PATH.exists():
+def load_model_data():
+    """Load the model file once, reloading only when it changes on disk."""
+    global _model_cache
+    if _model_cache is None:
+        with _ensure_lock:
+            # First use in this process: serve a model (promoting or training a
+            # baseline if needed) before loading it
+            if _model_cache is None:
+                ensure_trained_model()
+    mtime = MODEL_PATH.stat().st_mtime if MODEL_PATH.exists() else None
+    if _model_cache is not None and _model_cache[0] == mtime:
+        return _model_cache
+    model_data = load_model_artifact(MODEL_PATH) if mtime is not None else None
+    if model_data is None:
         ensure_trained_model()
+        mtime = MODEL_PATH.stat().st_mtime
+        model_data = joblib.load(MODEL_PATH)
+    _model_cache = (mtime, model_data)
+    return _model_cache
 
-    model_data = joblib.load(MODEL_PATH)
+def serving_baseline() -> bool:
+    """Whether the loaded model is the built-in baseline (a full training run is still needed)."""
+    return _model_cache is not None and _model_cache[1].get('metadata', {}).get('kind') == 'baseline'
+
+@timed("salary_prediction")
+def predict_salary(skills, role, experience_years=0):
+    mtime, model_data = load_model_data()
     model = model_data['model']
     label_encoder = model_data['label_encoder']
     feature_columns = model_data['feature_columns']
@@ -151,16 +403,20 @@ def predict_salary(skills, role, experience_years=0):
         # If role not in training data, use average encoding
         role_encoded = 0
 
-    # Create feature vector
-    features = np.array([[
-        skills_count,
-        experience_years,
-        role_encoded,
-        experience_years ** 2,
-        skills_count * experience_years
-    ]])
+    grid = get_salary_grid(MODEL_PATH, model_data, mtime)
+    pred = grid.predict(skills_count, experience_years, role_encoded) if grid else None
 
-    pred = model.predict(features)[0]
+    if pred is None:
+        # Create feature vector
+        features = np.array([[
+            skills_count,
+            experience_years,
+            role_encoded,
+            experience_years ** 2,
+            skills_count * experience_years
+        ]])
+
+        pred = model.predict(features)[0]
 
     # Add confidence intervals based on model uncertainty
     confidence_factor = 0.15  # 15% uncertainty
@@ -168,4 +424,6 @@ def predict_salary(skills, role, experience_years=0):
     high = int(pred * (1 + confidence_factor))
 
     return low, high
-    
\ No newline at end of file
+
+
+register_warmup("salary_model", load_model_data)
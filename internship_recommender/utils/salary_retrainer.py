@@ -0,0 +1,199 @@
+"""
+Incremental salary model retraining.
+New salary observations are appended to a columnar store (one Parquet or
+CSV file per batch). Retraining warm-starts the served forest with extra
+trees fitted on the recent window, or refits on that window when the role
+set changed. A candidate is promoted only if it beats the served model on
+a fixed holdout large enough to compare on.
+"""
+import copy
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+
+from .salary_predictor import (
+    FEATURE_COLUMNS, MODEL_PATH, data_hash, load_model_artifact,
+    prepare_features, save_model_artifact, train_salary_model,
+)
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+OBSERVATIONS_DIR = Path(os.getenv(
+    "SALARY_OBSERVATIONS_DIR", Path(__file__).resolve().parents[1] / "data" / "salary_observations"
+))
+# Trees (or boosting stages) added per warm-start round
+WARM_START_TREES = int(os.getenv("SALARY_WARM_START_TREES", 20))
+# Only observations this recent are used to fit new trees or a refit
+RETRAIN_WINDOW_DAYS = int(os.getenv("SALARY_RETRAIN_WINDOW_DAYS", 90))
+# One in HOLDOUT_MODULUS observations (chosen by content hash) is held out, forever
+HOLDOUT_MODULUS = 5
+MIN_TRAINING_ROWS = 10
+# Without this many holdout rows no candidate is promoted
+MIN_HOLDOUT_ROWS = int(os.getenv("SALARY_MIN_HOLDOUT_ROWS", 5))
+
+OBSERVATION_COLUMNS = ["skills_count", "experience", "role", "salary", "source", "observed_at"]
+KEY_COLUMNS = ["skills_count", "experience", "role", "salary"]
+
+
+def _row_keys(df: pd.DataFrame) -> np.ndarray:
+    """Content hash per observation (independent of source and time)."""
+    return pd.util.hash_pandas_object(df[KEY_COLUMNS], index=False).values
+
+
+def append_observations(df: pd.DataFrame, source: str = None) -> Optional[Path]:
+    """
+    Append a batch of salary observations to the store; returns the batch file,
+    or None if nothing was new. Rows already in the store are skipped, so
+    re-appending the same dataset doesn't skew the retraining window.
+    """
+    if df is None or df.empty:
+        return None
+    batch = pd.DataFrame({
+        "skills_count": df["skills_count"].astype(int),
+        "experience": df["experience"].astype(int),
+        "role": df["role"].astype(str).str.lower().str.strip(),
+        "salary": df["salary"].astype(float),
+        "source": df["source"].fillna(source or "unknown").astype(str) if "source" in df.columns else (source or "unknown"),
+        "observed_at": datetime.now(timezone.utc).isoformat(),
+    })
+    stored = load_observations()
+    if not stored.empty:
+        stored = stored.astype({"skills_count": int, "experience": int, "role": str, "salary": float})
+        batch = batch[~np.isin(_row_keys(batch), _row_keys(stored))]
+        if batch.empty:
+            return None
+
+    OBSERVATIONS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    suffix = ".parquet" if PARQUET_AVAILABLE else ".csv"
+    path = OBSERVATIONS_DIR / f"batch-{stamp}{suffix}"
+    tmp = path.with_name(path.name + ".tmp")
+    if PARQUET_AVAILABLE:
+        batch.to_parquet(tmp, index=False)
+    else:
+        batch.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def load_observations() -> pd.DataFrame:
+    """Every stored observation, oldest batch first."""
+    frames = []
+    for path in sorted(OBSERVATIONS_DIR.glob("batch-*")):
+        if path.suffix == ".parquet":
+            if PARQUET_AVAILABLE:
+                frames.append(pd.read_parquet(path))
+        elif path.suffix == ".csv":
+            frames.append(pd.read_csv(path))
+    if not frames:
+        return pd.DataFrame(columns=OBSERVATION_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def split_holdout(df: pd.DataFrame):
+    """(train, holdout) split that never moves a row: membership depends only on its content."""
+    hashed = _row_keys(df)
+    in_holdout = (hashed % HOLDOUT_MODULUS) == 0
+    return df[~in_holdout], df[in_holdout]
+
+
+def recent_window(df: pd.DataFrame, days: int = RETRAIN_WINDOW_DAYS) -> pd.DataFrame:
+    if not days or df.empty:
+        return df
+    observed = pd.to_datetime(df["observed_at"], utc=True, errors="coerce")
+    cutoff = pd.Timestamp(datetime.now(timezone.utc) - timedelta(days=days))
+    return df[observed >= cutoff]
+
+
+def holdout_mae(model_data: Dict, holdout: pd.DataFrame) -> Optional[float]:
+    """MAE on the holdout, encoding unknown roles the way predict_salary does."""
+    if model_data is None or holdout.empty:
+        return None
+    known = {role: i for i, role in enumerate(model_data["label_encoder"].classes_)}
+    role_encoded = holdout["role"].map(known).fillna(0).to_numpy()
+    skills = holdout["skills_count"].to_numpy(dtype=float)
+    exp = holdout["experience"].to_numpy(dtype=float)
+    X = np.column_stack([skills, exp, role_encoded, exp ** 2, skills * exp])
+    X = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    return float(mean_absolute_error(holdout["salary"], model_data["model"].predict(X)))
+
+
+def _warm_start(current: Dict, train: pd.DataFrame) -> Optional[Dict]:
+    """Copy of the served model with extra trees fitted on ``train``, or None if not possible."""
+    model = current["model"]
+    if not isinstance(model, (RandomForestRegressor, GradientBoostingRegressor)):
+        return None
+    known = set(current["label_encoder"].classes_)
+    if not set(train["role"]).issubset(known):
+        return None
+
+    X, y, _ = prepare_features(train, current["label_encoder"])
+    model = copy.deepcopy(model)
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + WARM_START_TREES)
+    model.fit(X, y)
+
+    candidate = dict(current, model=model)
+    candidate["metadata"] = dict(current.get("metadata", {}), kind="trained", model_type=type(model).__name__)
+    return candidate
+
+
+def retrain(refit: bool = False, promote: bool = True) -> Dict:
+    """
+    One retraining round over the observation store.
+    Returns a report with the mode used, both holdout MAEs and whether the
+    candidate was promoted. The served model is replaced atomically, and
+    running predictors reload it on their next request.
+    """
+    observations = load_observations()
+    train, holdout = split_holdout(observations)
+    window = recent_window(train)
+    report = {"observations": int(len(observations)), "window_rows": int(len(window)),
+              "holdout_rows": int(len(holdout)), "promoted": False}
+    if len(window) < MIN_TRAINING_ROWS:
+        report["mode"] = "skipped"
+        print(f"Only {len(window)} recent salary observations; skipping retrain")
+        return report
+    if len(holdout) < MIN_HOLDOUT_ROWS:
+        report["mode"] = "skipped"
+        print(f"Only {len(holdout)} holdout observations; skipping retrain")
+        return report
+
+    # A baseline is scored like any other model; the candidate must beat it
+    current = load_model_artifact(MODEL_PATH) if MODEL_PATH.exists() else None
+    current_mae = holdout_mae(current, holdout)
+
+    candidate = None if refit or current is None else _warm_start(current, window)
+    report["mode"] = "warm_start" if candidate is not None else "refit"
+    if candidate is None:
+        candidate = train_salary_model(window)
+
+    candidate_mae = holdout_mae(candidate, holdout)
+    report.update(current_mae=current_mae, candidate_mae=candidate_mae)
+    print(f"Salary retrain ({report['mode']}): holdout MAE {current_mae} -> {candidate_mae}")
+
+    # With nothing loadable being served there is nothing to beat
+    improved = current_mae is None or candidate_mae < current_mae
+    if not improved:
+        print("Candidate did not beat the served model; keeping it")
+        return report
+
+    metadata = candidate.setdefault("metadata", {})
+    metadata["parent_version"] = (current or {}).get("metadata", {}).get("version")
+    metadata["retrain_mode"] = report["mode"]
+    metadata["data_hash"] = data_hash(window)
+    metadata["n_rows"] = int(len(window))
+    metadata["metrics"] = dict(metadata.get("metrics", {}), holdout_mae=candidate_mae,
+                               holdout_rows=int(len(holdout)))
+    report["artifact"] = str(save_model_artifact(candidate, promote=promote))
+    report["promoted"] = promote
+    return report
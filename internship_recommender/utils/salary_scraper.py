@@ -1,11 +1,66 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
+import os
 import random
-from typing import List, Dict, Tuple
 import re
-from ddgs import DDGS
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+from .cache import DiskCache
+from .rate_limit import HostRateLimiter
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+SALARY_CACHE_DIR = Path(os.getenv("SALARY_CACHE_DIR", DATA_DIR / "cache" / "salary"))
+# Raw search/HTTP responses are reused for a day, parsed (role, source) records for a week
+SALARY_HTTP_CACHE_TTL = int(os.getenv("SALARY_HTTP_CACHE_TTL", 86400))
+SALARY_DATA_TTL = int(os.getenv("SALARY_DATA_TTL", 7 * 86400))
+SALARY_SCRAPE_WORKERS = int(os.getenv("SALARY_SCRAPE_WORKERS", 8))
+# Minimum seconds between two requests to the same host
+SALARY_HOST_INTERVAL = float(os.getenv("SALARY_HOST_INTERVAL", 1.0))
+SALARY_FIXTURE_PATH = Path(os.getenv("SALARY_FIXTURE_PATH", DATA_DIR / "salary_sample.csv"))
+
+_http_cache = DiskCache(SALARY_CACHE_DIR / "http", ttl=SALARY_HTTP_CACHE_TTL)
+_records_cache = DiskCache(SALARY_CACHE_DIR / "records", ttl=SALARY_DATA_TTL)
+_rate_limiter = HostRateLimiter(SALARY_HOST_INTERVAL)
+
+
+def _ddg_text(query: str, max_results: int = 10) -> List[Dict]:
+    """DuckDuckGo text search through the response cache and rate limiter."""
+    key = ["ddg", query, max_results]
+    cached = _http_cache.get(key)
+    if cached is not None:
+        return cached
+
+    from ddgs import DDGS
+
+    _rate_limiter.wait("duckduckgo.com")
+    with DDGS() as ddgs:
+        results = [
+            {"title": r.get("title", ""), "body": r.get("body", ""), "href": r.get("href", "")}
+            for r in ddgs.text(query, max_results=max_results)
+        ]
+    if results:
+        _http_cache.set(key, results)
+    return results
+
+
+def _http_get_text(url: str, headers: Dict = None, timeout: int = 10) -> Optional[str]:
+    """GET a page through the response cache and rate limiter; None unless status is 200."""
+    key = ["get", url]
+    cached = _http_cache.get(key)
+    if cached is not None:
+        return cached
+
+    _rate_limiter.wait(urlparse(url).netloc)
+    response = requests.get(url, headers=headers, timeout=timeout)
+    if response.status_code != 200:
+        return None
+    _http_cache.set(key, response.text)
+    return response.text
 
 def extract_salary_from_text(text: str) -> List[int]:
     """
@@ -63,36 +118,33 @@ def scrape_salary_from_ddg(role: str, location: str = "India") -> List[Dict]:
             f"{role} experience salary {location}"
         ]
         
-        with DDGS() as ddgs:
-            for query in queries:
-                try:
-                    results = list(ddgs.text(query, max_results=10))
-                    for result in results:
-                        text = f"{result.get('title', '')} {result.get('body', '')}"
-                        extracted_salaries = extract_salary_from_text(text)
-                        
-                        for salary in extracted_salaries:
-                            # Estimate experience based on query context
-                            exp = 0
-                            if 'fresher' in query.lower() or 'entry' in query.lower():
-                                exp = 0
-                            elif 'senior' in query.lower() or 'experienced' in query.lower():
-                                exp = 5
-                            elif 'mid' in query.lower() or '2-3' in query.lower():
-                                exp = 2
-                            else:
-                                exp = random.choice([0, 1, 2, 3, 5])
-                            
-                            salaries.append({
-                                "experience": exp,
-                                "salary": salary,
-                                "source": "ddg_search"
-                            })
+        for query in queries:
+            try:
+                results = _ddg_text(query, max_results=10)
+                for result in results:
+                    text = f"{result.get('title', '')} {result.get('body', '')}"
+                    extracted_salaries = extract_salary_from_text(text)
                     
-                    time.sleep(1)  # Rate limiting
-                except Exception as e:
-                    print(f"Error in DDG query '{query}': {e}")
-                    continue
+                    for salary in extracted_salaries:
+                        # Estimate experience based on query context
+                        exp = 0
+                        if 'fresher' in query.lower() or 'entry' in query.lower():
+                            exp = 0
+                        elif 'senior' in query.lower() or 'experienced' in query.lower():
+                            exp = 5
+                        elif 'mid' in query.lower() or '2-3' in query.lower():
+                            exp = 2
+                        else:
+                            exp = random.choice([0, 1, 2, 3, 5])
+                        
+                        salaries.append({
+                            "experience": exp,
+                            "salary": salary,
+                            "source": "ddg_search"
+                        })
+            except Exception as e:
+                print(f"Error in DDG query '{query}': {e}")
+                continue
                     
     except Exception as e:
         print(f"Error in DDG salary search: {e}")
@@ -113,9 +165,9 @@ def scrape_ambitionbox_salaries(role: str, location: str = "India") -> List[Dict
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
+        html = _http_get_text(url, headers=headers, timeout=10)
+        if html:
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Look for salary information in various formats
             # AmbitionBox typically shows salary ranges
@@ -130,99 +182,54 @@ def scrape_ambitionbox_salaries(role: str, location: str = "India") -> List[Dict
                         "source": "ambitionbox"
                     })
         
-        time.sleep(2)  # Rate limiting
-        
     except Exception as e:
         print(f"Error scraping AmbitionBox: {e}")
     
     return salaries
 
+def _scrape_site_search(site: str, source: str, role: str, location: str) -> List[Dict]:
+    """Salary mentions in search results restricted to one site."""
+    salaries = []
+    results = _ddg_text(f"site:{site} {role} salary {location}", max_results=5)
+    for result in results:
+        text = f"{result.get('title', '')} {result.get('body', '')}"
+        for salary in extract_salary_from_text(text):
+            salaries.append({
+                "experience": 2,
+                "salary": salary,
+                "source": source
+            })
+    return salaries
+
 def scrape_naukri_salary_insights(role: str, location: str = "India") -> List[Dict]:
     """
     Search Naukri.com for salary insights using DuckDuckGo.
     """
-    salaries = []
     try:
-        query = f"site:naukri.com {role} salary {location}"
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=5))
-            for result in results:
-                text = f"{result.get('title', '')} {result.get('body', '')}"
-                extracted = extract_salary_from_text(text)
-                
-                for salary in extracted:
-                    salaries.append({
-                        "experience": 2,
-                        "salary": salary,
-                        "source": "naukri"
-                    })
-        
-        time.sleep(1)
-        
+        return _scrape_site_search("naukri.com", "naukri", role, location)
     except Exception as e:
         print(f"Error scraping Naukri insights: {e}")
-    
-    return salaries
+        return []
 
 def scrape_glassdoor_salaries(role: str, location: str = "India") -> List[Dict]:
     """
-    Attempt to scrape salary data from Glassdoor (with proper headers and error handling).
-    Falls back to search-based approach if direct scraping fails.
+    Search-based salary data from Glassdoor.
     """
-    salaries = []
-    
     try:
-        # Try direct search approach first
-        query = f"site:glassdoor.com {role} salary {location}"
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=5))
-            for result in results:
-                text = f"{result.get('title', '')} {result.get('body', '')}"
-                extracted = extract_salary_from_text(text)
-                
-                for salary in extracted:
-                    salaries.append({
-                        "experience": 2,
-                        "salary": salary,
-                        "source": "glassdoor"
-                    })
-        
-        time.sleep(1)
-        
+        return _scrape_site_search("glassdoor.com", "glassdoor", role, location)
     except Exception as e:
         print(f"Error scraping Glassdoor: {e}")
-    
-    return salaries
+        return []
 
 def scrape_payscale_salaries(role: str, location: str = "India") -> List[Dict]:
     """
     Scrape salary data from PayScale using search-based approach.
     """
-    salaries = []
     try:
-        query = f"site:payscale.com {role} salary {location}"
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=5))
-            for result in results:
-                text = f"{result.get('title', '')} {result.get('body', '')}"
-                extracted = extract_salary_from_text(text)
-                
-                for salary in extracted:
-                    salaries.append({
-                        "experience": 2,
-                        "salary": salary,
-                        "source": "payscale"
-                    })
-        
-        time.sleep(1)
-        
+        return _scrape_site_search("payscale.com", "payscale", role, location)
     except Exception as e:
         print(f"Error scraping PayScale: {e}")
-    
-    return salaries
+        return []
 
 def scrape_indeed_salaries(role: str, location: str = "India") -> List[Dict]:
     """
@@ -236,75 +243,136 @@ def scrape_indeed_salaries(role: str, location: str = "India") -> List[Dict]:
             f"site:indeed.com {role} salary {location}"
         ]
         
-        with DDGS() as ddgs:
-            for query in queries:
-                try:
-                    results = list(ddgs.text(query, max_results=8))
-                    for result in results:
-                        text = f"{result.get('title', '')} {result.get('body', '')}"
-                        extracted = extract_salary_from_text(text)
-                        
-                        for salary in extracted:
-                            # Try to infer experience from job title
-                            exp = 0
-                            title_lower = result.get('title', '').lower()
-                            if 'fresher' in title_lower or 'entry' in title_lower or 'intern' in title_lower:
-                                exp = 0
-                            elif 'senior' in title_lower or 'lead' in title_lower or 'principal' in title_lower:
-                                exp = 5
-                            elif 'mid' in title_lower or '2+' in title_lower or '3+' in title_lower:
-                                exp = 2
-                            else:
-                                exp = random.choice([0, 1, 2, 3])
-                            
-                            salaries.append({
-                                "experience": exp,
-                                "salary": salary,
-                                "source": "indeed"
-                            })
+        for query in queries:
+            try:
+                results = _ddg_text(query, max_results=8)
+                for result in results:
+                    text = f"{result.get('title', '')} {result.get('body', '')}"
+                    extracted = extract_salary_from_text(text)
                     
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"Error in Indeed query: {e}")
-                    continue
+                    for salary in extracted:
+                        # Try to infer experience from job title
+                        exp = 0
+                        title_lower = result.get('title', '').lower()
+                        if 'fresher' in title_lower or 'entry' in title_lower or 'intern' in title_lower:
+                            exp = 0
+                        elif 'senior' in title_lower or 'lead' in title_lower or 'principal' in title_lower:
+                            exp = 5
+                        elif 'mid' in title_lower or '2+' in title_lower or '3+' in title_lower:
+                            exp = 2
+                        else:
+                            exp = random.choice([0, 1, 2, 3])
+                        
+                        salaries.append({
+                            "experience": exp,
+                            "salary": salary,
+                            "source": "indeed"
+                        })
+            except Exception as e:
+                print(f"Error in Indeed query: {e}")
+                continue
         
     except Exception as e:
         print(f"Error scraping Indeed: {e}")
     
     return salaries
 
-def aggregate_salary_data(role: str, location: str = "India") -> pd.DataFrame:
+def fixture_salary_source(role: str, location: str = "India") -> List[Dict]:
     """
-    Aggregate salary data from multiple real-world sources and create a comprehensive dataset.
+    Offline stand-in: rows for the role from the local salary sample,
+    or the built-in fallback progression when the sample has none.
     """
-    all_salaries = []
-    
-    print(f"  Scraping salary data for {role} in {location}...")
-    
-    # Scrape from multiple sources
-    sources = [
-        ("DuckDuckGo Search", scrape_salary_from_ddg),
-        ("AmbitionBox", scrape_ambitionbox_salaries),
-        ("Naukri", scrape_naukri_salary_insights),
-        ("Glassdoor", scrape_glassdoor_salaries),
-        ("PayScale", scrape_payscale_salaries),
-        ("Indeed", scrape_indeed_salaries),
-    ]
-    
-    for source_name, scrape_func in sources:
-        try:
-            print(f"    Trying {source_name}...")
-            source_data = scrape_func(role, location)
-            if source_data:
-                all_salaries.extend(source_data)
-                print(f"    Found {len(source_data)} salary records from {source_name}")
-        except Exception as e:
-            print(f"    Error with {source_name}: {e}")
-            continue
-    
+    try:
+        df = pd.read_csv(SALARY_FIXTURE_PATH)
+        df = df[df['role'].str.lower() == role.lower()]
+        records = [
+            {"experience": int(r['experience']), "salary": int(r['salary']),
+             "company_size": r.get('company_size') or 'mid', "source": "fixture"}
+            for r in df.to_dict('records')
+        ]
+        if records:
+            return records
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Salary fixture unavailable: {e}")
+    return [dict(r, source="fixture") for r in get_fallback_salary_data(role)]
+
+# name -> {"label", "func", "cache"}; "cache" keeps parsed records on disk
+SALARY_SOURCES: Dict[str, Dict] = {}
+LIVE_SALARY_SOURCES = ["ddg", "ambitionbox", "naukri", "glassdoor", "payscale", "indeed"]
+
+def register_salary_source(name: str, func: Callable[[str, str], List[Dict]],
+                           label: str = None, cache: bool = True):
+    """Add or replace a salary source; ``func(role, location)`` returns salary records."""
+    SALARY_SOURCES[name] = {"label": label or name, "func": func, "cache": cache}
+
+register_salary_source("ddg", scrape_salary_from_ddg, "DuckDuckGo Search")
+register_salary_source("ambitionbox", scrape_ambitionbox_salaries, "AmbitionBox")
+register_salary_source("naukri", scrape_naukri_salary_insights, "Naukri")
+register_salary_source("glassdoor", scrape_glassdoor_salaries, "Glassdoor")
+register_salary_source("payscale", scrape_payscale_salaries, "PayScale")
+register_salary_source("indeed", scrape_indeed_salaries, "Indeed")
+register_salary_source("fixture", fixture_salary_source, "Local fixtures", cache=False)
+
+def active_salary_sources() -> List[str]:
+    """Sources named in SALARY_SOURCES (comma separated), default all live scrapers."""
+    names = [n.strip() for n in os.getenv("SALARY_SOURCES", "").split(",") if n.strip()]
+    return [n for n in names if n in SALARY_SOURCES] or list(LIVE_SALARY_SOURCES)
+
+def _records_key(name: str, role: str, location: str) -> List[str]:
+    return ["salary_records", name, role.lower(), location.lower()]
+
+def collect_salary_records(roles: List[str], location: str = "India",
+                           sources: List[str] = None, refresh: bool = False) -> Dict[str, List[Dict]]:
+    """
+    Salary records per role from every source.
+    (role, source) pairs fetched within SALARY_DATA_TTL are reused from disk;
+    only new or expired pairs are scraped, concurrently on a bounded pool.
+    """
+    sources = sources or active_salary_sources()
+    collected = {role: [] for role in roles}
+    pending = []
+    for role in roles:
+        for name in sources:
+            source = SALARY_SOURCES[name]
+            cached = None
+            if source["cache"] and not refresh:
+                cached = _records_cache.get(_records_key(name, role, location))
+            if cached is None:
+                pending.append((role, name))
+            else:
+                collected[role].extend(cached)
+
+    reused = len(roles) * len(sources) - len(pending)
+    print(f"  Salary sources: {reused} (role, source) pairs cached, {len(pending)} to fetch")
+    if not pending:
+        return collected
+
+    with ThreadPoolExecutor(max_workers=max(1, min(SALARY_SCRAPE_WORKERS, len(pending)))) as pool:
+        futures = {
+            pool.submit(SALARY_SOURCES[name]["func"], role, location): (role, name)
+            for role, name in pending
+        }
+        for future in as_completed(futures):
+            role, name = futures[future]
+            source = SALARY_SOURCES[name]
+            try:
+                records = future.result() or []
+            except Exception as e:
+                print(f"    Error with {source['label']} for {role}: {e}")
+                continue
+            if records:
+                print(f"    Found {len(records)} salary records from {source['label']} for {role}")
+                # Empty results are usually failures; retry them next run
+                if source["cache"]:
+                    _records_cache.set(_records_key(name, role, location), records)
+            collected[role].extend(records)
+    return collected
+
+def _build_role_frame(role: str, location: str, all_salaries: List[Dict]) -> pd.DataFrame:
+    """Clean one role's raw salary records and add the derived columns."""
     # If we got real data, use it; otherwise fall back
     if not all_salaries:
-        print(f"    No real salary data found, using fallback data")
+        print(f"    No real salary data found for {role}, using fallback data")
         # Fallback to realistic default data based on role
         all_salaries = get_fallback_salary_data(role)
     
@@ -316,7 +384,7 @@ def aggregate_salary_data(role: str, location: str = "India") -> pd.DataFrame:
     
     # Clean and process the data
     # Remove outliers (salaries outside reasonable range for India: 1L to 50L)
-    df = df[(df['salary'] >= 100000) & (df['salary'] <= 5000000)]
+    df = df[(df['salary'] >= 100000) & (df['salary'] <= 5000000)].copy()
     
     # Group by experience and calculate average salaries
     if 'experience' in df.columns:
@@ -340,6 +408,14 @@ def aggregate_salary_data(role: str, location: str = "India") -> pd.DataFrame:
     
     return df
 
+def aggregate_salary_data(role: str, location: str = "India") -> pd.DataFrame:
+    """
+    Aggregate salary data from multiple real-world sources and create a comprehensive dataset.
+    """
+    print(f"  Scraping salary data for {role} in {location}...")
+    records = collect_salary_records([role], location)[role]
+    return _build_role_frame(role, location, records)
+
 def get_fallback_salary_data(role: str) -> List[Dict]:
     """
     Get fallback salary data based on role type (used when scraping fails).
@@ -390,6 +466,7 @@ def get_fallback_salary_data(role: str) -> List[Dict]:
 def create_comprehensive_salary_dataset(roles: List[str], location: str = "India") -> pd.DataFrame:
     """
     Create a comprehensive salary dataset by scraping real salary data for multiple roles.
+    All (role, source) pairs are collected concurrently; see collect_salary_records.
     """
     all_data = []
     
@@ -397,23 +474,20 @@ def create_comprehensive_salary_dataset(roles: List[str], location: str = "India
     print(f"Location: {location}")
     print(f"Roles to scrape: {len(roles)}\n")
     
+    collected = collect_salary_records(roles, location)
+    
     for i, role in enumerate(roles, 1):
-        print(f"[{i}/{len(roles)}] Processing: {role}")
         try:
-            role_data = aggregate_salary_data(role, location)
+            role_data = _build_role_frame(role, location, collected.get(role, []))
             if not role_data.empty:
                 role_data['role'] = role
                 all_data.append(role_data)
-                print(f"  ✓ Collected {len(role_data)} salary records for {role}\n")
+                print(f"  [{i}/{len(roles)}] ✓ {len(role_data)} salary records for {role}")
             else:
-                print(f"  ⚠ No data collected for {role}, using fallback\n")
+                print(f"  [{i}/{len(roles)}] ⚠ No data collected for {role}")
         except Exception as e:
-            print(f"  ✗ Error processing {role}: {e}\n")
+            print(f"  [{i}/{len(roles)}] ✗ Error processing {role}: {e}")
             continue
-        
-        # Rate limiting between roles
-        if i < len(roles):
-            time.sleep(2)
     
     if all_data:
         combined_df = pd.concat(all_data, ignore_index=True)
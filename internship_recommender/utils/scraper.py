@@ -1,24 +1,127 @@
 # utils/scraper.py
-from ddgs import DDGS
+import os
+import threading
+from abc import ABC, abstractmethod
+
+from .cache import TTLCache, FRESH, STALE
+
+# Seconds a search result is served as-is, then served stale while refreshing
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 900))
+SEARCH_CACHE_STALE_TTL = int(os.getenv("SEARCH_CACHE_STALE_TTL", 3600))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 512))
+
+
+class SearchBackend(ABC):
+    """Interface for internship search providers."""
+
+    name = "base"
+
+    @abstractmethod
+    def search(self, role, location, top_k=5):
+        """Return a list of dictionaries with title, link, snippet"""
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """Live search using DuckDuckGo (ddgs package)."""
+
+    name = "ddg"
+
+    def search(self, role, location, top_k=5):
+        from ddgs import DDGS
+
+        query = f'"{role} internship in {location}"'
+        results = []
+
+        try:
+            with DDGS() as ddgs:
+                for r in ddgs.text(query, max_results=top_k):
+                    results.append({
+                        "title": r.get("title", "No Title"),
+                        "link": r.get("href", "#"),
+                        "snippet": r.get("body", "")
+                    })
+        except Exception as e:
+            print("⚠️ DuckDuckGo scraping failed:", e)
+            return []
+
+        return results
+
+
+class LocalInternshipBackend(SearchBackend):
+    """Offline stand-in that searches the local internship catalog."""
+
+    name = "local"
+
+    def search(self, role, location, top_k=5):
+        from .recommender import recommend_internships_from_profile
+        return recommend_internships_from_profile([], role, location, top_k=top_k)
+
+
+SEARCH_BACKENDS = {
+    DuckDuckGoBackend.name: DuckDuckGoBackend,
+    LocalInternshipBackend.name: LocalInternshipBackend,
+}
+
+_backend = SEARCH_BACKENDS.get(os.getenv("SEARCH_BACKEND", "ddg"), DuckDuckGoBackend)()
+_search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL, stale_ttl=SEARCH_CACHE_STALE_TTL)
+_refreshing = set()
+_refresh_lock = threading.Lock()
+
+
+def set_search_backend(backend: SearchBackend):
+    """Swap the active search backend (e.g. for tests or air-gapped runs)."""
+    global _backend
+    _backend = backend
+    _search_cache.clear()
+
+
+def get_search_backend() -> SearchBackend:
+    return _backend
+
+
+def _cache_key(role, location, top_k):
+    return (" ".join((role or "").lower().split()), " ".join((location or "").lower().split()), int(top_k))
+
+
+def _fetch_and_store(key, role, location, top_k):
+    results = _backend.search(role, location, top_k=top_k)
+    # Failures come back empty; don't pin them in the cache
+    if results:
+        _search_cache.set(key, results)
+    return results
+
+
+def _refresh_in_background(key, role, location, top_k):
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _fetch_and_store(key, role, location, top_k)
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
 
 def ddg_search_internships(role, location, top_k=5):
     """
-    Scrape internships using DuckDuckGo search (ddgs package)
+    Search internships with the configured backend (DuckDuckGo by default).
+    Results are cached per (role, location, top_k); stale entries are served
+    while a background refresh runs.
     Returns a list of dictionaries with title, link, snippet
     """
-    query = f'"{role} internship in {location}"'
-    results = []
-
-    try:
-        with DDGS() as ddgs:
-            for r in ddgs.text(query, max_results=top_k):
-                results.append({
-                    "title": r.get("title", "No Title"),
-                    "link": r.get("href", "#"),
-                    "snippet": r.get("body", "")
-                })
-    except Exception as e:
-        print("⚠️ DuckDuckGo scraping failed:", e)
-        return []
+    key = _cache_key(role, location, top_k)
+    cached, state = _search_cache.lookup(key)
+    if state == STALE:
+        _refresh_in_background(key, role, location, top_k)
+    if state in (FRESH, STALE):
+        results = cached
+    else:
+        results = _fetch_and_store(key, role, location, top_k)
 
-    return results
+    # Callers annotate the dicts in place, so hand out copies
+    return [dict(r) for r in results]
@@ -0,0 +1,170 @@
+"""
+Lazily built, thread-safe service singletons.
+Module-level services (db, ats_engine, rag_educator, ...) are LazyService
+proxies: importing them costs nothing, and the real object is built on first
+attribute access. warmup() builds everything up front for processes that
+would rather pay at boot than on the first request. Modules holding state
+that must not cross a fork (connections, pools) register an after-fork
+handler; see utils/prefork.py.
+"""
+import importlib
+import importlib.util
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# name -> LazyService, in registration order
+_services: Dict[str, "LazyService"] = {}
+# name -> callable for warm-up work that isn't a service (models, indexes)
+_warmers: Dict[str, Callable[[], object]] = {}
+# key -> object shared by several services (e.g. one embedding model)
+_resources: Dict[object, object] = {}
+# name -> callable re-creating fork-unsafe state in a freshly forked worker
+_fork_handlers: Dict[str, Callable[[], None]] = {}
+_registry_lock = threading.Lock()
+
+
+class LazyService:
+    """
+    Proxy that builds its object with ``factory()`` on first use (once, even
+    under concurrent first requests) and forwards attribute access to it.
+    """
+    __slots__ = ("_name", "_factory", "_instance", "_lock", "_on_create")
+
+    def __init__(self, name: str, factory: Callable[[], object]):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.RLock())
+        object.__setattr__(self, "_on_create", [])
+        with _registry_lock:
+            _services[name] = self
+
+    # Methods are underscored so they can't shadow the wrapped object's attributes
+
+    def _build(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+                    print(f"Service '{self._name}' ready in {time.perf_counter() - started:.2f}s")
+                    for callback in self._on_create:
+                        callback(instance)
+        return instance
+
+    def _reset(self):
+        with self._lock:
+            object.__setattr__(self, "_instance", None)
+
+    def __getattr__(self, attr):
+        instance = self._instance
+        if instance is None:
+            instance = self._build()
+        return getattr(instance, attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._build(), attr, value)
+
+    def __repr__(self):
+        state = "ready" if self._instance is not None else "not built"
+        return f"<LazyService {self._name} ({state})>"
+
+
+def get_service(name: str):
+    """The built object behind a service (building it if needed)."""
+    return _services[name]._build()
+
+
+def is_created(name: str) -> bool:
+    return _services[name]._instance is not None
+
+
+def reset_service(name: str):
+    """Forget a built service; the next access builds a new one."""
+    _services[name]._reset()
+
+
+def on_create(name: str, callback: Callable[[object], None]):
+    """Call ``callback(instance)`` when a service is built (now, if it already is)."""
+    service = _services[name]
+    with service._lock:
+        if service._instance is None:
+            service._on_create.append(callback)
+            return
+    callback(service._instance)
+
+
+def register_warmup(name: str, func: Callable[[], object]):
+    """Extra warm-up work (e.g. loading a model) run by warmup()."""
+    with _registry_lock:
+        _warmers[name] = func
+
+
+def warmup(names: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Build the named services and run the named warmers (all by default).
+    Returns seconds spent per name; failures are printed, not raised.
+    """
+    with _registry_lock:
+        steps = [(name, service._build) for name, service in _services.items()]
+        steps += list(_warmers.items())
+    timings = {}
+    for name, func in steps:
+        if names and name not in names:
+            continue
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            print(f"[ERROR] Warm-up of '{name}' failed: {e}")
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def register_after_fork(name: str, func: Callable[[], None]):
+    """Run ``func()`` in each forked worker to replace state inherited from the parent."""
+    with _registry_lock:
+        _fork_handlers[name] = func
+
+
+def after_fork() -> List[str]:
+    """Run the after-fork handlers; returns their names. Failures are printed, not raised."""
+    with _registry_lock:
+        handlers = list(_fork_handlers.items())
+    for name, func in handlers:
+        try:
+            func()
+        except Exception as e:
+            print(f"[ERROR] After-fork reset of '{name}' failed: {e}")
+    return [name for name, _ in handlers]
+
+
+def shared_resource(key, factory: Callable[[], object]):
+    """One ``factory()`` result per key for the whole process, built on first request."""
+    resource = _resources.get(key)
+    if resource is None:
+        with _registry_lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = _resources[key] = factory()
+    return resource
+
+
+def module_available(name: str) -> bool:
+    """Whether an optional dependency is installed, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def optional_import(name: str):
+    """Import an optional dependency on first use; None if it isn't installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
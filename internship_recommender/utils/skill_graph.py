@@ -15,20 +15,45 @@ SKILL_EDGES = [
 G = nx.Graph()
 G.add_edges_from(SKILL_EDGES)
 
+# Centrality only changes with the graph, so compute it once per build
+_CENTRALITY = nx.degree_centrality(G)
+
+# Callbacks run after the graph is rebuilt (e.g. to drop cached skill gaps)
+_graph_listeners = []
+
+
+def register_graph_listener(callback):
+    """Call ``callback()`` whenever the skill graph is reloaded."""
+    _graph_listeners.append(callback)
+
+
+def set_skill_edges(edges):
+    """
+    Replace the graph's edges in place (other modules hold a reference to G)
+    and notify listeners.
+    """
+    global _CENTRALITY
+    G.clear()
+    G.add_edges_from(edges)
+    _CENTRALITY = nx.degree_centrality(G)
+    for callback in list(_graph_listeners):
+        callback()
+
+
 def rank_missing_skills(have_skills, missing_skills):
     """
     Use NetworkX centrality + proximity to user's existing skills to rank missing skills.
     """
+    have_set = set(have_skills)
     scores = {}
     for m in missing_skills:
         score = 0.0
-        # centrality as baseline
-        if m in G:
-            score += nx.degree_centrality(G).get(m, 0)
-        # proximity: if any neighbor is in have_skills add weight
         if m in G:
+            # centrality as baseline
+            score += _CENTRALITY.get(m, 0)
+            # proximity: if any neighbor is in have_skills add weight
             for n in G.neighbors(m):
-                if n in have_skills:
+                if n in have_set:
                     score += 0.5
         scores[m] = score
     # sort descending by score
@@ -0,0 +1,69 @@
+"""
+SQL dialects for DatabaseManager (MySQL or the SQLite fallback).
+The backend is detected once per connection. Named statements are written
+with ``{p}`` for parameters and ``{now}`` for the current time, and each is
+rendered once per dialect, so queries don't rebuild their SQL on every call.
+"""
+import os
+from typing import Dict, Union
+
+# name -> template, or {dialect name: template} where the SQL differs
+StatementTemplate = Union[str, Dict[str, str]]
+
+
+class Dialect:
+    def __init__(self, name: str, placeholder: str, now: str, prepared: bool):
+        self.name = name
+        self.placeholder = placeholder
+        self.now = now
+        # Server-side prepared statements (MySQL binary protocol)
+        self.prepared = prepared
+        self._rendered: Dict[str, str] = {}
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.name == "sqlite"
+
+    def render(self, template: str) -> str:
+        return template.format(p=self.placeholder, now=self.now)
+
+    def sql(self, name: str, statements: Dict[str, StatementTemplate]) -> str:
+        """Rendered SQL for a named statement; the same string object on every call."""
+        rendered = self._rendered.get(name)
+        if rendered is None:
+            template = statements[name]
+            if isinstance(template, dict):
+                template = template[self.name]
+            rendered = self._rendered[name] = self.render(template)
+        return rendered
+
+    def __repr__(self):
+        return f"Dialect({self.name!r})"
+
+
+SQLITE = Dialect("sqlite", "?", "datetime('now')", prepared=False)
+MYSQL = Dialect("mysql", "%s", "NOW()",
+                prepared=os.getenv("DB_PREPARED_STATEMENTS", "0") not in ("0", "false", "False"))
+
+
+def detect(connection) -> Dialect:
+    return SQLITE if "sqlite" in str(type(connection)).lower() else MYSQL
+
+
+class DictRowFactory:
+    """
+    SQLite row factory returning dicts. Column names are taken from the
+    cursor description once per query rather than once per row.
+    """
+    __slots__ = ("_description", "_columns")
+
+    def __init__(self):
+        self._description = None
+        self._columns = ()
+
+    def __call__(self, cursor, row):
+        description = cursor.description
+        if description is not self._description:
+            self._description = description
+            self._columns = tuple(col[0] for col in description)
+        return dict(zip(self._columns, row))
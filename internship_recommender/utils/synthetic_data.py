@@ -0,0 +1,235 @@
+"""
+Synthetic candidates and job postings for load testing, plus a bulk loader.
+Roles are drawn with ROLE_WEIGHTS, skills from the role's list in
+data/skills.json (earlier skills are more common) and widened along the
+skill graph. Generation is seeded and streamed, so the same seed always
+produces the same rows and 1M rows never sit in memory at once.
+"""
+import json
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from .credentials import hash_password, salt_of
+
+SKILLS_FILE = Path(__file__).resolve().parents[1] / "data" / "skills.json"
+
+# Relative share of candidates per role; roles not listed get 1.0
+ROLE_WEIGHTS = {
+    "Software Engineer": 4.0,
+    "Python Developer": 3.0,
+    "Full Stack Developer": 3.0,
+    "Frontend Developer": 2.5,
+    "Backend Developer": 2.5,
+    "Data Analyst": 2.5,
+    "Data Scientist": 2.0,
+    "Machine Learning Engineer": 1.5,
+    "AI Engineer": 1.5,
+    "Mobile App Developer": 1.5,
+    "QA Engineer": 1.5,
+    "Blockchain Developer": 0.5,
+    "Game Developer": 0.5,
+}
+# Chance of adding each skill-graph neighbour of a skill the candidate has
+GRAPH_SKILL_PROBABILITY = 0.35
+
+FIRST_NAMES = ["Aarav", "Aditi", "Arjun", "Divya", "Ishaan", "Kavya", "Meera", "Nikhil", "Priya", "Rahul",
+               "Rakesh", "Ram", "Sanjay", "Sneha", "Tanvi", "Vikram", "Anjali", "Karthik", "Lakshmi", "Rohan"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Nair", "Patel", "Gupta", "Kumar", "Rao", "Menon", "Singh",
+              "Das", "Joshi", "Pillai", "Verma", "Mehta"]
+DEGREES = [("B.Tech", 5), ("B.E", 3), ("B.Sc", 2), ("BCA", 2), ("M.Tech", 1), ("MCA", 1), ("M.Sc", 1), ("Diploma", 1)]
+STREAMS = ["Computer Science", "Information Technology", "Electronics", "Electrical", "Mechanical",
+           "Data Science", "AI & ML"]
+SECTORS = ["Technology", "Finance", "Healthcare", "Education", "E-commerce"]
+LOCATIONS = ["Bangalore, India", "Chennai, India", "Hyderabad, India", "Pune, India", "Mumbai, India",
+             "Delhi, India", "Remote"]
+
+
+def load_role_skills() -> Dict[str, List[str]]:
+    with open(SKILLS_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _graph_neighbours() -> Dict[str, List[str]]:
+    try:
+        from .skill_graph import G
+        return {node: sorted(G.neighbors(node)) for node in G.nodes}
+    except Exception:
+        return {}
+
+
+class _Sampler:
+    """Shared lookups for one generation run."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.role_skills = load_role_skills()
+        self.roles = list(self.role_skills)
+        self.role_weights = [ROLE_WEIGHTS.get(role, 1.0) for role in self.roles]
+        self.neighbours = _graph_neighbours()
+        self.all_skills = sorted({s for skills in self.role_skills.values() for s in skills})
+        self.degrees, self.degree_weights = zip(*DEGREES)
+
+    def role(self) -> str:
+        return self.rng.choices(self.roles, self.role_weights)[0]
+
+    def skills(self, role: str, extra: int = 2) -> List[str]:
+        core = self.role_skills[role]
+        # Skills listed first for a role are the ones most candidates have
+        picked = [s for rank, s in enumerate(core) if self.rng.random() < 0.9 - 0.6 * rank / len(core)]
+        if len(picked) < 3:
+            picked = core[:3]
+        for skill in list(picked):
+            for neighbour in self.neighbours.get(skill, ()):
+                if self.rng.random() < GRAPH_SKILL_PROBABILITY:
+                    picked.append(neighbour)
+        picked += self.rng.sample(self.all_skills, self.rng.randint(0, extra))
+        return list(dict.fromkeys(picked))
+
+
+def generate_candidates(n: int, seed: int = 0, start_id: int = 1, prefix: str = "synth",
+                        start: datetime = datetime(2024, 1, 1), days: int = 365) -> Iterator[Dict]:
+    """
+    ``n`` candidate rows (user and profile fields) with ids from ``start_id``.
+    ``target_role`` is the role the skills were drawn for; it isn't stored.
+    """
+    sampler = _Sampler(seed)
+    rng = sampler.rng
+    for user_id in range(start_id, start_id + n):
+        role = sampler.role()
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f"{prefix}{seed}_{user_id}"
+        yield {
+            "id": user_id,
+            "username": username,
+            "email": f"{username}@example.com",
+            "full_name": f"{first} {last}",
+            "created_at": (start + timedelta(seconds=rng.randint(0, days * 86400))).strftime("%Y-%m-%d %H:%M:%S"),
+            "degree": rng.choices(sampler.degrees, sampler.degree_weights)[0],
+            "study_year": rng.randint(1, 4),
+            "sector": rng.choice(SECTORS),
+            "stream": rng.choice(STREAMS),
+            "skills": ", ".join(sampler.skills(role)),
+            "target_role": role,
+        }
+
+
+def generate_job_postings(n: int, hr_user_ids: List[int], seed: int = 0, start_id: int = 1) -> Iterator[Dict]:
+    """``n`` job posting rows spread over the given HR users."""
+    sampler = _Sampler(seed + 1)
+    rng = sampler.rng
+    for job_id in range(start_id, start_id + n):
+        role = sampler.role()
+        skills = sampler.skills(role, extra=0)[:8]
+        low = rng.randrange(200000, 800000, 50000)
+        yield {
+            "id": job_id,
+            "hr_user_id": rng.choice(hr_user_ids),
+            "title": f"{role} Intern",
+            "description": (f"We are looking for a {role} intern to join our team. "
+                            f"You will work with {', '.join(skills[:-1])} and {skills[-1]}."),
+            "required_skills": ", ".join(skills),
+            "location": rng.choice(LOCATIONS),
+            "salary_range_low": low,
+            "salary_range_high": low + rng.randrange(100000, 600000, 50000),
+            "target_role": role,
+        }
+
+
+def _batches(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def next_id(db, table: str) -> int:
+    cursor = db.connection.cursor()
+    try:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def bulk_load_users(db, rows: Iterable[Dict], user_role: str = "student", password: str = "password123",
+                    batch_size: int = 10000, with_profiles: bool = True, progress=None) -> int:
+    """
+    Insert users (and their profiles) with executemany, one transaction per
+    batch. Every user gets the same password, hashed once up front.
+    Returns the number of users inserted.
+    """
+    password_hash = hash_password(password)
+    salt = salt_of(password_hash)
+    p = db.dialect.placeholder
+    insert_user = (f"INSERT INTO users (id, username, email, password_hash, salt, full_name, user_role, created_at) "
+                   f"VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})")
+    insert_profile = (f"INSERT INTO user_profiles (user_id, degree, study_year, sector, stream, skills, created_at) "
+                      f"VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})")
+
+    total = 0
+    cursor = db.connection.cursor()
+    try:
+        for batch in _batches(rows, batch_size):
+            cursor.executemany(insert_user, [
+                (r["id"], r["username"], r["email"], password_hash, salt, r["full_name"], user_role, r["created_at"])
+                for r in batch
+            ])
+            if with_profiles:
+                cursor.executemany(insert_profile, [
+                    (r["id"], r["degree"], r["study_year"], r["sector"], r["stream"], r["skills"], r["created_at"])
+                    for r in batch
+                ])
+            db.connection.commit()
+            total += len(batch)
+            if progress:
+                progress(total)
+    except Exception:
+        db.connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return total
+
+
+def bulk_load_job_postings(db, rows: Iterable[Dict], batch_size: int = 10000, progress=None) -> int:
+    """Insert job postings with executemany, one transaction per batch."""
+    p = db.dialect.placeholder
+    insert_job = (f"INSERT INTO job_postings (id, hr_user_id, title, description, required_skills, location, "
+                  f"salary_range_low, salary_range_high) VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})")
+    total = 0
+    cursor = db.connection.cursor()
+    try:
+        for batch in _batches(rows, batch_size):
+            cursor.executemany(insert_job, [
+                (r["id"], r["hr_user_id"], r["title"], r["description"], r["required_skills"], r["location"],
+                 r["salary_range_low"], r["salary_range_high"])
+                for r in batch
+            ])
+            db.connection.commit()
+            total += len(batch)
+            if progress:
+                progress(total)
+    except Exception:
+        db.connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return total
+
+
+def hr_user_rows(n: int, seed: int = 0, start_id: int = 1, prefix: str = "synth_hr") -> Iterator[Dict]:
+    """``n`` HR accounts to own generated job postings."""
+    for user_id in range(start_id, start_id + n):
+        username = f"{prefix}{seed}_{user_id}"
+        yield {
+            "id": user_id,
+            "username": username,
+            "email": f"{username}@example.com",
+            "full_name": f"HR {user_id}",
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
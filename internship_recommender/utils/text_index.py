@@ -0,0 +1,125 @@
+"""
+Lightweight text indexing helpers shared by the recommenders.
+Token postings are kept as sorted NumPy arrays so that multi-token
+lookups reduce to a few vectorized intersections.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Tokens keep the characters that matter in skill names (c++, c#, vue.js)
+TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split lowercased text into index tokens.
+    Dotted tokens such as 'node.js' are also indexed by their parts
+    so that a query for 'node' still finds them.
+    """
+    tokens = []
+    for tok in TOKEN_RE.findall((text or "").lower()):
+        tokens.append(tok)
+        if "." in tok:
+            tokens.extend(p for p in tok.split(".") if p)
+    return tokens
+
+
+class InvertedIndex:
+    """Token -> sorted row-id postings for one text column."""
+
+    def __init__(self, postings: Dict[str, np.ndarray], size: int):
+        self.postings = postings
+        self.size = size
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> "InvertedIndex":
+        buckets = defaultdict(list)
+        size = 0
+        for row, text in enumerate(texts):
+            size += 1
+            for tok in set(tokenize(text)):
+                buckets[tok].append(row)
+        postings = {tok: np.asarray(rows, dtype=np.int64) for tok, rows in buckets.items()}
+        return cls(postings, size)
+
+    def rows_with_all(self, phrase: str) -> np.ndarray:
+        """Rows containing every token of ``phrase`` (candidates for a phrase match)."""
+        tokens = set(tokenize(phrase))
+        if not tokens:
+            return _EMPTY
+        lists = []
+        for tok in tokens:
+            rows = self.postings.get(tok)
+            if rows is None:
+                return _EMPTY
+            lists.append(rows)
+        lists.sort(key=len)
+        result = lists[0]
+        for rows in lists[1:]:
+            result = np.intersect1d(result, rows, assume_unique=True)
+            if result.size == 0:
+                break
+        return result
+
+
+def trigrams(text: str) -> set:
+    """Distinct character trigrams of ``text`` (empty for strings under 3 chars)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Character-trigram index over a list of short strings.
+    Narrows substring and fuzzy lookups to a few candidates instead of
+    scanning every item.
+    """
+
+    def __init__(self, items: Iterable[str]):
+        self.items = list(items)
+        self.postings = defaultdict(set)
+        self.gram_counts = []
+        self.short_ids = []
+        for item_id, item in enumerate(self.items):
+            grams = trigrams(item)
+            self.gram_counts.append(len(grams))
+            if not grams:
+                self.short_ids.append(item_id)
+            for gram in grams:
+                self.postings[gram].add(item_id)
+
+    def containing(self, text: str) -> set:
+        """Ids of items that may contain ``text`` (every trigram of it is present)."""
+        grams = trigrams(text)
+        if not grams:
+            return {i for i, item in enumerate(self.items) if text in item}
+        sets = sorted((self.postings.get(g, set()) for g in grams), key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def contained_in(self, text: str) -> set:
+        """Ids of items that may occur inside ``text`` (all their trigrams appear in it)."""
+        hits = defaultdict(int)
+        for gram in trigrams(text):
+            for item_id in self.postings.get(gram, ()):
+                hits[item_id] += 1
+        result = {i for i, n in hits.items() if n == self.gram_counts[i]}
+        result.update(i for i in self.short_ids if self.items[i] in text)
+        return result
+
+    def similar(self, text: str, limit: int) -> List[int]:
+        """Ids of the ``limit`` items sharing the most trigrams with ``text``."""
+        hits = defaultdict(int)
+        for gram in trigrams(text):
+            for item_id in self.postings.get(gram, ()):
+                hits[item_id] += 1
+        ranked = sorted(hits.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [item_id for item_id, _ in ranked[:limit]]
@@ -0,0 +1,113 @@
+"""
+Write-behind queue for non-critical inserts (e.g. recommendation history).
+Requests enqueue (statement, params) and return immediately; a daemon thread
+drains the queue on its own connection and writes each batch in a single
+transaction with executemany. Rows become visible to readers up to
+``interval`` seconds later.
+"""
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, List, Tuple
+
+
+class WriteBehindQueue:
+    def __init__(self, connect: Callable, interval: float = 0.5, batch_size: int = 500,
+                 max_pending: int = 10000, name: str = "write-behind"):
+        """``connect`` opens the dedicated writer connection (called on the flush thread)."""
+        self._connect = connect
+        self.interval = interval
+        self.batch_size = batch_size
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def put(self, statement: str, params: Tuple) -> bool:
+        """Queue one write; False when the queue is full (caller should write it directly)."""
+        self.start()
+        try:
+            self._queue.put_nowait((statement, params))
+            return True
+        except queue.Full:
+            return False
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has been written."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline or self._thread is None or not self._thread.is_alive():
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Write what is queued, then stop the flush thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _drain(self) -> List[Tuple[str, Tuple]]:
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.interval))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, connection, batch: List[Tuple[str, Tuple]]):
+        grouped = defaultdict(list)
+        for statement, params in batch:
+            grouped[statement].append(params)
+        cursor = connection.cursor()
+        try:
+            for statement, rows in grouped.items():
+                cursor.executemany(statement, rows)
+            connection.commit()
+            self.written += len(batch)
+        except Exception as e:
+            print(f"Error flushing {len(batch)} queued writes: {e}")
+            self.failed += len(batch)
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+        finally:
+            cursor.close()
+
+    def _run(self):
+        connection = None
+        while True:
+            batch = self._drain()
+            if batch:
+                try:
+                    if connection is None:
+                        connection = self._connect()
+                    self._write(connection, batch)
+                except Exception as e:
+                    print(f"Error opening write-behind connection: {e}")
+                    self.failed += len(batch)
+                    connection = None
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            elif self._stop.is_set():
+                break
+        if connection is not None:
+            connection.close()
@@ -4,17 +4,16 @@ Provides explanations for ML predictions and recommendations.
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Tuple, Any
 import joblib
 from pathlib import Path
 
-# For SHAP explanations (optional, install with: pip install shap)
-try:
-    import shap
-    SHAP_AVAILABLE = True
-except ImportError:
-    SHAP_AVAILABLE = False
+from .salary_grid import get_salary_grid
+from .services import module_available
+
+# For SHAP explanations (optional, install with: pip install shap); imported on first use
+SHAP_AVAILABLE = module_available("shap")
+if not SHAP_AVAILABLE:
     print("Note: SHAP not installed. Install with 'pip install shap' for advanced explanations.")
 
 
@@ -28,15 +27,54 @@ class SalaryExplainer:
         self.model = None
         self.feature_columns = None
         self.label_encoder = None
+        self._model_mtime = None
+        self._tree_explainer = None
+        self._grid = None
         self._load_model()
     
     def _load_model(self):
         """Load the trained salary prediction model."""
         if self.model_path.exists():
+            self._model_mtime = self.model_path.stat().st_mtime
             self.model_data = joblib.load(self.model_path)
             self.model = self.model_data['model']
             self.feature_columns = self.model_data['feature_columns']
             self.label_encoder = self.model_data.get('label_encoder')
+            # Built lazily for the model that is loaded now
+            self._tree_explainer = None
+            self._grid = get_salary_grid(self.model_path, self.model_data, self._model_mtime)
+    
+    def _refresh_model(self):
+        """Reload the model (and drop its TreeExplainer) if the model file changed."""
+        try:
+            mtime = self.model_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._model_mtime:
+            self._load_model()
+    
+    def _get_tree_explainer(self):
+        """TreeExplainer for the loaded model, built once (it walks every tree)."""
+        if self._tree_explainer is None:
+            import shap
+            self._tree_explainer = shap.TreeExplainer(self.model)
+        return self._tree_explainer
+    
+    def _encode_role(self, role: str) -> int:
+        try:
+            return self.label_encoder.transform([role.lower()])[0]
+        except (ValueError, AttributeError):
+            return 0
+    
+    @staticmethod
+    def _feature_row(skills_count: int, experience_years: int, role_encoded: int) -> List[float]:
+        return [
+            skills_count,
+            experience_years,
+            role_encoded,
+            experience_years ** 2,
+            skills_count * experience_years
+        ]
     
     def explain_prediction(self, skills: List[str], role: str, experience_years: int) -> Dict[str, Any]:
         """
@@ -45,35 +83,82 @@ class SalaryExplainer:
         Returns:
             Dictionary with prediction, feature contributions, and explanations
         """
+        self._refresh_model()
         if not self.model:
             return {"error": "Model not loaded"}
         
         # Prepare features
         skills_count = len(skills) if skills else 0
-        try:
-            role_encoded = self.label_encoder.transform([role.lower()])[0]
-        except (ValueError, AttributeError):
-            role_encoded = 0
+        role_encoded = self._encode_role(role)
+        features = np.array([self._feature_row(skills_count, experience_years, role_encoded)])
+        
+        # Precomputed grid hit: prediction and SHAP row by indexing
+        hit = self._grid.explain(skills_count, experience_years, role_encoded) if self._grid else None
+        if hit:
+            pred, shap_row = hit
+            contributions = self._shap_contributions(features[0], shap_row, pred)
+        else:
+            # Get prediction
+            pred = self.model.predict(features)[0]
+            
+            # Feature contributions (local explanation)
+            contributions = self._get_feature_contributions(
+                features[0], pred, skills_count, experience_years, role
+            )
         
-        features = np.array([[
-            skills_count,
-            experience_years,
-            role_encoded,
-            experience_years ** 2,
-            skills_count * experience_years
-        ]])
+        return self._build_explanation(pred, skills_count, experience_years, role, role_encoded, contributions)
+    
+    def explain_batch(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Explain many predictions with one vectorized predict and SHAP call.
         
-        # Get prediction
-        pred = self.model.predict(features)[0]
+        Args:
+            profiles: dicts with 'skills' (list or count), 'role' and 'experience_years'
         
+        Returns:
+            One explanation per profile, in the same shape as explain_prediction
+        """
+        self._refresh_model()
+        if not self.model:
+            return [{"error": "Model not loaded"} for _ in profiles]
+        if not profiles:
+            return []
+        
+        rows = []
+        for p in profiles:
+            skills = p.get('skills')
+            skills_count = skills if isinstance(skills, int) else len(skills or [])
+            experience_years = int(p.get('experience_years', 0) or 0)
+            role = p.get('role', '') or ''
+            rows.append((skills_count, experience_years, role, self._encode_role(role)))
+        
+        features = np.array([self._feature_row(sc, exp, enc) for sc, exp, role, enc in rows], dtype=float)
+        preds = self.model.predict(features)
+        
+        shap_matrix = None
+        if SHAP_AVAILABLE:
+            try:
+                shap_matrix = self._get_tree_explainer().shap_values(features)
+                if isinstance(shap_matrix, list):
+                    shap_matrix = shap_matrix[0]
+            except Exception as e:
+                print(f"SHAP batch explanation failed: {e}, using approximation")
+        
+        results = []
+        for i, (skills_count, experience_years, role, role_encoded) in enumerate(rows):
+            if shap_matrix is not None:
+                contributions = self._shap_contributions(features[i], shap_matrix[i], preds[i])
+            else:
+                contributions = self._approximate_contributions(features[i], preds[i], skills_count, experience_years, role)
+            results.append(self._build_explanation(preds[i], skills_count, experience_years, role, role_encoded, contributions))
+        return results
+    
+    def _build_explanation(self, pred: float, skills_count: int, experience_years: int,
+                           role: str, role_encoded: int, contributions: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the explanation payload shared by single and batch explanations."""
         # Feature importance (global)
         feature_importance = self._get_feature_importance()
         
-        # Feature contributions (local explanation)
-        contributions = self._get_feature_contributions(
-            features[0], pred, skills_count, experience_years, role
-        )
-        
         # Generate natural language explanation
         explanation = self._generate_explanation(
             pred, skills_count, experience_years, role, contributions, feature_importance
@@ -111,29 +196,29 @@ class SalaryExplainer:
         Calculate how each feature contributes to the prediction.
         Uses TreeSHAP if available, otherwise uses approximation.
         """
-        contributions = {}
-        
         if SHAP_AVAILABLE and hasattr(self.model, 'predict'):
             try:
-                # Create SHAP explainer
-                explainer = shap.TreeExplainer(self.model)
-                shap_values = explainer.shap_values(features.reshape(1, -1))
+                # Reuse the model's TreeExplainer
+                shap_values = self._get_tree_explainer().shap_values(features.reshape(1, -1))
                 
                 if isinstance(shap_values, list):
                     shap_values = shap_values[0]
                 
-                for i, feature_name in enumerate(self.feature_columns):
-                    contributions[feature_name] = {
-                        "value": float(features[i]),
-                        "shap_value": float(shap_values[0][i]),
-                        "contribution_pct": float((shap_values[0][i] / prediction) * 100) if prediction != 0 else 0
-                    }
+                return self._shap_contributions(features, shap_values[0], prediction)
             except Exception as e:
                 print(f"SHAP explanation failed: {e}, using approximation")
-                contributions = self._approximate_contributions(features, prediction, skills_count, experience, role)
-        else:
-            contributions = self._approximate_contributions(features, prediction, skills_count, experience, role)
         
+        return self._approximate_contributions(features, prediction, skills_count, experience, role)
+    
+    def _shap_contributions(self, features: np.ndarray, shap_row: np.ndarray, prediction: float) -> Dict[str, Any]:
+        """Per-feature contributions from one row of SHAP values."""
+        contributions = {}
+        for i, feature_name in enumerate(self.feature_columns):
+            contributions[feature_name] = {
+                "value": float(features[i]),
+                "shap_value": float(shap_row[i]),
+                "contribution_pct": float((shap_row[i] / prediction) * 100) if prediction != 0 else 0
+            }
         return contributions
     
     def _approximate_contributions(self, features: np.ndarray, prediction: float,